@@ -1,7 +1,13 @@
 from fastapi import APIRouter
-from api.api_v1.endpoints import auth, influencers, publications, comments, materials, projects, scenarios
+from core.config import settings
+from api.api_v1.endpoints import auth, influencers, publications, comments, materials, projects, scenarios, metrics, async_reads, exports, stats
 
 api_router = APIRouter()
+if settings.DB_MODE == "async":
+    # Registered first so the async handlers take precedence on the hot paths
+    api_router.include_router(async_reads.router)
+elif settings.DB_MODE == "both":
+    api_router.include_router(async_reads.router, prefix="/async")
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(influencers.router, prefix="/influencers", tags=["influencers"])
 api_router.include_router(publications.router, prefix="/publications", tags=["publications"])
@@ -9,3 +15,6 @@ api_router.include_router(comments.router, prefix="/comments", tags=["comments"]
 api_router.include_router(materials.router, prefix="/materials", tags=["materials"])
 api_router.include_router(projects.router, prefix="/projects", tags=["projects"])
 api_router.include_router(scenarios.router, prefix="/scenarios", tags=["scenarios"])
+api_router.include_router(exports.router, prefix="/export", tags=["export"])
+api_router.include_router(stats.router, prefix="/stats", tags=["stats"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from db.session import get_db
 from models.models import Activity, Project, User
 from schemas.schemas import ActivityCreate, Activity as ActivitySchema
 from core.security import get_current_user
+from core.pagination import paginate
 
 router = APIRouter()
 
@@ -32,12 +33,14 @@ def create_activity(
 
 @router.get("/", response_model=List[ActivitySchema])
 def read_activities(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    activities = db.query(Activity).offset(skip).limit(limit).all()
+    activities = paginate(db.query(Activity), (Activity.id,), response, cursor=cursor, skip=skip, limit=limit)
     return activities
 
 @router.get("/{activity_id}", response_model=ActivitySchema)
@@ -0,0 +1,89 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import List, Optional
+from db.session import get_async_db
+from models.models import Project, Activity, Influencer, User
+from schemas.schemas import Project as ProjectSchema, Activity as ActivitySchema, InfluencerCreate as InfluencerSchema
+from core.security import get_current_user
+from core.pagination import keyset, finish_page
+from api.api_v1.endpoints.influencers import filter_influencers
+from services.feed import FEED_ORDER, activity_feed, owned_by, with_users
+from services.project_progress import WITH_PROGRESS
+
+# AsyncSession variants of the hottest read endpoints, mounted by api.py
+# according to settings.DB_MODE
+router = APIRouter()
+
+@router.get("/projects/", response_model=List[ProjectSchema], tags=["projects"])
+async def read_projects(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    order = (Project.id,)
+    query = select(Project).options(*WITH_PROGRESS).where(Project.manager_id == current_user.id)
+    result = await db.scalars(keyset(query, order, cursor=cursor, skip=skip, limit=limit))
+    return finish_page(result.all(), order, limit, response)
+
+@router.get("/projects/{project_id}", response_model=ProjectSchema, tags=["projects"])
+async def read_project(
+    project_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    project = await db.get(Project, project_id, options=WITH_PROGRESS)
+    if project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return project
+
+@router.get("/projects/{project_id}/activities", response_model=List[ActivitySchema], tags=["projects"])
+async def read_project_activities(
+    project_id: int,
+    response: Response,
+    skip: int = 0,
+    limit: int = 5,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    # selectin rather than joined, so the feed query keeps its index plan
+    query = select(Activity).options(selectinload(Activity.user))
+    if project_id != 0:
+        project = await db.get(Project, project_id)
+        if not project:
+            raise HTTPException(status_code=404, detail="Project not found")
+        query = query.where(Activity.project_id == project_id)
+    else:
+        page = None
+        if not skip:
+            page = await db.run_sync(lambda session: activity_feed.page(session, current_user.id, cursor=cursor, limit=limit))
+        if page is not None:
+            rows = finish_page(page, FEED_ORDER, limit, response)
+            return await db.run_sync(lambda session: with_users(session, rows))
+        query = query.where(owned_by(current_user.id))
+
+    result = await db.scalars(keyset(query, FEED_ORDER, cursor=cursor, skip=skip, limit=limit, descending=True))
+    return finish_page(result.all(), FEED_ORDER, limit, response)
+
+@router.get("/influencers/", response_model=List[InfluencerSchema], tags=["influencers"])
+async def read_influencers(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    platforms: Optional[str] = None,
+    min_followers: Optional[int] = Query(None, ge=0),
+    max_followers: Optional[int] = Query(None, ge=0),
+    sort: str = "id",
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    query = select(Influencer).where(Influencer.manager_id == current_user.id)
+    query, order, descending = filter_influencers(query, platforms, min_followers, max_followers, sort)
+    result = await db.scalars(keyset(query, order, cursor=cursor, skip=skip, limit=limit, descending=descending))
+    return finish_page(result.all(), order, limit, response)
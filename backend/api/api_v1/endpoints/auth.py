@@ -1,27 +1,32 @@
-from datetime import timedelta
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from core.config import settings
-from core.security import verify_password, create_access_token, get_password_hash, get_current_user
+from core.security import (
+    verify_password_async, get_password_hash_async, get_current_user, resolve_principal,
+    load_principal, load_user_principal, issue_tokens, decode_token, revoke_token, Principal
+)
 from db.session import get_db
 from models.models import User, Manager, Influencer
-from schemas.schemas import Token, UserCreate, User as UserSchema
+from schemas.schemas import Token, UserCreate, User as UserSchema, RefreshTokenRequest
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/login")
 
 @router.get("/me", response_model=UserSchema)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: Principal = Depends(get_current_user), db: Session = Depends(get_db)):
+    if not current_user.is_complete:
+        current_user = await resolve_principal(db, current_user.username)
+        if current_user is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials")
     return current_user
 
-@router.post("/register", response_model=UserSchema)
-def register(user: UserCreate, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.username == user.username).first()
-    if db_user:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username already registered")
-    
-    hashed_password = get_password_hash(user.password)
+def get_user_by_username(db: Session, username: str):
+    return db.query(User).filter(User.username == username).first()
+
+def create_user(db: Session, user: UserCreate, hashed_password: str) -> User:
     db_user = User(
         username=user.username,
         password=hashed_password,
@@ -45,18 +50,59 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
     db.refresh(db_user)
     return db_user
 
+@router.post("/register", response_model=UserSchema)
+async def register(user: UserCreate, db: Session = Depends(get_db)):
+    db_user = await run_in_threadpool(get_user_by_username, db, user.username)
+    if db_user:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username already registered")
+    
+    # bcrypt runs in the bounded hashing pool, the DB work in the threadpool
+    hashed_password = await get_password_hash_async(user.password)
+    return await run_in_threadpool(create_user, db, user, hashed_password)
+
 @router.post("/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.username == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.password):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    # One query for the user and its manager/influencer ids
+    user, principal = await run_in_threadpool(load_user_principal, db, form_data.username)
+    if not user or not await verify_password_async(form_data.password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
-    )
-    return {"access_token": access_token, "token_type": "bearer", "user": user} 
\ No newline at end of file
+    return {**issue_tokens(principal), "user": user}
+
+@router.post("/refresh", response_model=Token)
+async def refresh(body: RefreshTokenRequest, db: Session = Depends(get_db)):
+    payload = decode_token(body.refresh_token, token_type="refresh")
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    principal = await run_in_threadpool(load_principal, db, payload["sub"])
+    if principal is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+    
+    # Refresh tokens are single use
+    revoke_token(payload)
+    return {**issue_tokens(principal), "user": principal}
+
+@router.post("/logout")
+def logout(body: Optional[RefreshTokenRequest] = None, token: str = Depends(oauth2_scheme)):
+    payload = decode_token(token)
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    revoke_token(payload)
+    if body is not None:
+        refresh_payload = decode_token(body.refresh_token, token_type="refresh")
+        if refresh_payload is not None:
+            revoke_token(refresh_payload)
+    return {"message": "Logged out successfully"}
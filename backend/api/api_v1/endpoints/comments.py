@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.orm import Session, joinedload
+from typing import List, Optional
 from db.session import get_db
 from models.models import Comment, Project, User
 from schemas.schemas import CommentCreate, Comment as CommentSchema
 from core.security import get_current_user
+from core.pagination import paginate
 
 router = APIRouter()
 
@@ -32,12 +33,15 @@ def create_comment(
 
 @router.get("/", response_model=List[CommentSchema])
 def read_comments(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    comments = db.query(Comment).offset(skip).limit(limit).all()
+    query = db.query(Comment).options(joinedload(Comment.user))
+    comments = paginate(query, (Comment.id,), response, cursor=cursor, skip=skip, limit=limit)
     return comments
 
 @router.get("/{comment_id}", response_model=CommentSchema)
@@ -46,7 +50,7 @@ def read_comment(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    comment = db.query(Comment).filter(Comment.id == comment_id).first()
+    comment = db.query(Comment).options(joinedload(Comment.user)).filter(Comment.id == comment_id).first()
     if comment is None:
         raise HTTPException(status_code=404, detail="Comment not found")
     return comment
@@ -0,0 +1,84 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Optional
+from db.session import SessionLocal, get_db
+from models.models import Project, User
+from core.security import get_current_user
+from services.export import MEDIA_TYPES, stream_export
+
+router = APIRouter()
+
+def _export_response(
+    db: Session,
+    current_user: User,
+    resource: str,
+    format: str,
+    project_id: Optional[int] = None,
+    manager_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    include_archived: bool = False
+) -> StreamingResponse:
+    if format not in MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported format '{format}', expected ndjson or csv")
+    # Exports only ever cover the caller's own data
+    if manager_id is not None and manager_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    manager_id = current_user.id
+    if project_id is not None and db.query(Project.id).filter(
+        Project.id == project_id, Project.manager_id == manager_id
+    ).first() is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    # Exports never write, so their session can read from a replica
+    body = stream_export(
+        lambda: SessionLocal(read_only=True),
+        resource,
+        format,
+        project_id=project_id,
+        manager_id=manager_id,
+        since=since,
+        until=until,
+        include_archived=include_archived
+    )
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{resource}.{format}"'}
+    )
+
+@router.get("/activities")
+def export_activities(
+    format: str = "ndjson",
+    project_id: Optional[int] = None,
+    manager_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    include_archived: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return _export_response(db, current_user, "activities", format, project_id, manager_id, since, until, include_archived)
+
+@router.get("/publications")
+def export_publications(
+    format: str = "ndjson",
+    project_id: Optional[int] = None,
+    manager_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return _export_response(db, current_user, "publications", format, project_id, manager_id, since, until)
+
+@router.get("/influencers")
+def export_influencers(
+    format: str = "ndjson",
+    project_id: Optional[int] = None,
+    manager_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return _export_response(db, current_user, "influencers", format, project_id, manager_id)
@@ -1,21 +1,55 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
 from sqlalchemy.orm import Session
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 from db.session import get_db
 from models.models import Influencer, User
-from schemas.schemas import InfluencerCreate as InfluencerSchema, InfluencerUpdate
+from schemas.schemas import InfluencerCreate as InfluencerSchema, InfluencerUpdate, InfluencerImportReport, SeriesSnapshot, SeriesRecordResult, GrowthSeries
 from core.security import get_current_user
+from core.pagination import paginate
+from services.follower_series import METRICS, downsample, epoch, record, resolution_for, series_bounds
+from services.influencer_platforms import PLATFORMS, followers_filter
+from services.influencer_search import search_influencers
+from services.influencer_import import ImportFormatError, guess_format, import_influencers, iter_rows
 
 router = APIRouter()
 
+INFLUENCER_SORTS = {
+    "id": ((Influencer.id,), False),
+    "total_reach": ((Influencer.total_reach, Influencer.id), False),
+    "-total_reach": ((Influencer.total_reach, Influencer.id), True),
+}
+
+def filter_influencers(query, platforms: Optional[str], min_followers: Optional[int],
+                       max_followers: Optional[int], sort: str):
+    """Apply the list filters to ``query``; returns it with the order columns and direction."""
+    if sort not in INFLUENCER_SORTS:
+        raise HTTPException(status_code=400, detail=f"Unknown sort: {sort}")
+    if platforms is not None or min_followers is not None or max_followers is not None:
+        wanted = PLATFORMS if platforms is None else [p.strip() for p in platforms.split(",") if p.strip()]
+        unknown = [p for p in wanted if p not in PLATFORMS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown platforms: {', '.join(unknown)}")
+        query = followers_filter(query, wanted, min_followers, max_followers)
+    order, descending = INFLUENCER_SORTS[sort]
+    return query, order, descending
+
 @router.get("/", response_model=List[InfluencerSchema])
 def read_influencers(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    platforms: Optional[str] = None,
+    min_followers: Optional[int] = Query(None, ge=0),
+    max_followers: Optional[int] = Query(None, ge=0),
+    sort: str = "id",
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    influencers = db.query(Influencer).filter(Influencer.manager_id == current_user.id).offset(skip).limit(limit).all()
+    query = db.query(Influencer).filter(Influencer.manager_id == current_user.id)
+    query, order, descending = filter_influencers(query, platforms, min_followers, max_followers, sort)
+    influencers = paginate(query, order, response, cursor=cursor, skip=skip, limit=limit, descending=descending)
     return influencers
 
 @router.post("/", response_model=InfluencerSchema)
@@ -30,6 +64,31 @@ def create_influencer(
     db.refresh(db_influencer)
     return db_influencer
 
+@router.post("/import", response_model=InfluencerImportReport)
+def import_influencer_roster(
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    # The upload is spooled to disk by Starlette and parsed row by row
+    try:
+        rows = iter_rows(file.file, format or guess_format(file.filename))
+        return import_influencers(db, rows, manager_id=current_user.id)
+    except ImportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="File is not valid UTF-8")
+
+@router.get("/search", response_model=List[InfluencerSchema])
+def search_influencer_roster(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return search_influencers(db, current_user.id, q, limit=limit)
+
 @router.get("/{influencer_id}", response_model=InfluencerSchema)
 def read_influencer(
     influencer_id: int,
@@ -58,3 +117,56 @@ def update_influencer(
     db.commit()
     db.refresh(db_influencer)
     return db_influencer
+
+def _series_params(platform: str, metric: str) -> None:
+    if platform not in PLATFORMS:
+        raise HTTPException(status_code=400, detail=f"Unknown platform: {platform}")
+    if metric not in METRICS:
+        raise HTTPException(status_code=400, detail=f"Unknown metric: {metric}")
+
+@router.post("/{influencer_id}/snapshots", response_model=SeriesRecordResult)
+def record_influencer_snapshots(
+    influencer_id: int,
+    snapshots: List[SeriesSnapshot],
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    if db.query(Influencer.id).filter(Influencer.id == influencer_id).first() is None:
+        raise HTTPException(status_code=404, detail="Influencer not found")
+    for snapshot in snapshots:
+        _series_params(snapshot.platform, snapshot.metric)
+    now = epoch(datetime.utcnow())
+    stored = record(db.connection(), [
+        (influencer_id, s.platform, s.metric, now if s.at is None else epoch(s.at), s.value) for s in snapshots
+    ])
+    db.commit()
+    return {"stored": stored}
+
+@router.get("/{influencer_id}/growth", response_model=GrowthSeries)
+def read_influencer_growth(
+    influencer_id: int,
+    platform: str,
+    metric: str = "followers",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    resolution: Optional[int] = Query(None, ge=1),
+    points: int = Query(100, ge=2, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    _series_params(platform, metric)
+    if db.query(Influencer.id).filter(Influencer.id == influencer_id).first() is None:
+        raise HTTPException(status_code=404, detail="Influencer not found")
+    bounds = series_bounds(db, influencer_id, platform, metric)
+    if bounds is None:
+        return {"platform": platform, "metric": metric, "resolution": resolution or 1, "points": []}
+    # Without explicit bounds the whole stored history is shown
+    start_at = bounds[0] if start is None else epoch(start)
+    end_at = bounds[1] if end is None else epoch(end)
+    resolution = resolution or resolution_for(start_at, end_at, points)
+    return {
+        "platform": platform,
+        "metric": metric,
+        "resolution": resolution,
+        "points": downsample(db, influencer_id, platform, metric, start_at, end_at, resolution),
+    }
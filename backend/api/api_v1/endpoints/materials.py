@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from db.session import get_db
 from models.models import Material, Project, Influencer, User
-from schemas.schemas import MaterialCreate, Material as MaterialSchema
+from schemas.schemas import MaterialCreate, BulkCreateResult, Material as MaterialSchema
 from core.security import get_current_user
+from core.pagination import paginate
+from services.bulk import bulk_create, check_batch_size
 
 router = APIRouter()
 
@@ -30,14 +32,33 @@ def create_material(
     db.refresh(db_material)
     return db_material
 
+@router.post("/bulk", response_model=BulkCreateResult)
+def create_materials_bulk(
+    materials: List[MaterialCreate],
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    check_batch_size(materials)
+    result, _ = bulk_create(
+        db, Material, [material.dict() for material in materials],
+        references=[
+            ("project_id", Project, "Project not found"),
+            ("influencer_id", Influencer, "Influencer not found"),
+        ]
+    )
+    db.commit()
+    return result
+
 @router.get("/", response_model=List[MaterialSchema])
 def read_materials(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    materials = db.query(Material).offset(skip).limit(limit).all()
+    materials = paginate(db.query(Material), (Material.id,), response, cursor=cursor, skip=skip, limit=limit)
     return materials
 
 @router.get("/{material_id}", response_model=MaterialSchema)
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from models.models import User, UserRole
+from core.metrics import metrics
+from core.security import get_current_user
+
+router = APIRouter()
+
+@router.get("/")
+def read_metrics(current_user: User = Depends(get_current_user)):
+    # Pool, auth and cache counters are operational data, not for influencer accounts
+    if current_user.role != UserRole.MANAGER:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+    return metrics.snapshot()
@@ -1,26 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from db.session import get_db
-from models.models import Project, User, Scenario, Activity, Publication, ProjectInfluencer
-from schemas.schemas import ProjectCreate, Project as ProjectSchema, PublicationCreate, WorkflowStageUpdate, Scenario as ScenarioSchema, ScenarioCreate, Publication as PublicationSchema, Activity as ActivitySchema, ProjectInfluencerCreate, ProjectInfluencer as ProjectInfluencerSchema, InfluencerCreate as InfluencerSchema
-from core.security import get_current_user
-from datetime import datetime
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, contains_eager, joinedload, selectinload
+from typing import List, Optional
+from datetime import date
+from db.session import SessionLocal, get_db
+from core.config import settings
+from core.metrics import metrics
+from models.models import Project, User, Scenario, Material, Activity, ActivityDailyRollup, Publication, ProjectInfluencer, Influencer, Comment
+from schemas.schemas import ProjectCreate, Project as ProjectSchema, PublicationCreate, WorkflowStageUpdate, Scenario as ScenarioSchema, ScenarioCreate, Publication as PublicationSchema, Activity as ActivitySchema, ActivityDailyRollup as ActivityDailyRollupSchema, ProjectInfluencerCreate, ProjectInfluencer as ProjectInfluencerSchema, InfluencerCreate as InfluencerSchema, BulkCreateResult, Comment as CommentSchema, ProjectOverview, ProjectAnalytics, ProjectAnalyticsScenario, InfluencerRecommendation
+from core.security import get_current_user, get_current_user_or_query_token
+from core.pagination import finish_page, paginate
+from services.bulk import bulk_create, check_batch_size
+from services.activity import activity_row, record_activities, record_activity
+from services.feed import FEED_ORDER, activity_feed, owned_by, with_users
+from services.stream import StreamCursor, event_stream, project_events
+from services.stats import touch_managers
+from services.project_progress import WITH_PROGRESS, count_assignments
+from services.campaign_analytics import UNCHANGED, UnknownInfluencersError, project_analytics, what_if
+from services.recommendations import recommend, touch_influencers
 
 router = APIRouter()
 
-def create_activity(db: Session, project_id: int, user_id: int, activity_type: str, description: str):
-    activity = Activity(
-        project_id=project_id,
-        user_id=user_id,
-        activity_type=activity_type,
-        description=description,
-        created_at=datetime.utcnow()
-    )
-    db.add(activity)
-    db.commit()
-    return activity
-
 @router.post("/", response_model=ProjectSchema)
 def create_project(
     project: ProjectCreate,
@@ -34,27 +35,33 @@ def create_project(
     
     db_project = Project(**project.dict())
     db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
+    db.flush()
     
-    create_activity(
+    record_activity(
         db=db,
         project_id=db_project.id,
         user_id=current_user.id,
         activity_type="project_created",
         description=f"Project '{db_project.title}' was created"
     )
+    db.commit()
+    db.refresh(db_project)
     
     return db_project
 
 @router.get("/", response_model=List[ProjectSchema])
 def read_projects(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    projects = db.query(Project).filter(Project.manager_id == current_user.id).offset(skip).limit(limit).all()
+    projects = paginate(
+        db.query(Project).options(*WITH_PROGRESS).filter(Project.manager_id == current_user.id),
+        (Project.id,), response, cursor=cursor, skip=skip, limit=limit
+    )
     return projects
 
 @router.get("/{project_id}", response_model=ProjectSchema)
@@ -63,11 +70,121 @@ def read_project(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = db.query(Project).options(*WITH_PROGRESS).filter(Project.id == project_id).first()
     if project is None:
         raise HTTPException(status_code=404, detail="Project not found")
     return project
 
+OVERVIEW_SECTIONS = ("scenarios", "materials", "publications", "influencers", "activities", "comments")
+
+@router.get("/{project_id}/overview", response_model=ProjectOverview)
+def read_project_overview(
+    project_id: int,
+    sections: Optional[str] = None,
+    activity_limit: int = 5,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    # Everything the project page needs in one round trip: one statement per section
+    wanted = OVERVIEW_SECTIONS if sections is None else [s.strip() for s in sections.split(",") if s.strip()]
+    unknown = [s for s in wanted if s not in OVERVIEW_SECTIONS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown sections: {', '.join(unknown)}")
+    
+    project = db.query(Project).options(*WITH_PROGRESS).filter(Project.id == project_id).first()
+    if project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    overview = {"project": project}
+    if "scenarios" in wanted:
+        overview["scenarios"] = db.query(Scenario).filter(Scenario.project_id == project_id).order_by(Scenario.id).all()
+    if "materials" in wanted:
+        overview["materials"] = db.query(Material).filter(Material.project_id == project_id).order_by(Material.id).all()
+    if "publications" in wanted:
+        overview["publications"] = db.query(Publication).filter(Publication.project_id == project_id).order_by(Publication.id).all()
+    if "influencers" in wanted:
+        overview["influencers"] = (
+            db.query(ProjectInfluencer)
+            .outerjoin(ProjectInfluencer.influencer)
+            .options(contains_eager(ProjectInfluencer.influencer))
+            .filter(ProjectInfluencer.project_id == project_id)
+            .order_by(ProjectInfluencer.id)
+            .all()
+        )
+    if "activities" in wanted:
+        overview["activities"] = (
+            db.query(Activity)
+            .options(selectinload(Activity.user))
+            .filter(Activity.project_id == project_id)
+            .order_by(Activity.created_at.desc(), Activity.id.desc())
+            .limit(activity_limit)
+            .all()
+        )
+    if "comments" in wanted:
+        overview["comments"] = (
+            db.query(Comment)
+            .options(joinedload(Comment.user))
+            .filter(Comment.project_id == project_id)
+            .order_by(Comment.created_at, Comment.id)
+            .all()
+        )
+    return overview
+
+@router.get("/{project_id}/analytics", response_model=ProjectAnalytics)
+def read_project_analytics(
+    project_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    project = db.query(Project).filter(Project.id == project_id).first()
+    if project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return project_analytics(db, [project])[0]
+
+@router.post("/{project_id}/analytics/what-if", response_model=ProjectAnalytics)
+def project_analytics_what_if(
+    project_id: int,
+    scenario: ProjectAnalyticsScenario,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    # Nothing is saved: the project form calls this while the manager edits
+    project = db.query(Project).filter(Project.id == project_id).first()
+    if project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    changed = scenario.model_fields_set
+    try:
+        return what_if(
+            db, project,
+            add=scenario.add_influencer_ids,
+            remove=scenario.remove_influencer_ids,
+            budget=scenario.budget if "budget" in changed else UNCHANGED,
+            platforms=scenario.platforms if "platforms" in changed else UNCHANGED,
+        )
+    except UnknownInfluencersError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/{project_id}/recommendations", response_model=List[InfluencerRecommendation])
+def read_project_recommendations(
+    project_id: int,
+    limit: int = Query(10, ge=1, le=100),
+    target_followers: Optional[int] = Query(None, ge=1),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    project = db.query(Project).filter(Project.id == project_id).first()
+    if project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    recommendations = recommend(db, project, limit=limit, target_followers=target_followers)
+    influencers = {
+        influencer.id: influencer
+        for influencer in db.query(Influencer).filter(Influencer.id.in_([r["influencer_id"] for r in recommendations]))
+    }
+    return [
+        {**recommendation, "influencer": influencers[recommendation["influencer_id"]]}
+        for recommendation in recommendations if recommendation["influencer_id"] in influencers
+    ]
+
 @router.put("/{project_id}", response_model=ProjectSchema)
 def update_project(
     project_id: int,
@@ -88,17 +205,16 @@ def update_project(
     for key, value in project.dict().items():
         setattr(db_project, key, value)
     
-    db.commit()
-    db.refresh(db_project)
-    
     if old_title != db_project.title:
-        create_activity(
+        record_activity(
             db=db,
             project_id=project_id,
             user_id=current_user.id,
             activity_type="project_updated",
             description=f"Project title changed from '{old_title}' to '{db_project.title}'"
         )
+    db.commit()
+    db.refresh(db_project)
     
     return db_project
 
@@ -114,15 +230,14 @@ def delete_project(
     
     project_title = db_project.title
     db.delete(db_project)
-    db.commit()
-    
-    create_activity(
+    record_activity(
         db=db,
         project_id=project_id,
         user_id=current_user.id,
         activity_type="project_deleted",
         description=f"Project '{project_title}' was deleted"
     )
+    db.commit()
     
     return {"message": "Project deleted successfully"}
 
@@ -139,16 +254,15 @@ def update_project_workflow_stage(
     
     old_stage = db_project.workflow_stage
     db_project.workflow_stage = workflow_stage_update.workflow_stage
-    db.commit()
-    db.refresh(db_project)
-    
-    create_activity(
+    record_activity(
         db=db,
         project_id=project_id,
         user_id=current_user.id,
         activity_type=f"workflow_to_{db_project.workflow_stage.value}",
         description=f"Workflow stage changed from '{old_stage}' to '{db_project.workflow_stage}'"
     )
+    db.commit()
+    db.refresh(db_project)
     
     return db_project
 
@@ -178,16 +292,17 @@ def create_project_scenario(
     
     db_scenario = Scenario(**scenario.dict())
     db.add(db_scenario)
-    db.commit()
-    db.refresh(db_scenario)
+    db.flush()
     
-    create_activity(
+    record_activity(
         db=db,
         project_id=project_id,
         user_id=current_user.id,
         activity_type="scenario_created",
         description=f"New scenario version {db_scenario.version} was created"
     )
+    db.commit()
+    db.refresh(db_scenario)
     
     return db_scenario
 
@@ -209,17 +324,16 @@ def update_project_scenario(
     if "approved_at" in scenario:
         db_scenario.approved_at = scenario["approved_at"]
     
-    db.commit()
-    db.refresh(db_scenario)
-    
     if old_status != db_scenario.status:
-        create_activity(
+        record_activity(
             db=db,
             project_id=project_id,
             user_id=current_user.id,
             activity_type="scenario_approved",
             description=f"Scenario status changed from '{old_status}' to '{db_scenario.status}'"
         )
+    db.commit()
+    db.refresh(db_scenario)
     
     return db_scenario
 
@@ -236,15 +350,14 @@ def delete_project_scenario(
     
     version = db_scenario.version
     db.delete(db_scenario)
-    db.commit()
-    
-    create_activity(
+    record_activity(
         db=db,
         project_id=project_id,
         user_id=current_user.id,
         activity_type="scenario_deleted",
         description=f"Scenario version {version} was deleted"
     )
+    db.commit()
     
     return {"message": "Scenario deleted successfully"}
 
@@ -274,16 +387,15 @@ def create_project_publication(
     
     db_publication = Publication(**publication.dict())
     db.add(db_publication)
-    db.commit()
-    db.refresh(db_publication)
-    
-    create_activity(
+    record_activity(
         db=db,
         project_id=project_id,
         user_id=current_user.id,
         activity_type="publication_created",
         description=f"New publication was created"
     )
+    db.commit()
+    db.refresh(db_publication)
     
     return db_publication
 
@@ -305,45 +417,120 @@ def update_project_publication(
     if "verified_at" in publication:
         db_publication.verified_at = publication["verified_at"]
     
-    db.commit()
-    db.refresh(db_publication)
-    
     if old_status != db_publication.status:
-        create_activity(
+        record_activity(
             db=db,
             project_id=project_id,
             user_id=current_user.id,
             activity_type="publication_status_updated",
             description=f"Publication status changed from '{old_status}' to '{db_publication.status}'"
         )
+    db.commit()
+    db.refresh(db_publication)
     
     return db_publication
 
 @router.get("/{project_id}/activities", response_model=List[ActivitySchema])
 def read_project_activities(
     project_id: int,
+    response: Response,
     skip: int = 0,
     limit: int = 5,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    if project_id == 0:
-        activities = db.query(Activity).order_by(Activity.created_at.desc()).offset(skip).limit(limit).all()
-    else:
+    # selectin rather than joined, so the feed query keeps its index plan
+    query = db.query(Activity).options(selectinload(Activity.user))
+    if project_id != 0:
         project = db.query(Project).filter(Project.id == project_id).first()
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
+        query = query.filter(Activity.project_id == project_id)
+    else:
+        # Dashboard feed of the manager's own projects, from memory when the buffer covers the page
+        page = activity_feed.page(db, current_user.id, cursor=cursor, limit=limit) if not skip else None
+        if page is not None:
+            return with_users(db, finish_page(page, FEED_ORDER, limit, response))
+        query = query.filter(owned_by(current_user.id))
 
-        activities = (
-            db.query(Activity)
-            .filter(Activity.project_id == project_id)
-            .order_by(Activity.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+    # Newest first; (created_at, id) matches the activity indexes
+    activities = paginate(
+        query, FEED_ORDER, response,
+        cursor=cursor, skip=skip, limit=limit, descending=True
+    )
     return activities
 
+@router.get("/{project_id}/comments", response_model=List[CommentSchema])
+def read_project_comments(
+    project_id: int,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    project = db.query(Project).filter(Project.id == project_id).first()
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    query = db.query(Comment).options(joinedload(Comment.user)).filter(Comment.project_id == project_id)
+    return paginate(query, (Comment.created_at, Comment.id), response, cursor=cursor, skip=skip, limit=limit)
+
+@router.get("/{project_id}/stream")
+async def stream_project_events(
+    project_id: int,
+    request: Request,
+    last_event_id: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_or_query_token)
+):
+    project = await run_in_threadpool(lambda: db.query(Project).filter(Project.id == project_id).first())
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    if project_events.full:
+        metrics.inc("stream.rejected")
+        raise HTTPException(
+            status_code=503,
+            detail="Too many open streams",
+            headers={"Retry-After": str(int(settings.STREAM_HEARTBEAT_SECONDS))}
+        )
+    # The request's session is closed before the body streams, so catch-ups open their own.
+    # The body subscribes once it starts, so a client gone before then holds no slot
+    body = event_stream(
+        lambda: SessionLocal(read_only=True),
+        project_id,
+        StreamCursor.parse(last_event_id or request.query_params.get("last_event_id")),
+        request.is_disconnected
+    )
+    return StreamingResponse(
+        body,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/{project_id}/activity-rollups", response_model=List[ActivityDailyRollupSchema])
+def read_project_activity_rollups(
+    project_id: int,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    # Daily counts for activities compacted by services.activity_retention
+    project = db.query(Project).filter(Project.id == project_id).first()
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    query = db.query(ActivityDailyRollup).filter(ActivityDailyRollup.project_id == project_id)
+    if since is not None:
+        query = query.filter(ActivityDailyRollup.day >= since)
+    if until is not None:
+        query = query.filter(ActivityDailyRollup.day < until)
+    return query.order_by(ActivityDailyRollup.day, ActivityDailyRollup.activity_type).all()
+
 @router.get("/{project_id}/influencers", response_model=List[InfluencerSchema])
 def read_project_influencers(
     project_id: int,
@@ -370,17 +557,51 @@ def create_project_influencer(
     
     db_influencer = ProjectInfluencer(**influencer.dict())
     db.add(db_influencer)
-    db.commit()
-    db.refresh(db_influencer)
-    
-    create_activity(
+    record_activity(
         db=db,
         project_id=project_id,
         user_id=current_user.id,
         activity_type="influencer_added",
         description=f"Influencer '{db_influencer.influencer_id}' was added to project '{project_id}'"
     )
+    db.commit()
+    db.refresh(db_influencer)
     
     return db_influencer
 
-    
\ No newline at end of file
+@router.post("/{project_id}/influencers/bulk", response_model=BulkCreateResult)
+def create_project_influencers_bulk(
+    project_id: int,
+    influencers: List[ProjectInfluencerCreate],
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    check_batch_size(influencers)
+    project = db.query(Project).filter(Project.id == project_id).first()
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    items = [influencer.dict() for influencer in influencers]
+    result, created = bulk_create(
+        db, ProjectInfluencer, items,
+        references=[("influencer_id", Influencer, "Influencer not found")],
+        rejected={
+            index: "project_id does not match the URL"
+            for index, item in enumerate(items) if item["project_id"] != project_id
+        }
+    )
+    
+    record_activities(db, [
+        activity_row(
+            project_id, current_user.id, "influencer_added",
+            f"Influencer '{item['influencer_id']}' was added to project '{project_id}'"
+        )
+        for _, _, item in created
+    ])
+    # Core inserts skip the ORM flush hooks that evict dashboard statistics,
+    # maintain the progress counters and refresh recommendation features
+    touch_managers(db, [project.manager_id])
+    count_assignments(db, [item for _, _, item in created])
+    touch_influencers(db, [item["influencer_id"] for _, _, item in created])
+    db.commit()
+    return result
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from db.session import get_db
 from models.models import Publication, Project, Influencer, User
-from schemas.schemas import PublicationCreate, Publication as PublicationSchema
+from schemas.schemas import PublicationCreate, BulkCreateResult, Publication as PublicationSchema
 from core.security import get_current_user
+from core.pagination import paginate
+from services.bulk import bulk_create, check_batch_size
 
 router = APIRouter()
 
@@ -30,14 +32,33 @@ def create_publication(
     db.refresh(db_publication)
     return db_publication
 
+@router.post("/bulk", response_model=BulkCreateResult)
+def create_publications_bulk(
+    publications: List[PublicationCreate],
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    check_batch_size(publications)
+    result, _ = bulk_create(
+        db, Publication, [publication.dict() for publication in publications],
+        references=[
+            ("project_id", Project, "Project not found"),
+            ("influencer_id", Influencer, "Influencer not found"),
+        ]
+    )
+    db.commit()
+    return result
+
 @router.get("/", response_model=List[PublicationSchema])
 def read_publications(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    publications = db.query(Publication).offset(skip).limit(limit).all()
+    publications = paginate(db.query(Publication), (Publication.id,), response, cursor=cursor, skip=skip, limit=limit)
     return publications
 
 @router.get("/{publication_id}", response_model=PublicationSchema)
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from db.session import get_db
 from models.models import Scenario, Project, Influencer, User
-from schemas.schemas import ScenarioCreate, Scenario as ScenarioSchema
+from schemas.schemas import ScenarioCreate, BulkCreateResult, Scenario as ScenarioSchema
 from core.security import get_current_user
+from core.pagination import paginate
+from services.bulk import bulk_create, check_batch_size
 
 router = APIRouter()
 
@@ -30,14 +32,33 @@ def create_scenario(
     db.refresh(db_scenario)
     return db_scenario
 
+@router.post("/bulk", response_model=BulkCreateResult)
+def create_scenarios_bulk(
+    scenarios: List[ScenarioCreate],
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    check_batch_size(scenarios)
+    result, _ = bulk_create(
+        db, Scenario, [scenario.dict() for scenario in scenarios],
+        references=[
+            ("project_id", Project, "Project not found"),
+            ("influencer_id", Influencer, "Influencer not found"),
+        ]
+    )
+    db.commit()
+    return result
+
 @router.get("/", response_model=List[ScenarioSchema])
 def read_scenarios(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    scenarios = db.query(Scenario).offset(skip).limit(limit).all()
+    scenarios = paginate(db.query(Scenario), (Scenario.id,), response, cursor=cursor, skip=skip, limit=limit)
     return scenarios
 
 @router.get("/{scenario_id}", response_model=ScenarioSchema)
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from db.session import get_db
+from models.models import User
+from schemas.schemas import DashboardStats
+from core.security import get_current_user
+from services.stats import get_stats
+
+router = APIRouter()
+
+@router.get("/", response_model=DashboardStats)
+def read_stats(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    # Aggregates over the current manager's projects, cached briefly per manager
+    return get_stats(db, current_user.id)
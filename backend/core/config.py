@@ -26,11 +26,97 @@ class Settings(BaseSettings):
             "DATABASE_URL",
             f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}/{POSTGRES_DB}"
         )
+    # What startup does about the schema: "verify" fails fast unless the database
+    # is at the latest migration, "upgrade" applies pending migrations, "off" skips it
+    SCHEMA_CHECK: str = os.getenv("SCHEMA_CHECK", "off" if TESTING else "verify")
+
+    # Comma-separated read replica URLs; GET requests are routed to them
+    DATABASE_REPLICA_URLS: str = os.getenv("DATABASE_REPLICA_URLS", "")
+    # How long a user's reads stay on the primary after they wrote something
+    REPLICA_STICKY_SECONDS: int = int(os.getenv("REPLICA_STICKY_SECONDS", "10"))
+
+    # "sync" serves every endpoint from the threadpool, "async" switches the hot
+    # read endpoints to AsyncSession handlers, "both" keeps the sync handlers and
+    # mounts the async ones under /async for side-by-side benchmarking
+    DB_MODE: str = os.getenv("DB_MODE", "sync")
+
+    # Connection pool
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "True") == "True"
+
     # JWT
     SECRET_KEY: str = os.getenv("SECRET_KEY", "a-very-secret-key-for-testing" if TESTING else os.environ.get("SECRET_KEY"))
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8 # 8 days for testing, adjust as needed
 
+    # "subject" tokens only carry the username, "claims" tokens also carry
+    # user id, role and manager/influencer id and are paired with a refresh token
+    TOKEN_FORMAT: str = os.getenv("TOKEN_FORMAT", "subject")
+    CLAIMS_ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("CLAIMS_ACCESS_TOKEN_EXPIRE_MINUTES", "15"))
+    REFRESH_TOKEN_EXPIRE_DAYS: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "14"))
+    TOKEN_DENYLIST_CAPACITY: int = int(os.getenv("TOKEN_DENYLIST_CAPACITY", "100000"))
+
+    # Maximum number of items accepted by the bulk create endpoints
+    BULK_MAX_ITEMS: int = int(os.getenv("BULK_MAX_ITEMS", "1000"))
+
+    # Influencer roster import
+    IMPORT_CHUNK_SIZE: int = int(os.getenv("IMPORT_CHUNK_SIZE", "500"))
+    IMPORT_MAX_REPORTED_ERRORS: int = int(os.getenv("IMPORT_MAX_REPORTED_ERRORS", "100"))
+
+    # Activity log: "transactional" writes with the mutation, "background"
+    # queues rows after commit for a batching flusher thread
+    ACTIVITY_WRITE_MODE: str = os.getenv("ACTIVITY_WRITE_MODE", "transactional")
+    ACTIVITY_BATCH_SIZE: int = int(os.getenv("ACTIVITY_BATCH_SIZE", "200"))
+    ACTIVITY_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("ACTIVITY_FLUSH_INTERVAL_SECONDS", "0.5"))
+    ACTIVITY_QUEUE_MAX: int = int(os.getenv("ACTIVITY_QUEUE_MAX", "10000"))
+
+    # Per-manager in-memory dashboard feed
+    ACTIVITY_FEED_SIZE: int = int(os.getenv("ACTIVITY_FEED_SIZE", "200"))
+    ACTIVITY_FEED_REFRESH_SECONDS: float = float(os.getenv("ACTIVITY_FEED_REFRESH_SECONDS", "30"))
+
+    # Server-sent event streams (/projects/{id}/stream), per worker
+    STREAM_MAX_CONNECTIONS: int = int(os.getenv("STREAM_MAX_CONNECTIONS", "1000"))
+    STREAM_QUEUE_SIZE: int = int(os.getenv("STREAM_QUEUE_SIZE", "100"))
+    STREAM_HEARTBEAT_SECONDS: float = float(os.getenv("STREAM_HEARTBEAT_SECONDS", "15"))
+    STREAM_RETRY_MILLISECONDS: int = int(os.getenv("STREAM_RETRY_MILLISECONDS", "3000"))
+    STREAM_REPLAY_LIMIT: int = int(os.getenv("STREAM_REPLAY_LIMIT", "500"))
+    STREAM_CATCH_UP_OVERLAP: int = int(os.getenv("STREAM_CATCH_UP_OVERLAP", "50"))
+
+    # Activity retention: days kept in the hot table, days kept in the
+    # archive before compaction into daily rollups
+    ACTIVITY_HOT_DAYS: int = int(os.getenv("ACTIVITY_HOT_DAYS", "30"))
+    ACTIVITY_RETENTION_DAYS: int = int(os.getenv("ACTIVITY_RETENTION_DAYS", "365"))
+    ACTIVITY_ARCHIVE_BATCH_SIZE: int = int(os.getenv("ACTIVITY_ARCHIVE_BATCH_SIZE", "5000"))
+
+    # Rows fetched per round trip by the streaming exports
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+    # Per-manager dashboard statistics; writes through the ORM evict early
+    STATS_CACHE_SIZE: int = int(os.getenv("STATS_CACHE_SIZE", "10000"))
+    STATS_CACHE_TTL_SECONDS: int = int(os.getenv("STATS_CACHE_TTL_SECONDS", "30"))
+
+    # Per-manager influencer feature matrices for recommendations; commits
+    # refresh the changed rows, the TTL bounds drift from writes outside the app
+    RECOMMENDATION_CACHE_SIZE: int = int(os.getenv("RECOMMENDATION_CACHE_SIZE", "100"))
+    RECOMMENDATION_CACHE_TTL_SECONDS: int = int(os.getenv("RECOMMENDATION_CACHE_TTL_SECONDS", "600"))
+    # Score subtracted per assignment on a project that is not completed
+    RECOMMENDATION_LOAD_PENALTY: float = float(os.getenv("RECOMMENDATION_LOAD_PENALTY", "0.5"))
+
+    # Snapshots per delta-encoded follower series block
+    SERIES_BLOCK_POINTS: int = int(os.getenv("SERIES_BLOCK_POINTS", "512"))
+
+    # Principal cache used by get_current_user
+    PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+    PRINCIPAL_CACHE_TTL_SECONDS: int = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+
+    # Password hashing pool
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "32"))
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = int(os.getenv("PASSWORD_HASH_RETRY_AFTER_SECONDS", "2"))
+
     class Config:
         env_file = '.env'
         env_file_encoding = 'utf-8'
@@ -0,0 +1,85 @@
+import hashlib
+import math
+import threading
+import time
+from typing import Dict, Optional
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over string keys."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class TokenDenylist:
+    """Revoked token ids.
+
+    The bloom filter answers the common "not revoked" case without touching
+    the exact map; only bloom hits fall through to the exact lookup. Entries
+    are kept until the token itself would have expired.
+
+    The denylist lives in process memory and is not shared: with several
+    workers, a token revoked by ``/logout`` or ``/refresh`` on one worker is
+    still accepted by the others until it expires. The short-lived claims
+    access tokens (``CLAIMS_ACCESS_TOKEN_EXPIRE_MINUTES``) bound that window.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._revoked: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def revoke(self, jti: str, expires_at: Optional[float] = None) -> None:
+        if expires_at is None:
+            expires_at = float("inf")
+        with self._lock:
+            self._revoked[jti] = expires_at
+            self._bloom.add(jti)
+            if len(self._revoked) > self.capacity:
+                self._purge_locked()
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        if not jti or jti not in self._bloom:
+            return False
+        expires_at = self._revoked.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def purge(self) -> None:
+        with self._lock:
+            self._purge_locked()
+
+    def _purge_locked(self) -> None:
+        now = time.time()
+        self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp > now}
+        # Bloom filters can't delete, so rebuild from the surviving entries
+        self._bloom = BloomFilter(max(self.capacity, len(self._revoked)), self.error_rate)
+        for jti in self._revoked:
+            self._bloom.add(jti)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._revoked.clear()
+            self._bloom = BloomFilter(self.capacity, self.error_rate)
+
+    def __len__(self) -> int:
+        return len(self._revoked)
@@ -0,0 +1,63 @@
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Sequence
+
+from fastapi import HTTPException, Response
+from sqlalchemy import tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence) -> str:
+    payload = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor does not match the sort order")
+        return [
+            datetime.fromisoformat(value) if value is not None and column.type.python_type is datetime else value
+            for value, column in zip(values, columns)
+        ]
+    except (ValueError, TypeError, NotImplementedError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset(query, columns: Sequence, cursor: Optional[str] = None, skip: int = 0, limit: int = 100, descending: bool = False):
+    """Order ``query`` by ``columns`` and seek past ``cursor``.
+
+    The last column must be unique (normally the primary key). Works on both
+    ``Query`` and ``select()``; one extra row is fetched so ``finish_page``
+    can tell whether there is a next page. Without a cursor the old
+    skip/limit behaviour applies.
+    """
+    if cursor is not None:
+        values = decode_cursor(cursor, columns)
+        key = tuple_(*columns)
+        query = query.where(key < tuple_(*values) if descending else key > tuple_(*values))
+    ordering = [column.desc() for column in columns] if descending else list(columns)
+    query = query.order_by(*ordering)
+    if cursor is None and skip:
+        query = query.offset(skip)
+    return query.limit(limit + 1)
+
+
+def finish_page(rows: Sequence, columns: Sequence, limit: int, response: Response) -> List:
+    rows = list(rows)
+    if len(rows) > limit:
+        rows = rows[:max(limit, 0)]
+        if rows:
+            last = rows[-1]
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor([getattr(last, column.key) for column in columns])
+    return rows
+
+
+def paginate(query, columns: Sequence, response: Response, cursor: Optional[str] = None,
+             skip: int = 0, limit: int = 100, descending: bool = False) -> List:
+    rows = keyset(query, columns, cursor=cursor, skip=skip, limit=limit, descending=descending).all()
+    return finish_page(rows, columns, limit, response)
@@ -1,24 +1,101 @@
+import asyncio
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import ValidationError
+from sqlalchemy import event, inspect
 from sqlalchemy.orm import Session
 
+from core.cache import TTLCache
 from core.config import settings
+from core.denylist import TokenDenylist
+from core.metrics import metrics
 from db.session import get_db
-from models.models import User
+from models.models import User, UserRole, Manager, Influencer
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/login", auto_error=False)
+
+_pwd_context = None
+
+def get_pwd_context():
+    # passlib and its bcrypt backend are loaded on first use, not at import
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _pwd_context
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
+
+class PasswordHasher:
+    """Runs bcrypt in a bounded worker pool, rejecting work once the queue is full."""
+
+    def __init__(self, workers: int, max_queue: int, retry_after: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+            return self._executor
+
+    def _timed(self, submitted_at: float, fn, *args):
+        started_at = time.perf_counter()
+        metrics.observe("password_hash.queue_wait_seconds", started_at - submitted_at)
+        try:
+            return fn(*args)
+        finally:
+            metrics.observe("password_hash.latency_seconds", time.perf_counter() - started_at)
+
+    async def run(self, fn, *args):
+        executor = self._get_executor()
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                metrics.inc("password_hash.rejected")
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication service is busy, retry later",
+                    headers={"Retry-After": str(self.retry_after)},
+                )
+            self._pending += 1
+            metrics.set_gauge("password_hash.pending", self._pending)
+        try:
+            future = executor.submit(self._timed, time.perf_counter(), fn, *args)
+            return await asyncio.wrap_future(future)
+        finally:
+            with self._lock:
+                self._pending -= 1
+                metrics.set_gauge("password_hash.pending", self._pending)
+
+password_hasher = PasswordHasher(
+    settings.PASSWORD_HASH_WORKERS,
+    settings.PASSWORD_HASH_MAX_QUEUE,
+    settings.PASSWORD_HASH_RETRY_AFTER_SECONDS,
+)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_hasher.run(get_password_hash, password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
@@ -27,26 +104,168 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
     to_encode.update({"exp": expire})
+    to_encode.setdefault("jti", uuid.uuid4().hex)
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+def create_claims_token(principal: "Principal") -> str:
+    """Short-lived access token carrying everything authorization needs."""
+    return create_access_token(
+        data={
+            "sub": principal.username,
+            "uid": principal.id,
+            "role": principal.role.value if principal.role else None,
+            "mid": principal.manager_id,
+            "iid": principal.influencer_id,
+            "type": "access",
+        },
+        expires_delta=timedelta(minutes=settings.CLAIMS_ACCESS_TOKEN_EXPIRE_MINUTES),
+    )
+
+def create_refresh_token(username: str) -> str:
+    return create_access_token(
+        data={"sub": username, "type": "refresh"},
+        expires_delta=timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    )
+
+def issue_tokens(principal: "Principal") -> dict:
+    if settings.TOKEN_FORMAT == "claims":
+        return {
+            "access_token": create_claims_token(principal),
+            "refresh_token": create_refresh_token(principal.username),
+            "token_type": "bearer",
+        }
+    access_token = create_access_token(
+        data={"sub": principal.username},
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+    )
+    return {"access_token": access_token, "token_type": "bearer"}
+
+# Revoked token ids (logout, refresh rotation)
+# Per process: a token revoked here stays valid on other workers until it expires
+token_denylist = TokenDenylist(settings.TOKEN_DENYLIST_CAPACITY)
+
+def revoke_token(payload: dict) -> None:
+    if payload.get("jti"):
+        token_denylist.revoke(payload["jti"], payload.get("exp"))
+
+def decode_token(token: str, token_type: str = "access") -> Optional[dict]:
+    """Return the verified payload, or None if the token is invalid or revoked."""
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except (JWTError, ValidationError):
+        return None
+    if payload.get("sub") is None or payload.get("type", "access") != token_type:
+        return None
+    if token_denylist.is_revoked(payload.get("jti")):
+        return None
+    return payload
+
+@dataclass(frozen=True)
+class Principal:
+    """Slim, immutable snapshot of the authenticated user."""
+    id: int
+    username: str
+    role: Optional[UserRole] = None
+    name: Optional[str] = None
+    profile_image: Optional[str] = None
+    created_at: Optional[datetime] = None
+    manager_id: Optional[int] = None
+    influencer_id: Optional[int] = None
+
+    @property
+    def is_complete(self) -> bool:
+        # Principals rebuilt from token claims lack the profile fields
+        return self.created_at is not None
+
+    @classmethod
+    def from_user(cls, user: User, manager_id: Optional[int] = None, influencer_id: Optional[int] = None) -> "Principal":
+        return cls(
+            id=user.id,
+            username=user.username,
+            role=user.role,
+            name=user.name,
+            profile_image=user.profile_image,
+            created_at=user.created_at,
+            manager_id=manager_id,
+            influencer_id=influencer_id,
+        )
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> "Principal":
+        return cls(
+            id=payload["uid"],
+            username=payload["sub"],
+            role=UserRole(payload["role"]) if payload.get("role") else None,
+            manager_id=payload.get("mid"),
+            influencer_id=payload.get("iid"),
+        )
+
+# Principals keyed on token subject (the username)
+principal_cache = TTLCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
+def invalidate_principal(username: Optional[str]) -> None:
+    if username is not None:
+        principal_cache.pop(username)
+
+@event.listens_for(User, "after_insert")
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user_principal(mapper, connection, target):
+    invalidate_principal(target.username)
+    # A rename must also evict the entry cached under the old subject
+    for old_username in inspect(target).attrs.username.history.deleted:
+        invalidate_principal(old_username)
+
+def load_user_principal(db: Session, username: str) -> Tuple[Optional[User], Optional[Principal]]:
+    """The user row and its principal, with the manager/influencer ids joined in one query."""
+    row = (
+        db.query(User, Manager.id, Influencer.id)
+        .outerjoin(Manager, Manager.user_id == User.id)
+        .outerjoin(Influencer, Influencer.user_id == User.id)
+        .filter(User.username == username)
+        .first()
+    )
+    return (row[0], Principal.from_user(*row)) if row else (None, None)
+
+def load_principal(db: Session, username: str) -> Optional[Principal]:
+    return load_user_principal(db, username)[1]
+
+async def resolve_principal(db: Session, username: str) -> Optional[Principal]:
+    principal = principal_cache.get(username)
+    if principal is None:
+        # The session is synchronous, keep the query off the event loop
+        principal = await run_in_threadpool(load_principal, db, username)
+        if principal is not None:
+            principal_cache.set(username, principal)
+    return principal
+
+async def authenticate(token: Optional[str], db: Session) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-    except ValidationError:
+    payload = decode_token(token) if token else None
+    if payload is None:
         raise credentials_exception
-        
-    user = db.query(User).filter(User.username == username).first()
+
+    # Claims tokens are self-contained, no lookup needed
+    if "uid" in payload:
+        return Principal.from_claims(payload)
+
+    user = await resolve_principal(db, payload["sub"])
     if user is None:
         raise credentials_exception
-    return user 
\ No newline at end of file
+    return user
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> Principal:
+    return await authenticate(token, db)
+
+async def get_current_user_or_query_token(
+    access_token: Optional[str] = None,
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> Principal:
+    # EventSource can't send headers, so streams also accept ?access_token=
+    return await authenticate(token or access_token, db)
@@ -0,0 +1,89 @@
+"""Versioned schema migrations.
+
+Every ``vNNNN_<name>.py`` module in this package defines ``upgrade(connection)``.
+Applied versions are recorded in the ``schema_version`` table. Migrations are
+written to be safe against databases that were created by the old
+``Base.metadata.create_all`` startup, so existing deployments can simply
+upgrade.
+
+    python -m db.migrations upgrade      # apply pending migrations
+    python -m db.migrations current      # print current and head version
+"""
+import importlib
+import logging
+import pkgutil
+import sys
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select, text
+
+logger = logging.getLogger(__name__)
+
+version_metadata = MetaData()
+schema_version = Table(
+    "schema_version",
+    version_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False, default=datetime.utcnow),
+)
+
+# Arbitrary key for the Postgres advisory lock that serializes concurrent upgrades
+_LOCK_KEY = 740_118_001
+
+
+def discover() -> List[Tuple[int, str]]:
+    migrations = []
+    for module in pkgutil.iter_modules(__path__):
+        if module.name.startswith("v") and module.name[1:5].isdigit():
+            migrations.append((int(module.name[1:5]), module.name))
+    return sorted(migrations)
+
+
+def head_version() -> int:
+    migrations = discover()
+    return migrations[-1][0] if migrations else 0
+
+
+def current_version(engine) -> int:
+    if not inspect(engine).has_table(schema_version.name):
+        return 0
+    with engine.connect() as connection:
+        version = connection.execute(select(schema_version.c.version).order_by(schema_version.c.version.desc())).scalar()
+    return version or 0
+
+
+def upgrade(engine, target: Optional[int] = None) -> List[str]:
+    """Apply every pending migration up to ``target`` (default: head)."""
+    applied = []
+    with engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _LOCK_KEY})
+        version_metadata.create_all(connection, checkfirst=True)
+        current = connection.execute(select(schema_version.c.version).order_by(schema_version.c.version.desc())).scalar() or 0
+        for version, name in discover():
+            if version <= current or (target is not None and version > target):
+                continue
+            logger.info("Applying migration %s", name)
+            module = importlib.import_module(f"{__name__}.{name}")
+            module.upgrade(connection)
+            connection.execute(schema_version.insert().values(version=version, name=name, applied_at=datetime.utcnow()))
+            applied.append(name)
+    return applied
+
+
+def main(argv: List[str]) -> int:
+    from db.session import engine
+
+    logging.basicConfig(level=logging.INFO)
+    command = argv[0] if argv else "upgrade"
+    if command == "upgrade":
+        applied = upgrade(engine)
+        print(f"Applied {len(applied)} migration(s), now at version {current_version(engine)}")
+    elif command == "current":
+        print(f"current: {current_version(engine)}, head: {head_version()}")
+    else:
+        print(f"Unknown command: {command}", file=sys.stderr)
+        return 1
+    return 0
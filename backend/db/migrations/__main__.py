@@ -0,0 +1,5 @@
+import sys
+
+from db.migrations import main
+
+sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,34 @@
+"""Idempotent DDL helpers for migrations."""
+from typing import Sequence
+
+from sqlalchemy import inspect, text
+
+
+def has_table(connection, table: str) -> bool:
+    return inspect(connection).has_table(table)
+
+
+def has_column(connection, table: str, column: str) -> bool:
+    return any(c["name"] == column for c in inspect(connection).get_columns(table))
+
+
+def has_index(connection, table: str, name: str) -> bool:
+    return any(index["name"] == name for index in inspect(connection).get_indexes(table))
+
+
+def create_index(connection, name: str, table: str, columns: Sequence[str], unique: bool = False) -> None:
+    if has_index(connection, table, name):
+        return
+    unique_sql = "UNIQUE " if unique else ""
+    connection.execute(text(f"CREATE {unique_sql}INDEX {name} ON {table} ({', '.join(columns)})"))
+
+
+def drop_index(connection, name: str, table: str) -> None:
+    if has_index(connection, table, name):
+        connection.execute(text(f"DROP INDEX {name}"))
+
+
+def add_column(connection, table: str, column_ddl: str) -> None:
+    """Add ``column_ddl`` (e.g. ``"total_reach BIGINT"``) unless the column exists."""
+    if not has_column(connection, table, column_ddl.split()[0]):
+        connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column_ddl}"))
@@ -0,0 +1,141 @@
+"""Baseline schema, as previously created by Base.metadata.create_all."""
+from sqlalchemy import JSON, Column, DateTime, Enum, ForeignKey, Integer, MetaData, String, Table
+
+from models.models import ProjectStatus, UserRole, WorkflowStage
+
+metadata = MetaData()
+
+Table(
+    "users", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("username", String, unique=True, index=True),
+    Column("password", String),
+    Column("name", String),
+    Column("role", Enum(UserRole)),
+    Column("profile_image", String),
+    Column("created_at", DateTime),
+)
+
+Table(
+    "managers", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id")),
+)
+
+Table(
+    "influencers", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("manager_id", Integer, ForeignKey("managers.id")),
+    Column("nickname", String),
+    Column("bio", String),
+    Column("instagram_handle", String, nullable=True),
+    Column("instagram_followers", Integer, nullable=True),
+    Column("tiktok_handle", String, nullable=True),
+    Column("tiktok_followers", Integer, nullable=True),
+    Column("youtube_handle", String, nullable=True),
+    Column("youtube_followers", Integer, nullable=True),
+    Column("telegram_handle", String, nullable=True),
+    Column("telegram_followers", Integer, nullable=True),
+    Column("vk_handle", String, nullable=True),
+    Column("vk_followers", Integer, nullable=True),
+)
+
+Table(
+    "projects", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("title", String),
+    Column("client", String),
+    Column("description", String),
+    Column("key_requirements", JSON),
+    Column("start_date", DateTime),
+    Column("deadline", DateTime),
+    Column("scenario_deadline", DateTime, nullable=True),
+    Column("material_deadline", DateTime, nullable=True),
+    Column("publication_deadline", DateTime, nullable=True),
+    Column("status", Enum(ProjectStatus)),
+    Column("workflow_stage", Enum(WorkflowStage)),
+    Column("budget", Integer),
+    Column("erid", String, nullable=True),
+    Column("manager_id", Integer, ForeignKey("managers.id")),
+    Column("technical_links", JSON),
+    Column("platforms", JSON),
+    Column("created_at", DateTime),
+)
+
+Table(
+    "project_influencers", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("project_id", Integer, ForeignKey("projects.id")),
+    Column("influencer_id", Integer, ForeignKey("influencers.id")),
+    Column("scenario_status", String),
+    Column("material_status", String),
+    Column("publication_status", String),
+    Column("scenario_completed_at", DateTime),
+    Column("material_completed_at", DateTime),
+    Column("publication_completed_at", DateTime),
+)
+
+Table(
+    "scenarios", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("project_id", Integer, ForeignKey("projects.id")),
+    Column("influencer_id", Integer, ForeignKey("influencers.id")),
+    Column("content", String),
+    Column("google_doc_url", String),
+    Column("status", String),
+    Column("submitted_at", DateTime),
+    Column("approved_at", DateTime),
+    Column("deadline", DateTime),
+    Column("version", Integer),
+)
+
+Table(
+    "materials", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("project_id", Integer, ForeignKey("projects.id")),
+    Column("influencer_id", Integer, ForeignKey("influencers.id")),
+    Column("material_url", String),
+    Column("google_drive_url", String),
+    Column("description", String),
+    Column("status", String),
+    Column("submitted_at", DateTime),
+    Column("approved_at", DateTime),
+    Column("deadline", DateTime),
+)
+
+Table(
+    "publications", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("project_id", Integer, ForeignKey("projects.id")),
+    Column("influencer_id", Integer, ForeignKey("influencers.id")),
+    Column("platform", String),
+    Column("publication_url", String),
+    Column("content", String, nullable=True),
+    Column("published_at", DateTime),
+    Column("status", String),
+    Column("verified_at", DateTime),
+)
+
+Table(
+    "comments", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("project_id", Integer, ForeignKey("projects.id")),
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("content", String),
+    Column("created_at", DateTime),
+)
+
+Table(
+    "activities", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("project_id", Integer, ForeignKey("projects.id")),
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("activity_type", String),
+    Column("description", String),
+    Column("created_at", DateTime),
+)
+
+
+def upgrade(connection):
+    metadata.create_all(connection, checkfirst=True)
@@ -0,0 +1,25 @@
+"""Indexes for the foreign-key filters and activity feed ordering used by list endpoints."""
+from db.migrations.ops import create_index
+
+INDEXES = [
+    ("ix_managers_user_id", "managers", ["user_id"]),
+    ("ix_influencers_user_id", "influencers", ["user_id"]),
+    ("ix_influencers_manager_id", "influencers", ["manager_id"]),
+    ("ix_projects_manager_id", "projects", ["manager_id"]),
+    ("ix_project_influencers_project_id_influencer_id", "project_influencers", ["project_id", "influencer_id"]),
+    ("ix_project_influencers_influencer_id", "project_influencers", ["influencer_id"]),
+    ("ix_scenarios_project_id", "scenarios", ["project_id"]),
+    ("ix_scenarios_influencer_id", "scenarios", ["influencer_id"]),
+    ("ix_materials_project_id", "materials", ["project_id"]),
+    ("ix_materials_influencer_id", "materials", ["influencer_id"]),
+    ("ix_publications_project_id", "publications", ["project_id"]),
+    ("ix_publications_influencer_id", "publications", ["influencer_id"]),
+    ("ix_comments_project_id_created_at", "comments", ["project_id", "created_at"]),
+    ("ix_activities_project_id_created_at", "activities", ["project_id", "created_at", "id"]),
+    ("ix_activities_created_at", "activities", ["created_at", "id"]),
+]
+
+
+def upgrade(connection):
+    for name, table, columns in INDEXES:
+        create_index(connection, name, table, columns)
@@ -0,0 +1,34 @@
+"""Archive table for activities past the hot window, plus per-project daily rollups."""
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, MetaData, String, Table, UniqueConstraint
+
+metadata = MetaData()
+
+# Referenced tables, only so the foreign keys resolve; they already exist
+Table("projects", metadata, Column("id", Integer, primary_key=True))
+Table("users", metadata, Column("id", Integer, primary_key=True))
+
+activities_archive = Table(
+    "activities_archive", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("project_id", Integer, ForeignKey("projects.id")),
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("activity_type", String),
+    Column("description", String),
+    Column("created_at", DateTime),
+    Index("ix_activities_archive_project_id_created_at", "project_id", "created_at", "id"),
+    Index("ix_activities_archive_created_at", "created_at", "id"),
+)
+
+activity_daily_rollups = Table(
+    "activity_daily_rollups", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("project_id", Integer, ForeignKey("projects.id")),
+    Column("day", Date),
+    Column("activity_type", String),
+    Column("count", Integer),
+    UniqueConstraint("project_id", "day", "activity_type", name="uq_activity_daily_rollups_project_day_type"),
+)
+
+
+def upgrade(connection):
+    metadata.create_all(connection, tables=[activities_archive, activity_daily_rollups], checkfirst=True)
@@ -0,0 +1,62 @@
+"""Per-project, per-stage assignment counters, backfilled from project_influencers."""
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, MetaData, String, Table, UniqueConstraint, case, func, insert, literal, select
+
+metadata = MetaData()
+
+# Referenced tables; they already exist
+Table("projects", metadata, Column("id", Integer, primary_key=True))
+project_influencers = Table(
+    "project_influencers", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("project_id", Integer),
+    Column("scenario_status", String),
+    Column("material_status", String),
+    Column("publication_status", String),
+    Column("scenario_completed_at", DateTime),
+    Column("material_completed_at", DateTime),
+    Column("publication_completed_at", DateTime),
+)
+
+project_stage_progress = Table(
+    "project_stage_progress", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("project_id", Integer, ForeignKey("projects.id"), nullable=False),
+    Column("stage", String, nullable=False),
+    Column("total", Integer, nullable=False),
+    Column("submitted", Integer, nullable=False),
+    Column("approved", Integer, nullable=False),
+    Column("completed", Integer, nullable=False),
+    UniqueConstraint("project_id", "stage", name="uq_project_stage_progress_project_stage"),
+)
+
+# Frozen copies of services.project_progress at the time of this migration
+SUBMITTED = ("in_review", "approved", "rejected", "published", "verified")
+APPROVED = ("approved", "published", "verified")
+
+
+def upgrade(connection):
+    metadata.create_all(connection, tables=[project_stage_progress], checkfirst=True)
+    pi = project_influencers.c
+    progress = project_stage_progress.c
+    projects = metadata.tables["projects"]
+    for stage in ("scenario", "material", "publication"):
+        status = pi[f"{stage}_status"]
+        counts = (
+            select(
+                projects.c.id,
+                literal(stage),
+                func.count(pi.id),
+                func.coalesce(func.sum(case((status.in_(SUBMITTED), 1), else_=0)), 0),
+                func.coalesce(func.sum(case((status.in_(APPROVED), 1), else_=0)), 0),
+                func.coalesce(func.sum(case((pi[f"{stage}_completed_at"].is_not(None), 1), else_=0)), 0),
+            )
+            .select_from(projects.outerjoin(project_influencers, pi.project_id == projects.c.id))
+            # Idempotent, including for tables created empty by create_all
+            .where(~select(progress.id).where(progress.project_id == projects.c.id, progress.stage == stage).exists())
+            .group_by(projects.c.id)
+        )
+        connection.execute(
+            insert(project_stage_progress).from_select(
+                ["project_id", "stage", "total", "submitted", "approved", "completed"], counts
+            )
+        )
@@ -0,0 +1,12 @@
+"""Full-text search over influencer names, bios and handles (FTS5 on SQLite, GIN on Postgres)."""
+from sqlalchemy import text
+
+from db import search
+
+
+def upgrade(connection):
+    # The same DDL the models install on new databases
+    search.install(connection)
+    if connection.dialect.name == "sqlite":
+        # Index the rows that already exist
+        connection.execute(text("INSERT INTO influencers_fts(influencers_fts) VALUES ('rebuild')"))
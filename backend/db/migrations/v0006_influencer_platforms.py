@@ -0,0 +1,50 @@
+"""Per-platform follower rows and total reach for influencers, backfilled from the platform columns."""
+from datetime import datetime
+
+from sqlalchemy import (Column, DateTime, ForeignKey, Index, Integer, MetaData, String, Table, UniqueConstraint,
+                        and_, func, insert, literal, select, update)
+
+from db.migrations.ops import add_column, create_index
+
+PLATFORMS = ("instagram", "tiktok", "youtube", "telegram", "vk")
+
+metadata = MetaData()
+
+influencers = Table(
+    "influencers", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("total_reach", Integer),
+    *(Column(f"{platform}_handle", String) for platform in PLATFORMS),
+    *(Column(f"{platform}_followers", Integer) for platform in PLATFORMS),
+)
+
+influencer_platforms = Table(
+    "influencer_platforms", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("influencer_id", Integer, ForeignKey("influencers.id"), nullable=False),
+    Column("platform", String, nullable=False),
+    Column("handle", String),
+    Column("followers", Integer),
+    Column("updated_at", DateTime),
+    UniqueConstraint("influencer_id", "platform", name="uq_influencer_platforms_influencer_platform"),
+    Index("ix_influencer_platforms_platform_followers", "platform", "followers", "influencer_id"),
+)
+
+
+def upgrade(connection):
+    add_column(connection, "influencers", "total_reach BIGINT NOT NULL DEFAULT 0")
+    create_index(connection, "ix_influencers_manager_id_total_reach", "influencers", ["manager_id", "total_reach", "id"])
+    metadata.create_all(connection, tables=[influencer_platforms], checkfirst=True)
+
+    inf, rows = influencers.c, influencer_platforms.c
+    now = datetime.utcnow()
+    for platform in PLATFORMS:
+        handle, followers = inf[f"{platform}_handle"], inf[f"{platform}_followers"]
+        already = select(rows.id).where(and_(rows.influencer_id == inf.id, rows.platform == platform)).exists()
+        connection.execute(insert(influencer_platforms).from_select(
+            ["influencer_id", "platform", "handle", "followers", "updated_at"],
+            select(inf.id, literal(platform), handle, followers, literal(now))
+            .where(handle.is_not(None) | followers.is_not(None), ~already),
+        ))
+    reach = sum(func.coalesce(inf[f"{platform}_followers"], 0) for platform in PLATFORMS)
+    connection.execute(update(influencers).values(total_reach=reach))
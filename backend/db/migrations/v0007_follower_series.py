@@ -0,0 +1,59 @@
+"""Delta-encoded follower history, seeded with one snapshot of every current follower count."""
+from datetime import timezone
+
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, LargeBinary, MetaData, String, Table, insert, select
+
+metadata = MetaData()
+
+Table("influencers", metadata, Column("id", Integer, primary_key=True))
+influencer_platforms = Table(
+    "influencer_platforms", metadata,
+    Column("influencer_id", Integer),
+    Column("platform", String),
+    Column("followers", Integer),
+    Column("updated_at", DateTime),
+)
+
+follower_series_blocks = Table(
+    "follower_series_blocks", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("influencer_id", Integer, ForeignKey("influencers.id"), nullable=False),
+    Column("platform", String, nullable=False),
+    Column("metric", String, nullable=False),
+    Column("start_at", BigInteger, nullable=False),
+    Column("end_at", BigInteger, nullable=False),
+    Column("count", Integer, nullable=False),
+    Column("first_value", BigInteger, nullable=False),
+    Column("min_value", BigInteger, nullable=False),
+    Column("max_value", BigInteger, nullable=False),
+    Column("last_value", BigInteger, nullable=False),
+    Column("data", LargeBinary, nullable=False),
+    Index("ix_follower_series_blocks_series_start_at", "influencer_id", "platform", "metric", "start_at"),
+)
+
+# A one-point block: format version 1, int8 deltas, no deltas
+SINGLE_POINT = bytes([1, 0, 0])
+
+
+def upgrade(connection):
+    metadata.create_all(connection, tables=[follower_series_blocks], checkfirst=True)
+    blocks = follower_series_blocks.c
+    seeded = {
+        (row.influencer_id, row.platform)
+        for row in connection.execute(
+            select(blocks.influencer_id, blocks.platform).where(blocks.metric == "followers").distinct()
+        )
+    }
+    rows = []
+    for row in connection.execute(select(influencer_platforms).where(influencer_platforms.c.followers.is_not(None))):
+        if (row.influencer_id, row.platform) in seeded:
+            continue
+        at = int(row.updated_at.replace(tzinfo=timezone.utc).timestamp()) if row.updated_at else 0
+        rows.append({
+            "influencer_id": row.influencer_id, "platform": row.platform, "metric": "followers",
+            "start_at": at, "end_at": at, "count": 1, "first_value": row.followers,
+            "min_value": row.followers, "max_value": row.followers, "last_value": row.followers,
+            "data": SINGLE_POINT,
+        })
+    if rows:
+        connection.execute(insert(follower_series_blocks), rows)
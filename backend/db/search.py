@@ -0,0 +1,60 @@
+"""Full-text index over influencer nicknames, bios and platform handles.
+
+SQLite keeps an FTS5 table, ``influencers_fts``, that mirrors those columns
+of ``influencers`` through triggers, so ORM writes, Core bulk inserts and
+raw SQL all stay indexed. Postgres uses a GIN index on a weighted
+``tsvector`` expression instead; queries must use ``postgres_vector_sql()``
+so the planner matches the index.
+
+The models call ``install`` and ``uninstall`` when ``influencers`` is
+created or dropped; migration v0005 installs it on existing databases.
+"""
+from sqlalchemy import text
+
+SEARCH_COLUMNS = ("nickname", "bio", "instagram_handle", "tiktok_handle", "youtube_handle", "telegram_handle", "vk_handle")
+# bm25 column weights for SQLite, tsvector weights for Postgres: names and
+# handles outrank words in the bio
+SQLITE_WEIGHTS = (10.0, 1.0, 5.0, 5.0, 5.0, 5.0, 5.0)
+POSTGRES_WEIGHTS = ("A", "C", "B", "B", "B", "B", "B")
+
+_columns = ", ".join(SEARCH_COLUMNS)
+_new = ", ".join(f"new.{column}" for column in SEARCH_COLUMNS)
+_old = ", ".join(f"old.{column}" for column in SEARCH_COLUMNS)
+
+SQLITE_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS influencers_fts USING fts5({_columns}, "
+    "content='influencers', content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    f"CREATE TRIGGER IF NOT EXISTS influencers_fts_insert AFTER INSERT ON influencers BEGIN "
+    f"INSERT INTO influencers_fts(rowid, {_columns}) VALUES (new.id, {_new}); END",
+    f"CREATE TRIGGER IF NOT EXISTS influencers_fts_delete AFTER DELETE ON influencers BEGIN "
+    f"INSERT INTO influencers_fts(influencers_fts, rowid, {_columns}) VALUES ('delete', old.id, {_old}); END",
+    f"CREATE TRIGGER IF NOT EXISTS influencers_fts_update AFTER UPDATE ON influencers BEGIN "
+    f"INSERT INTO influencers_fts(influencers_fts, rowid, {_columns}) VALUES ('delete', old.id, {_old}); "
+    f"INSERT INTO influencers_fts(rowid, {_columns}) VALUES (new.id, {_new}); END",
+]
+SQLITE_DROP = ["DROP TABLE IF EXISTS influencers_fts"]
+
+
+def postgres_vector_sql() -> str:
+    """The indexed ``tsvector`` expression; queries repeat it verbatim so the index applies."""
+    parts = [
+        f"setweight(to_tsvector('simple', coalesce({column}, '')), '{weight}')"
+        for column, weight in zip(SEARCH_COLUMNS, POSTGRES_WEIGHTS)
+    ]
+    return " || ".join(parts)
+
+
+POSTGRES_DDL = [f"CREATE INDEX IF NOT EXISTS ix_influencers_search ON influencers USING GIN (({postgres_vector_sql()}))"]
+POSTGRES_DROP = ["DROP INDEX IF EXISTS ix_influencers_search"]
+
+
+def install(connection) -> None:
+    statements = {"sqlite": SQLITE_DDL, "postgresql": POSTGRES_DDL}.get(connection.dialect.name, [])
+    for statement in statements:
+        connection.execute(text(statement))
+
+
+def uninstall(connection) -> None:
+    statements = {"sqlite": SQLITE_DROP, "postgresql": POSTGRES_DROP}.get(connection.dialect.name, [])
+    for statement in statements:
+        connection.execute(text(statement))
@@ -1,18 +1,190 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import random
+import time
+from typing import Optional, Sequence
+from fastapi import Request
+from jose import JWTError, jwt
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.pool import QueuePool
+from core.cache import TTLCache
 from core.config import settings
+from core.metrics import metrics
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a free connection."""
+
+    metrics_prefix = "db.pool"
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            metrics.inc(f"{self.metrics_prefix}.timeouts")
+            raise
+        finally:
+            metrics.observe(f"{self.metrics_prefix}.checkout_wait_seconds", time.perf_counter() - started_at)
+
+def instrument_pool(engine, name: str = "primary"):
+    pool = engine.pool
+    prefix = f"db.{name}.pool"
+    if isinstance(pool, InstrumentedQueuePool):
+        pool.metrics_prefix = prefix
+
+    def record_usage():
+        if isinstance(pool, QueuePool):
+            metrics.set_gauge(f"{prefix}.in_use", pool.checkedout())
+            metrics.set_gauge(f"{prefix}.overflow", max(pool.overflow(), 0))
+
+    @event.listens_for(pool, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.inc(f"{prefix}.connects")
+
+    @event.listens_for(pool, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.inc(f"{prefix}.checkouts")
+        if isinstance(pool, QueuePool) and pool.overflow() > 0:
+            metrics.inc(f"{prefix}.overflow_hits")
+        record_usage()
+
+    @event.listens_for(pool, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        record_usage()
+
+    @event.listens_for(pool, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.inc(f"{prefix}.invalidations")
+
+    return engine
+
+def make_engine(url: str, name: str = "primary"):
+    connect_args = {"check_same_thread": False} if "sqlite" in url else {}
+    pool_args = {}
+    if ":memory:" not in url:
+        pool_args = dict(
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    engine = create_engine(url, connect_args=connect_args, pool_pre_ping=settings.DB_POOL_PRE_PING, **pool_args)
+    return instrument_pool(engine, name)
+
+class RoutingSession(Session):
+    """Session that sends read-only work to a replica and everything else to the primary.
+
+    Once the session has flushed anything it stays on the primary, so a
+    request always reads its own writes.
+    """
+
+    def __init__(self, primary=None, replicas: Sequence = (), read_only: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.read_only = read_only
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (
+            not self.replicas
+            or not self.read_only
+            or self._flushing
+            or self.info.get("wrote")
+            or isinstance(clause, UpdateBase)
+        ):
+            return self.primary if self.primary is not None else super().get_bind(mapper, clause, **kwargs)
+        replica = self.info.get("replica")
+        if replica is None:
+            # Pin one replica per session so a request sees a consistent snapshot
+            replica = self.info["replica"] = random.choice(self.replicas)
+        return replica
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_session_wrote(session, flush_context):
+    session.info["wrote"] = True
 
 # Engine is created directly using the URL from settings
 # which should be configured based on TESTING env var in config.py
-engine = create_engine(settings.DATABASE_URL,
-                       connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {})
+engine = make_engine(settings.DATABASE_URL)
+replica_engines = [
+    make_engine(url.strip(), name=f"replica{i}")
+    for i, url in enumerate(settings.DATABASE_REPLICA_URLS.split(","))
+    if url.strip()
+]
+
+SessionLocal = sessionmaker(
+    class_=RoutingSession, primary=engine, replicas=replica_engines,
+    autocommit=False, autoflush=False, bind=engine
+)
+
+# Users who wrote recently keep reading from the primary (read-your-writes)
+recent_writers = TTLCache(maxsize=100000, ttl=settings.REPLICA_STICKY_SECONDS)
+
+def request_subject(request: Request) -> Optional[str]:
+    # Only used to pick a database, the token is verified by get_current_user
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return jwt.get_unverified_claims(token).get("sub")
+    except JWTError:
+        return None
+
+def is_read_only_request(request: Request, subject: Optional[str]) -> bool:
+    if request.method not in ("GET", "HEAD", "OPTIONS"):
+        return False
+    return subject is None or recent_writers.get(subject) is None
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def to_async_url(url: str) -> str:
+    if url.startswith("sqlite"):
+        return "sqlite+aiosqlite" + url[url.index(":"):]
+    if url.startswith("postgres"):
+        return "postgresql+asyncpg" + url[url.index(":"):]
+    return url
+
+_async_engine = None
+_AsyncSessionLocal = None
+
+def get_async_engine():
+    # Created on first use so the async drivers are only required in async mode
+    global _async_engine
+    if _async_engine is None:
+        url = to_async_url(settings.DATABASE_URL)
+        pool_args = {}
+        if "sqlite" not in url:
+            pool_args = dict(
+                pool_size=settings.DB_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_timeout=settings.DB_POOL_TIMEOUT,
+                pool_recycle=settings.DB_POOL_RECYCLE,
+            )
+        _async_engine = create_async_engine(url, pool_pre_ping=settings.DB_POOL_PRE_PING, **pool_args)
+        instrument_pool(_async_engine.sync_engine, name="async")
+    return _async_engine
+
+def get_async_sessionmaker():
+    global _AsyncSessionLocal
+    if _AsyncSessionLocal is None:
+        _AsyncSessionLocal = async_sessionmaker(get_async_engine(), class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    return _AsyncSessionLocal
+
+def pool_status(engine=engine) -> str:
+    return engine.pool.status()
 
 # Dependency
-def get_db():
-    db = SessionLocal()
+def get_db(request: Request):
+    subject = request_subject(request) if replica_engines else None
+    db = SessionLocal(read_only=bool(replica_engines) and is_read_only_request(request, subject))
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        if subject is not None and db.info.get("wrote"):
+            recent_writers.set(subject, True)
+        db.close()
+
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
@@ -1,28 +1,80 @@
+import time
+_started_at = time.perf_counter()
+
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 import os
 import logging
 from core.config import settings
-from api.api_v1.api import api_router
+from core.pagination import NEXT_CURSOR_HEADER
 from db.session import engine
-from db.base import Base
+from db.migrations import upgrade, current_version, head_version
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create database tables when the app starts
-try:
-    logger.info("Initializing database...")
-    Base.metadata.create_all(bind=engine)
-    logger.info("Database initialization complete.")
-except Exception as e:
-    logger.error(f"Failed to initialize database: {str(e)}")
-    raise
+_import_seconds = time.perf_counter() - _started_at
+
+def check_schema() -> int:
+    if settings.SCHEMA_CHECK == "upgrade":
+        applied = upgrade(engine)
+        logger.info(f"Applied {len(applied)} migration(s).")
+    version = current_version(engine)
+    if settings.SCHEMA_CHECK == "verify" and version != head_version():
+        raise RuntimeError(
+            f"Database schema is at version {version}, expected {head_version()}. "
+            "Run `python -m db.migrations upgrade` before starting the app."
+        )
+    return version
+
+def include_routers(app: FastAPI) -> None:
+    # Endpoint modules (and the models/schemas they pull in) load here,
+    # once per process, instead of at import time
+    if getattr(app.state, "routers_included", False):
+        return
+    from api.api_v1.api import api_router
+    app.include_router(api_router, prefix=settings.API_V1_STR)
+    app.state.routers_included = True
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Module imports happen once per process, before the first lifespan, so
+    # they are reported on their own rather than counted in the total
+    report = {"imports": round(_import_seconds, 4)}
+    lifespan_started = phase_started = time.perf_counter()
+    try:
+        if settings.SCHEMA_CHECK != "off":
+            app.state.schema_version = await run_in_threadpool(check_schema)
+    except Exception as e:
+        logger.error(f"Failed to initialize database: {str(e)}")
+        raise
+    report["schema_check"] = round(time.perf_counter() - phase_started, 4)
+
+    phase_started = time.perf_counter()
+    include_routers(app)
+    report["routers"] = round(time.perf_counter() - phase_started, 4)
+    report["total"] = round(time.perf_counter() - lifespan_started, 4)
+
+    app.state.startup_report = report
+    logger.info(f"Startup complete: {report}")
+
+    activity_writer = None
+    if settings.ACTIVITY_WRITE_MODE == "background":
+        from services.activity import activity_writer
+        activity_writer.start()
+    try:
+        yield
+    finally:
+        if activity_writer is not None:
+            activity_writer.stop(timeout=5)
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # Set up CORS
@@ -32,11 +84,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
-# Include API router
-app.include_router(api_router, prefix=settings.API_V1_STR)
+@app.get("/health")
+def health():
+    return {
+        "status": "ok",
+        "schema_version": getattr(app.state, "schema_version", None),
+        "startup": getattr(app.state, "startup_report", None),
+    }
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=5000) 
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=5000)
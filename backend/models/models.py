@@ -1,5 +1,7 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, JSON, Enum
+from sqlalchemy import Column, BigInteger, Integer, String, Date, DateTime, ForeignKey, Boolean, JSON, Enum, Index, LargeBinary, UniqueConstraint
+from sqlalchemy import event
 from sqlalchemy.orm import relationship
+from db import search
 from db.base import Base
 from datetime import datetime
 import enum
@@ -33,17 +35,21 @@ class Manager(Base):
     __tablename__ = "managers"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
 
     influencers = relationship("Influencer", back_populates="manager")
     projects = relationship("Project", back_populates="manager")
 
 class Influencer(Base):
     __tablename__ = "influencers"
+    __table_args__ = (
+        # Reach-sorted roster: WHERE manager_id = ? ORDER BY total_reach DESC, id DESC
+        Index("ix_influencers_manager_id_total_reach", "manager_id", "total_reach", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
-    manager_id = Column(Integer, ForeignKey("managers.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    manager_id = Column(Integer, ForeignKey("managers.id"), index=True)
     nickname = Column(String)
     bio = Column(String)
     instagram_handle = Column(String, nullable=True)
@@ -56,10 +62,61 @@ class Influencer(Base):
     telegram_followers = Column(Integer, nullable=True)
     vk_handle = Column(String, nullable=True)
     vk_followers = Column(Integer, nullable=True)
+    # Sum of the *_followers columns, maintained by services.influencer_platforms
+    total_reach = Column(BigInteger, nullable=False, default=0, server_default="0")
     
     manager = relationship("Manager", back_populates="influencers")
     projects = relationship("ProjectInfluencer", back_populates="influencer")
 
+class InfluencerPlatform(Base):
+    # One row per platform an influencer is on, mirrored from the
+    # <platform>_handle / <platform>_followers columns by services.influencer_platforms
+    __tablename__ = "influencer_platforms"
+    __table_args__ = (
+        UniqueConstraint("influencer_id", "platform", name="uq_influencer_platforms_influencer_platform"),
+        # Follower ranges: WHERE platform IN (...) AND followers BETWEEN ? AND ?
+        Index("ix_influencer_platforms_platform_followers", "platform", "followers", "influencer_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    influencer_id = Column(Integer, ForeignKey("influencers.id"), nullable=False)
+    platform = Column(String, nullable=False)
+    handle = Column(String, nullable=True)
+    followers = Column(Integer, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class FollowerSeriesBlock(Base):
+    # A run of up to SERIES_BLOCK_POINTS snapshots of one influencer/platform/metric
+    # series, delta-encoded by services.follower_series. Times are epoch seconds.
+    __tablename__ = "follower_series_blocks"
+    __table_args__ = (
+        # Range reads: WHERE influencer_id = ? AND platform = ? AND metric = ? AND start_at <= ? ORDER BY start_at
+        Index("ix_follower_series_blocks_series_start_at", "influencer_id", "platform", "metric", "start_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    influencer_id = Column(Integer, ForeignKey("influencers.id"), nullable=False)
+    platform = Column(String, nullable=False)
+    metric = Column(String, nullable=False)
+    start_at = Column(BigInteger, nullable=False)
+    end_at = Column(BigInteger, nullable=False)
+    count = Column(Integer, nullable=False)
+    first_value = Column(BigInteger, nullable=False)
+    # Block summaries, so downsampled reads can skip decoding whole blocks
+    min_value = Column(BigInteger, nullable=False)
+    max_value = Column(BigInteger, nullable=False)
+    last_value = Column(BigInteger, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+
+@event.listens_for(Influencer.__table__, "after_create")
+def _install_search(target, connection, **kw):
+    # Full-text index kept outside the model: FTS5 table on SQLite, GIN index on Postgres
+    search.install(connection)
+
+@event.listens_for(Influencer.__table__, "before_drop")
+def _uninstall_search(target, connection, **kw):
+    search.uninstall(connection)
+
 class Project(Base):
     __tablename__ = "projects"
 
@@ -77,7 +134,7 @@ class Project(Base):
     workflow_stage = Column(Enum(WorkflowStage), default=WorkflowStage.SCENARIO)
     budget = Column(Integer)
     erid = Column(String, nullable=True)
-    manager_id = Column(Integer, ForeignKey("managers.id"))
+    manager_id = Column(Integer, ForeignKey("managers.id"), index=True)
     technical_links = Column(JSON)
     platforms = Column(JSON)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -85,12 +142,34 @@ class Project(Base):
     manager = relationship("Manager", back_populates="projects")
     influencers = relationship("ProjectInfluencer", back_populates="project")
 
+    # One counter row per stage, maintained by services.project_progress
+    scenario_progress = relationship(
+        "ProjectStageProgress", uselist=False, viewonly=True,
+        primaryjoin="and_(Project.id == foreign(ProjectStageProgress.project_id), ProjectStageProgress.stage == 'scenario')"
+    )
+    material_progress = relationship(
+        "ProjectStageProgress", uselist=False, viewonly=True,
+        primaryjoin="and_(Project.id == foreign(ProjectStageProgress.project_id), ProjectStageProgress.stage == 'material')"
+    )
+    publication_progress = relationship(
+        "ProjectStageProgress", uselist=False, viewonly=True,
+        primaryjoin="and_(Project.id == foreign(ProjectStageProgress.project_id), ProjectStageProgress.stage == 'publication')"
+    )
+
+    @property
+    def progress(self):
+        stages = (self.scenario_progress, self.material_progress, self.publication_progress)
+        return {row.stage: row for row in stages if row is not None}
+
 class ProjectInfluencer(Base):
     __tablename__ = "project_influencers"
+    __table_args__ = (
+        Index("ix_project_influencers_project_id_influencer_id", "project_id", "influencer_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"))
-    influencer_id = Column(Integer, ForeignKey("influencers.id"))
+    influencer_id = Column(Integer, ForeignKey("influencers.id"), index=True)
     scenario_status = Column(String)
     material_status = Column(String)
     publication_status = Column(String)
@@ -105,8 +184,8 @@ class Scenario(Base):
     __tablename__ = "scenarios"
 
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"))
-    influencer_id = Column(Integer, ForeignKey("influencers.id"))
+    project_id = Column(Integer, ForeignKey("projects.id"), index=True)
+    influencer_id = Column(Integer, ForeignKey("influencers.id"), index=True)
     content = Column(String)
     google_doc_url = Column(String)
     status = Column(String)
@@ -115,12 +194,15 @@ class Scenario(Base):
     deadline = Column(DateTime)
     version = Column(Integer, default=1)
 
+    project = relationship("Project")
+    influencer = relationship("Influencer")
+
 class Material(Base):
     __tablename__ = "materials"
 
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"))
-    influencer_id = Column(Integer, ForeignKey("influencers.id"))
+    project_id = Column(Integer, ForeignKey("projects.id"), index=True)
+    influencer_id = Column(Integer, ForeignKey("influencers.id"), index=True)
     material_url = Column(String)
     google_drive_url = Column(String)
     description = Column(String)
@@ -129,12 +211,15 @@ class Material(Base):
     approved_at = Column(DateTime)
     deadline = Column(DateTime)
 
+    project = relationship("Project")
+    influencer = relationship("Influencer")
+
 class Publication(Base):
     __tablename__ = "publications"
 
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"))
-    influencer_id = Column(Integer, ForeignKey("influencers.id"))
+    project_id = Column(Integer, ForeignKey("projects.id"), index=True)
+    influencer_id = Column(Integer, ForeignKey("influencers.id"), index=True)
     platform = Column(String)
     publication_url = Column(String)
     content = Column(String, nullable=True)
@@ -142,8 +227,14 @@ class Publication(Base):
     status = Column(String)
     verified_at = Column(DateTime)
 
+    project = relationship("Project")
+    influencer = relationship("Influencer")
+
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        Index("ix_comments_project_id_created_at", "project_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"))
@@ -151,12 +242,69 @@ class Comment(Base):
     content = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    project = relationship("Project")
+    user = relationship("User")
+
 class Activity(Base):
     __tablename__ = "activities"
+    __table_args__ = (
+        # Project feed: WHERE project_id = ? ORDER BY created_at DESC, id DESC
+        Index("ix_activities_project_id_created_at", "project_id", "created_at", "id"),
+        # Global feed: ORDER BY created_at DESC, id DESC
+        Index("ix_activities_created_at", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"))
     user_id = Column(Integer, ForeignKey("users.id"))
     activity_type = Column(String)
     description = Column(String)
-    created_at = Column(DateTime, default=datetime.utcnow) 
\ No newline at end of file
+    created_at = Column(DateTime, default=datetime.utcnow) 
+
+    project = relationship("Project")
+    user = relationship("User")
+
+class ActivityArchive(Base):
+    # Activities past the hot window, moved here by services.activity_retention
+    # with their original ids so the feed stays small
+    __tablename__ = "activities_archive"
+    __table_args__ = (
+        Index("ix_activities_archive_project_id_created_at", "project_id", "created_at", "id"),
+        Index("ix_activities_archive_created_at", "created_at", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    project_id = Column(Integer, ForeignKey("projects.id"))
+    user_id = Column(Integer, ForeignKey("users.id"))
+    activity_type = Column(String)
+    description = Column(String)
+    created_at = Column(DateTime)
+
+class ActivityDailyRollup(Base):
+    # Per-project daily counts that replace archived activities past retention
+    __tablename__ = "activity_daily_rollups"
+    __table_args__ = (
+        UniqueConstraint("project_id", "day", "activity_type", name="uq_activity_daily_rollups_project_day_type"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id"))
+    day = Column(Date)
+    activity_type = Column(String)
+    count = Column(Integer, default=0)
+
+class ProjectStageProgress(Base):
+    # Denormalized assignment counts per project and stage; kept in step with
+    # project_influencers by services.project_progress
+    __tablename__ = "project_stage_progress"
+    __table_args__ = (
+        UniqueConstraint("project_id", "stage", name="uq_project_stage_progress_project_stage"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    stage = Column(String, nullable=False)
+    total = Column(Integer, nullable=False, default=0)
+    submitted = Column(Integer, nullable=False, default=0)
+    approved = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import date, datetime
 from models.models import UserRole, ProjectStatus, WorkflowStage
 
 class UserBase(BaseModel):
@@ -29,8 +29,12 @@ class TokenPayload(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
     user: User
 
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
+
 class TokenData(BaseModel):
     username: Optional[str] = None
 
@@ -52,6 +56,8 @@ class InfluencerCreate(InfluencerBase):
     id: Optional[int] = None
     user_id: Optional[int] = None
     manager_id: Optional[int] = None
+    # Read-only: recomputed from the *_followers fields on every write
+    total_reach: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -61,6 +67,41 @@ class InfluencerUpdate(InfluencerBase):
     class Config:
         from_attributes = True
 
+class SeriesSnapshot(BaseModel):
+    platform: str
+    metric: str = "followers"
+    value: int
+    # Defaults to now
+    at: Optional[datetime] = None
+
+class SeriesRecordResult(BaseModel):
+    # Snapshots older than the newest stored point of their series are dropped
+    stored: int
+
+class GrowthPoint(BaseModel):
+    at: datetime
+    min: int
+    max: int
+    last: int
+
+class GrowthSeries(BaseModel):
+    platform: str
+    metric: str
+    # Bucket width in seconds
+    resolution: int
+    points: List[GrowthPoint]
+
+class InfluencerImportError(BaseModel):
+    row: int
+    detail: str
+
+class InfluencerImportReport(BaseModel):
+    processed: int
+    created: int
+    updated: int
+    failed: int
+    errors: List[InfluencerImportError]
+
 class ProjectBase(BaseModel):
     title: str
     client: str
@@ -81,14 +122,68 @@ class ProjectBase(BaseModel):
 class ProjectCreate(ProjectBase):
     pass
 
+class StageProgress(BaseModel):
+    total: int
+    submitted: int
+    approved: int
+    completed: int
+
+    class Config:
+        from_attributes = True
+
 class Project(ProjectBase):
     id: int
     start_date: datetime
     created_at: datetime
+    # Stage -> assignment counters
+    progress: Dict[str, StageProgress] = Field(default_factory=dict)
 
     class Config:
         from_attributes = True
 
+class PlatformCoverage(BaseModel):
+    influencers: int
+    followers: int
+    # Fraction of the roster present on the platform
+    share: float
+
+class ProjectAnalytics(BaseModel):
+    project_id: int
+    budget: Optional[int] = None
+    # Platforms counted towards the reach
+    platforms: List[str]
+    influencers: int
+    estimated_reach: int
+    # Budget per thousand of reach; null without a budget or reach
+    cpm: Optional[float] = None
+    coverage: Dict[str, PlatformCoverage]
+
+class ProjectAnalyticsScenario(BaseModel):
+    add_influencer_ids: List[int] = Field(default_factory=list)
+    remove_influencer_ids: List[int] = Field(default_factory=list)
+    # Omitted fields keep the project's own values
+    budget: Optional[int] = None
+    platforms: Optional[List[str]] = None
+
+class InfluencerRecommendation(BaseModel):
+    influencer_id: int
+    score: float
+    # Followers on the project's platforms
+    reach: int
+    active_assignments: int
+    influencer: InfluencerCreate
+
+class BulkItemResult(BaseModel):
+    index: int
+    status: str
+    id: Optional[int] = None
+    detail: Optional[str] = None
+
+class BulkCreateResult(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkItemResult]
+
 class ProjectInfluencerBase(BaseModel):
     project_id: int
     influencer_id: int
@@ -200,4 +295,36 @@ class Activity(ActivityBase):
     user: Optional[User] = None
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+class ActivityDailyRollup(BaseModel):
+    project_id: int
+    day: date
+    activity_type: str
+    count: int
+
+    class Config:
+        from_attributes = True 
+
+class ProjectOverviewInfluencer(ProjectInfluencer):
+    influencer: Optional[InfluencerCreate] = None
+
+class ProjectOverview(BaseModel):
+    # Sections left out of the request are null
+    project: Project
+    scenarios: Optional[List[Scenario]] = None
+    materials: Optional[List[Material]] = None
+    publications: Optional[List[Publication]] = None
+    influencers: Optional[List[ProjectOverviewInfluencer]] = None
+    activities: Optional[List[Activity]] = None
+    comments: Optional[List[Comment]] = None
+
+class DashboardStats(BaseModel):
+    projects_total: int
+    projects_by_status: Dict[str, int]
+    projects_by_stage: Dict[str, int]
+    # Stage -> assignment status -> count
+    influencer_statuses: Dict[str, Dict[str, int]]
+    pending_reviews: Dict[str, int]
+    overdue: Dict[str, int]
+    influencers_count: int
@@ -0,0 +1,195 @@
+"""Activity log writes.
+
+``record_activity`` never commits on its own. With
+``ACTIVITY_WRITE_MODE=transactional`` (the default) the row is added to the
+caller's session and lands in the same transaction as the mutation it
+describes. With ``background`` the row is handed to ``activity_writer``
+once that transaction commits, and a flusher thread bulk-inserts queued
+rows every ``ACTIVITY_BATCH_SIZE`` rows or ``ACTIVITY_FLUSH_INTERVAL_SECONDS``,
+whichever comes first. Background rows still queued when the process dies
+are lost; if the queue is full the rows are written synchronously right
+after the commit instead, so nothing is dropped under load.
+"""
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Iterable, List, Optional
+
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.metrics import metrics
+from models.models import Activity
+from services.feed import FEED_COLUMNS, FeedEntry, stage_entries
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "pending_activities"
+
+
+class ActivityWriter:
+    """Background bulk writer for activity rows."""
+
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = None, batch_size: int = 200,
+                 flush_interval: float = 0.5, max_queue: int = 10000):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[dict]" = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="activity-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        # Drain whatever arrived after the thread's last batch
+        self.flush()
+
+    def enqueue(self, rows: Iterable[dict]) -> List[dict]:
+        """Queue rows for the flusher, returning the ones that did not fit."""
+        overflow = []
+        for row in rows:
+            try:
+                self._queue.put_nowait(row)
+            except queue.Full:
+                overflow.append(row)
+        metrics.set_gauge("activity.queue.depth", self._queue.qsize())
+        if overflow:
+            metrics.inc("activity.queue.overflow", len(overflow))
+        return overflow
+
+    def _take(self, limit: int, timeout: Optional[float] = None) -> List[dict]:
+        batch = []
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while len(batch) < limit:
+            try:
+                if deadline is None:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def write(self, batch: List[dict]) -> None:
+        if not batch:
+            return
+        started = time.perf_counter()
+        db = self.session_factory()
+        try:
+            insert_activities(db, batch)
+            db.commit()
+        except Exception:
+            db.rollback()
+            metrics.inc("activity.flush.errors")
+            metrics.inc("activity.dropped", len(batch))
+            logger.exception(f"Failed to write {len(batch)} activities")
+            return
+        finally:
+            db.close()
+        metrics.inc("activity.flushed", len(batch))
+        metrics.observe("activity.flush.batch_size", len(batch))
+        metrics.observe("activity.flush.latency_seconds", time.perf_counter() - started)
+        metrics.set_gauge("activity.queue.depth", self._queue.qsize())
+
+    def flush(self) -> int:
+        """Write everything queued so far from the calling thread."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch = self._take(self.batch_size)
+                if not batch:
+                    return written
+                self.write(batch)
+                written += len(batch)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            # Block for the first row, then give the batch at most one interval to fill
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = [first] + self._take(self.batch_size - 1, timeout=self.flush_interval)
+            with self._flush_lock:
+                self.write(batch)
+
+
+def _default_session_factory() -> Session:
+    from db.session import SessionLocal
+    return SessionLocal()
+
+
+activity_writer = ActivityWriter(
+    _default_session_factory,
+    batch_size=settings.ACTIVITY_BATCH_SIZE,
+    flush_interval=settings.ACTIVITY_FLUSH_INTERVAL_SECONDS,
+    max_queue=settings.ACTIVITY_QUEUE_MAX,
+)
+
+
+def activity_row(project_id: int, user_id: int, activity_type: str, description: str) -> dict:
+    return {
+        "project_id": project_id,
+        "user_id": user_id,
+        "activity_type": activity_type,
+        "description": description,
+        "created_at": datetime.utcnow(),
+    }
+
+
+def insert_activities(db: Session, rows: List[dict]) -> None:
+    """Bulk insert ``rows`` and stage them for the per-manager feed."""
+    result = db.execute(insert(Activity).returning(*FEED_COLUMNS), rows)
+    stage_entries(db, [FeedEntry(*row) for row in result])
+
+
+def record_activities(db: Session, rows: List[dict]) -> None:
+    """Record activity rows as part of ``db``'s current transaction."""
+    if not rows:
+        return
+    metrics.inc("activity.recorded", len(rows))
+    if settings.ACTIVITY_WRITE_MODE == "background" and activity_writer.running:
+        db.info.setdefault(PENDING_KEY, []).extend(rows)
+    else:
+        insert_activities(db, rows)
+
+
+def record_activity(db: Session, project_id: int, user_id: int, activity_type: str, description: str) -> None:
+    record_activities(db, [activity_row(project_id, user_id, activity_type, description)])
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_pending(session):
+    rows = session.info.pop(PENDING_KEY, None)
+    if not rows:
+        return
+    overflow = activity_writer.enqueue(rows)
+    if overflow:
+        # Queue is full: fall back to a synchronous write rather than dropping rows
+        activity_writer.write(overflow)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop(PENDING_KEY, None)
@@ -0,0 +1,110 @@
+"""Activity retention: hot table, archive and daily rollups.
+
+``activities`` only keeps the last ``ACTIVITY_HOT_DAYS`` days, so feed
+queries (which always read ``activities``) touch a small table. Older rows
+move to ``activities_archive`` with their ids, where exports can still
+reach them. Archived rows older than ``ACTIVITY_RETENTION_DAYS`` are
+compacted into per-project, per-type daily counts in
+``activity_daily_rollups`` and deleted. Cutoffs are truncated to midnight
+so a day is never split between detail rows and its rollup.
+
+Run it periodically, e.g. from cron:
+
+    python -m services.activity_retention
+"""
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.metrics import metrics
+from models.models import Activity, ActivityArchive, ActivityDailyRollup
+
+COLUMNS = ("id", "project_id", "user_id", "activity_type", "description", "created_at")
+
+
+def _midnight(moment: datetime) -> datetime:
+    return datetime(moment.year, moment.month, moment.day)
+
+
+def archive_activities(db: Session, before: datetime, batch_size: Optional[int] = None) -> int:
+    """Move activities created before ``before`` to the archive, one batch per transaction."""
+    batch_size = batch_size or settings.ACTIVITY_ARCHIVE_BATCH_SIZE
+    moved = 0
+    while True:
+        ids = db.scalars(
+            select(Activity.id).where(Activity.created_at < before).order_by(Activity.id).limit(batch_size)
+        ).all()
+        if not ids:
+            return moved
+        source = select(*(getattr(Activity, column) for column in COLUMNS)).where(Activity.id.in_(ids))
+        db.execute(insert(ActivityArchive).from_select(COLUMNS, source))
+        db.execute(delete(Activity).where(Activity.id.in_(ids)))
+        db.commit()
+        moved += len(ids)
+
+
+def roll_up_archive(db: Session, before: datetime, batch_size: Optional[int] = None) -> int:
+    """Fold archived activities created before ``before`` into daily rollups and delete them.
+
+    Works through the archive one batch per transaction, like
+    ``archive_activities``; each batch is counted and merged into the
+    rollups by a single upsert.
+    """
+    batch_size = batch_size or settings.ACTIVITY_ARCHIVE_BATCH_SIZE
+    upsert = sqlite_insert if db.get_bind().dialect.name == "sqlite" else postgresql_insert
+    day = func.date(ActivityArchive.created_at)
+    compacted = 0
+    while True:
+        ids = db.scalars(
+            select(ActivityArchive.id).where(ActivityArchive.created_at < before)
+            .order_by(ActivityArchive.id).limit(batch_size)
+        ).all()
+        if not ids:
+            return compacted
+        counts = (
+            select(ActivityArchive.project_id, day, ActivityArchive.activity_type, func.count())
+            .where(ActivityArchive.id.in_(ids))
+            .group_by(ActivityArchive.project_id, day, ActivityArchive.activity_type)
+        )
+        statement = upsert(ActivityDailyRollup).from_select(("project_id", "day", "activity_type", "count"), counts)
+        db.execute(statement.on_conflict_do_update(
+            index_elements=("project_id", "day", "activity_type"),
+            set_={"count": ActivityDailyRollup.count + statement.excluded["count"]},
+        ))
+        db.execute(delete(ActivityArchive).where(ActivityArchive.id.in_(ids)))
+        db.commit()
+        compacted += len(ids)
+
+
+def run_retention(db: Session, now: Optional[datetime] = None) -> dict:
+    now = now or datetime.utcnow()
+    started = time.perf_counter()
+    archived = archive_activities(db, _midnight(now - timedelta(days=settings.ACTIVITY_HOT_DAYS)))
+    compacted = roll_up_archive(db, _midnight(now - timedelta(days=settings.ACTIVITY_RETENTION_DAYS)))
+    metrics.inc("activity.retention.archived", archived)
+    metrics.inc("activity.retention.compacted", compacted)
+    metrics.observe("activity.retention.seconds", time.perf_counter() - started)
+    return {"archived": archived, "compacted": compacted}
+
+
+def main(argv: List[str]) -> int:
+    from db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        result = run_retention(db)
+    finally:
+        db.close()
+    print(f"archived={result['archived']} compacted={result['compacted']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,58 @@
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from core.config import settings
+
+
+def check_batch_size(items: Sequence) -> None:
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_MAX_ITEMS} items per request",
+        )
+
+
+def existing_ids(db: Session, model, ids: Set[int]) -> Set[int]:
+    if not ids:
+        return set()
+    return set(db.scalars(select(model.id).where(model.id.in_(ids))))
+
+
+def bulk_create(db: Session, model, items: List[dict], references: Sequence[Tuple[str, object, str]],
+                rejected: Optional[Dict[int, str]] = None):
+    """Validate and insert ``items`` as one executemany, without committing.
+
+    ``references`` lists ``(field, referenced_model, error_detail)``; each
+    referenced model is checked with a single ``IN`` query for the whole
+    batch. ``rejected`` maps indexes the caller already refused to their
+    error detail. Returns the per-item results and the ``(index, id, item)`` of
+    every inserted row.
+    """
+    errors: Dict[int, str] = dict(rejected or {})
+    for field, referenced_model, detail in references:
+        found = existing_ids(db, referenced_model, {item[field] for item in items if item.get(field) is not None})
+        for index, item in enumerate(items):
+            if index not in errors and item.get(field) not in found:
+                errors[index] = detail
+
+    valid = [(index, item) for index, item in enumerate(items) if index not in errors]
+    ids = []
+    if valid:
+        sqlite = db.get_bind().dialect.name == "sqlite"
+        ids = db.scalars(
+            insert(model).returning(model.id, sort_by_parameter_order=not sqlite),
+            [item for _, item in valid],
+        ).all()
+        if sqlite:
+            # Ordered RETURNING would make SQLite fall back to one INSERT per
+            # row; it assigns rowids in VALUES order, so sorting restores it
+            ids = sorted(ids)
+
+    created = [(index, new_id, item) for (index, item), new_id in zip(valid, ids)]
+    results = [{"index": index, "status": "error", "detail": detail} for index, detail in errors.items()]
+    results += [{"index": index, "status": "created", "id": new_id} for index, new_id, _ in created]
+    results.sort(key=lambda result: result["index"])
+    return {"created": len(created), "failed": len(errors), "results": results}, created
@@ -0,0 +1,136 @@
+"""Streaming exports of large tables as NDJSON or CSV.
+
+Rows are read with ``yield_per`` (a server-side cursor on Postgres) as plain
+column tuples, so neither ORM instances nor pydantic models are built and
+memory use stays bounded by ``EXPORT_BATCH_SIZE`` regardless of the export
+size. Each batch is encoded and yielded as one chunk.
+"""
+import csv
+import enum
+import io
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterator, List, Optional
+
+from sqlalchemy import select, union_all
+
+from core.config import settings
+from models.models import Activity, ActivityArchive, Influencer, Project, ProjectInfluencer, Publication
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    model: type
+    # Column filtered by since/until, if the table has one
+    date_column: Optional[object] = None
+    # Whether manager_id is reached through projects
+    via_project: bool = True
+    # Table holding rows moved out by retention, if any
+    archive: Optional[type] = None
+
+
+EXPORTS = {
+    "activities": ExportSpec(Activity, Activity.created_at, archive=ActivityArchive),
+    "publications": ExportSpec(Publication, Publication.published_at),
+    "influencers": ExportSpec(Influencer, via_project=False),
+}
+
+
+def export_columns(resource: str) -> List[str]:
+    return [column.key for column in EXPORTS[resource].model.__table__.columns]
+
+
+def _filtered(table, spec: ExportSpec, project_id: Optional[int], manager_id: Optional[int],
+              since: Optional[datetime], until: Optional[datetime]):
+    statement = select(*table.columns)
+    if project_id is not None:
+        if spec.via_project:
+            statement = statement.where(table.c.project_id == project_id)
+        else:
+            statement = statement.where(
+                table.c.id.in_(select(ProjectInfluencer.influencer_id).where(ProjectInfluencer.project_id == project_id))
+            )
+    if manager_id is not None:
+        if spec.via_project:
+            statement = statement.where(
+                table.c.project_id.in_(select(Project.id).where(Project.manager_id == manager_id))
+            )
+        else:
+            statement = statement.where(table.c.manager_id == manager_id)
+    if spec.date_column is not None:
+        date_column = table.c[spec.date_column.key]
+        if since is not None:
+            statement = statement.where(date_column >= since)
+        if until is not None:
+            statement = statement.where(date_column < until)
+    return statement
+
+
+def export_statement(resource: str, project_id: Optional[int] = None, manager_id: Optional[int] = None,
+                     since: Optional[datetime] = None, until: Optional[datetime] = None,
+                     include_archived: bool = False):
+    spec = EXPORTS[resource]
+    filters = (project_id, manager_id, since, until)
+    statement = _filtered(spec.model.__table__, spec, *filters)
+    if include_archived and spec.archive is not None:
+        # Archived rows keep their original ids, so one id order covers both tables
+        combined = union_all(statement, _filtered(spec.archive.__table__, spec, *filters)).subquery()
+        return select(*combined.c).order_by(combined.c.id)
+    return statement.order_by(spec.model.__table__.c.id)
+
+
+def _plain(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def encode_ndjson(columns: List[str], rows) -> str:
+    return "".join(
+        json.dumps({column: _plain(value) for column, value in zip(columns, row)}, default=str) + "\n"
+        for row in rows
+    )
+
+
+def encode_csv(columns: List[str], rows) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(["" if value is None else _plain(value) for value in row])
+    return buffer.getvalue()
+
+
+def stream_export(session_factory, resource: str, file_format: str, batch_size: Optional[int] = None,
+                  **filters) -> Iterator[str]:
+    """Yield the export in encoded chunks, one per ``batch_size`` rows.
+
+    The generator owns its session: request-scoped sessions are closed
+    before a streaming response body is sent.
+    Filters are applied as given, so callers must always pass the
+    ``manager_id`` whose data may be exported.
+    """
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    columns = export_columns(resource)
+    encode = encode_ndjson if file_format == "ndjson" else encode_csv
+    if file_format == "csv":
+        header = io.StringIO()
+        csv.writer(header).writerow(columns)
+        yield header.getvalue()
+
+    db = session_factory()
+    try:
+        result = db.execute(
+            export_statement(resource, **filters).execution_options(yield_per=batch_size)
+        )
+        for batch in result.partitions():
+            yield encode(columns, batch)
+    finally:
+        db.close()
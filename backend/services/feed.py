@@ -0,0 +1,224 @@
+"""Per-manager activity feed kept in memory.
+
+Every committed activity is fanned out to a bounded, newest-last buffer
+for the manager owning its project, so the dashboard feed is served in
+O(limit) without reading ``activities``. A buffer is rebuilt from the
+database the first time a manager's feed is read and again every
+``ACTIVITY_FEED_REFRESH_SECONDS``, which also picks up activities
+committed by other worker processes. Pages that reach past the buffered
+window return ``None`` and the caller falls back to the database.
+"""
+import bisect
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from core.cache import TTLCache
+from core.config import settings
+from core.metrics import metrics
+from core.pagination import decode_cursor
+from models.models import Activity, Project, User
+
+FEED_ORDER = (Activity.created_at, Activity.id)
+FEED_COLUMNS = (Activity.id, Activity.project_id, Activity.user_id, Activity.activity_type,
+                Activity.description, Activity.created_at)
+PENDING_KEY = "pending_feed_entries"
+
+
+def owned_by(manager_id: int):
+    """Filter activities to the manager's projects.
+
+    Written as EXISTS so the planner walks ``ix_activities_created_at`` in
+    feed order and stops at the limit, instead of sorting every activity of
+    every project the manager owns.
+    """
+    return select(Project.id).where(Project.id == Activity.project_id, Project.manager_id == manager_id).exists()
+
+
+@dataclass(frozen=True)
+class FeedEntry:
+    id: int
+    project_id: Optional[int]
+    user_id: Optional[int]
+    activity_type: Optional[str]
+    description: Optional[str]
+    created_at: datetime
+
+    @property
+    def key(self) -> tuple:
+        return (self.created_at, self.id)
+
+
+def with_users(db: Session, entries: List[FeedEntry]) -> List[dict]:
+    """Entries as activity dicts with their ``user``, loaded in one query.
+
+    Buffered entries hold only ``user_id``; this gives pages served from
+    memory the same shape as those read from the database.
+    """
+    user_ids = {entry.user_id for entry in entries if entry.user_id is not None}
+    users = {user.id: user for user in db.scalars(select(User).where(User.id.in_(user_ids)))} if user_ids else {}
+    return [{**vars(entry), "user": users.get(entry.user_id)} for entry in entries]
+
+
+class _Buffer:
+    __slots__ = ("entries", "keys", "ids", "complete", "loaded_at")
+
+    def __init__(self, entries: List[FeedEntry], complete: bool, loaded_at: float):
+        # Oldest first, so appends of new activities are the cheap case
+        self.entries = sorted(entries, key=lambda entry: entry.key)
+        self.keys = [entry.key for entry in self.entries]
+        self.ids = {entry.id for entry in self.entries}
+        # True when the buffer holds every activity the manager has
+        self.complete = complete
+        self.loaded_at = loaded_at
+
+
+class ActivityFeed:
+    def __init__(self, capacity: int, refresh_seconds: float, timer: Callable[[], float] = time.monotonic):
+        self.capacity = capacity
+        self.refresh_seconds = refresh_seconds
+        self._timer = timer
+        self._buffers: Dict[int, _Buffer] = {}
+        # Entries published while a manager's buffer is being loaded
+        self._loading: Dict[int, List[FeedEntry]] = {}
+        self._lock = threading.Lock()
+
+    def _insert(self, buffer: _Buffer, entry: FeedEntry) -> None:
+        if entry.id in buffer.ids:
+            return
+        position = bisect.bisect(buffer.keys, entry.key)
+        buffer.keys.insert(position, entry.key)
+        buffer.entries.insert(position, entry)
+        buffer.ids.add(entry.id)
+        if len(buffer.entries) > self.capacity:
+            buffer.keys.pop(0)
+            buffer.ids.discard(buffer.entries.pop(0).id)
+            buffer.complete = False
+
+    def publish(self, manager_id: int, entries: Iterable[FeedEntry]) -> None:
+        with self._lock:
+            buffer = self._buffers.get(manager_id)
+            if buffer is not None:
+                for entry in entries:
+                    self._insert(buffer, entry)
+            elif manager_id in self._loading:
+                self._loading[manager_id].extend(entries)
+            # Cold managers are loaded from the database on first read
+
+    def _load(self, db: Session, manager_id: int) -> _Buffer:
+        with self._lock:
+            self._loading[manager_id] = []
+        try:
+            rows = db.execute(
+                select(*FEED_COLUMNS)
+                .where(owned_by(manager_id))
+                .order_by(Activity.created_at.desc(), Activity.id.desc())
+                .limit(self.capacity)
+            ).all()
+        except Exception:
+            with self._lock:
+                self._loading.pop(manager_id, None)
+            raise
+        metrics.inc("activity.feed.loads")
+        with self._lock:
+            buffer = _Buffer([FeedEntry(*row) for row in rows], len(rows) < self.capacity, self._timer())
+            for entry in self._loading.pop(manager_id, []):
+                self._insert(buffer, entry)
+            self._buffers[manager_id] = buffer
+        return buffer
+
+    def page(self, db: Session, manager_id: int, cursor: Optional[str] = None, limit: int = 5) -> Optional[List[FeedEntry]]:
+        """Newest-first page of ``limit + 1`` entries, or ``None`` if the buffer can't answer it."""
+        before = tuple(decode_cursor(cursor, FEED_ORDER)) if cursor is not None else None
+        buffer = self._buffers.get(manager_id)
+        if buffer is None or self._timer() - buffer.loaded_at >= self.refresh_seconds:
+            buffer = self._load(db, manager_id)
+        with self._lock:
+            end = len(buffer.entries) if before is None else bisect.bisect_left(buffer.keys, before)
+            page = buffer.entries[max(0, end - limit - 1):end][::-1]
+            complete = buffer.complete
+        if len(page) > limit or complete:
+            metrics.inc("activity.feed.hits")
+            return page
+        metrics.inc("activity.feed.fallbacks")
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buffers.clear()
+            self._loading.clear()
+
+
+activity_feed = ActivityFeed(settings.ACTIVITY_FEED_SIZE, settings.ACTIVITY_FEED_REFRESH_SECONDS)
+
+# Called with every committed batch of entries (see services.stream)
+commit_listeners: List[Callable[[List[FeedEntry]], None]] = []
+
+# Project -> manager, so fan-out does not look up the project on every write.
+# Entries are dropped when a project changes manager or is deleted here; a
+# change made by another worker process is picked up once the entry expires.
+_project_managers = TTLCache(maxsize=10000, ttl=settings.ACTIVITY_FEED_REFRESH_SECONDS)
+
+
+def stage_entries(session: Session, entries: List[FeedEntry]) -> None:
+    """Queue entries written in ``session`` for fan-out once it commits."""
+    missing = {
+        entry.project_id for entry in entries
+        if entry.project_id is not None and _project_managers.get(entry.project_id) is None
+    }
+    if missing:
+        for project_id, manager_id in session.connection().execute(
+            select(Project.id, Project.manager_id).where(Project.id.in_(missing))
+        ):
+            _project_managers.set(project_id, manager_id)
+    pending = session.info.setdefault(PENDING_KEY, [])
+    for entry in entries:
+        pending.append((_project_managers.get(entry.project_id), entry))
+
+
+def _forget_managers(session: Session) -> None:
+    for obj in session.deleted:
+        if isinstance(obj, Project):
+            _project_managers.pop(obj.id)
+    for obj in session.dirty:
+        if isinstance(obj, Project) and inspect(obj).attrs.manager_id.history.has_changes():
+            _project_managers.pop(obj.id)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_entries(session, flush_context):
+    # Before staging, so activities written in this flush see the new manager
+    _forget_managers(session)
+    # Activities added through the ORM; Core inserts call stage_entries themselves
+    entries = [
+        FeedEntry(obj.id, obj.project_id, obj.user_id, obj.activity_type, obj.description, obj.created_at)
+        for obj in session.new if isinstance(obj, Activity)
+    ]
+    if entries:
+        stage_entries(session, entries)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_entries(session):
+    pending = session.info.pop(PENDING_KEY, None)
+    if not pending:
+        return
+    by_manager: Dict[int, List[FeedEntry]] = {}
+    for manager_id, entry in pending:
+        if manager_id is not None:
+            by_manager.setdefault(manager_id, []).append(entry)
+    for manager_id, entries in by_manager.items():
+        activity_feed.publish(manager_id, entries)
+    committed = [entry for _, entry in pending]
+    for listener in commit_listeners:
+        listener(committed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_entries(session):
+    session.info.pop(PENDING_KEY, None)
@@ -0,0 +1,213 @@
+"""Follower and engagement history per influencer and platform.
+
+Snapshots of one series (influencer, platform, metric) are stored in blocks
+of up to ``SERIES_BLOCK_POINTS`` points. A block keeps its first time and
+value in columns and the rest as deltas in ``data``:
+
+    [version][time dtype][value dtype][time deltas...][value deltas...]
+
+Each delta array uses the narrowest of int8/16/32/64 that fits, so a
+slowly growing follower count costs a few bytes per snapshot instead of a
+row. Blocks also carry min/max/last, and reads downsampled to buckets
+wider than a block use those instead of decoding.
+
+Follower changes are recorded by ``services.influencer_platforms`` whenever
+the ``*_followers`` columns change; other snapshots (engagement, history
+from external sources) are appended with ``record``.
+"""
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import bindparam, delete, func, insert, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.metrics import metrics
+from models.models import FollowerSeriesBlock
+
+METRICS = ("followers", "engagement")
+VERSION = 1
+_DTYPES = (np.dtype("<i1"), np.dtype("<i2"), np.dtype("<i4"), np.dtype("<i8"))
+
+Key = Tuple[int, str, str]
+Point = Tuple[int, str, str, int, int]  # influencer_id, platform, metric, epoch seconds, value
+
+
+def epoch(at: datetime) -> int:
+    """Seconds since the epoch for a naive UTC datetime."""
+    return int(at.replace(tzinfo=timezone.utc).timestamp()) if at.tzinfo is None else int(at.timestamp())
+
+
+def from_epoch(seconds: int) -> datetime:
+    return datetime.fromtimestamp(int(seconds), timezone.utc).replace(tzinfo=None)
+
+
+def _narrowest(deltas: np.ndarray) -> int:
+    if not len(deltas):
+        return 0
+    low, high = int(deltas.min()), int(deltas.max())
+    return next(code for code, dtype in enumerate(_DTYPES)
+                if np.iinfo(dtype).min <= low and high <= np.iinfo(dtype).max)
+
+
+def encode(times: np.ndarray, values: np.ndarray) -> bytes:
+    time_deltas, value_deltas = np.diff(times), np.diff(values)
+    time_code, value_code = _narrowest(time_deltas), _narrowest(value_deltas)
+    return (bytes([VERSION, time_code, value_code])
+            + time_deltas.astype(_DTYPES[time_code]).tobytes()
+            + value_deltas.astype(_DTYPES[value_code]).tobytes())
+
+
+def decode(start_at: int, first_value: int, count: int, data: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    version, time_code, value_code = data[0], data[1], data[2]
+    if version != VERSION:
+        raise ValueError(f"Unknown series block version {version}")
+    time_dtype, value_dtype = _DTYPES[time_code], _DTYPES[value_code]
+    split = 3 + (count - 1) * time_dtype.itemsize
+    time_deltas = np.frombuffer(data, dtype=time_dtype, count=count - 1, offset=3).astype(np.int64)
+    value_deltas = np.frombuffer(data, dtype=value_dtype, count=count - 1, offset=split).astype(np.int64)
+    times = np.concatenate([[start_at], start_at + np.cumsum(time_deltas)])
+    values = np.concatenate([[first_value], first_value + np.cumsum(value_deltas)])
+    return times, values
+
+
+def _block_values(times: np.ndarray, values: np.ndarray) -> dict:
+    return {
+        "start_at": int(times[0]), "end_at": int(times[-1]), "count": len(times),
+        "first_value": int(values[0]), "min_value": int(values.min()), "max_value": int(values.max()),
+        "last_value": int(values[-1]), "data": encode(times, values),
+    }
+
+
+def record(connection, points: Iterable[Point]) -> int:
+    """Append snapshots, filling each series' newest block before starting another.
+
+    Points older than the newest stored point of their series are dropped;
+    returns how many were stored.
+    """
+    series: Dict[Key, List[Tuple[int, int]]] = {}
+    for influencer_id, platform, metric, at, value in points:
+        series.setdefault((influencer_id, platform, metric), []).append((int(at), int(value)))
+    if not series:
+        return 0
+
+    table = FollowerSeriesBlock.__table__
+    keys = list(series)
+    newest = (
+        select(func.max(table.c.id))
+        .where(tuple_(table.c.influencer_id, table.c.platform, table.c.metric).in_(keys))
+        .group_by(table.c.influencer_id, table.c.platform, table.c.metric)
+    )
+    open_blocks = {
+        (row.influencer_id, row.platform, row.metric): row
+        for row in connection.execute(select(table).where(table.c.id.in_(newest)))
+    }
+
+    size = settings.SERIES_BLOCK_POINTS
+    inserts, updates, stored = [], [], 0
+    for key, snapshots in series.items():
+        snapshots.sort()
+        times = np.array([at for at, _ in snapshots], dtype=np.int64)
+        values = np.array([value for _, value in snapshots], dtype=np.int64)
+        block = open_blocks.get(key)
+        if block is not None:
+            keep = times >= block.end_at
+            times, values = times[keep], values[keep]
+            room = size - block.count
+            if room > 0 and len(times):
+                old_times, old_values = decode(block.start_at, block.first_value, block.count, block.data)
+                merged = _block_values(
+                    np.concatenate([old_times, times[:room]]), np.concatenate([old_values, values[:room]])
+                )
+                updates.append({"_id": block.id, **{f"_{name}": value for name, value in merged.items()}})
+                stored += len(times[:room])
+                times, values = times[room:], values[room:]
+        for start in range(0, len(times), size):
+            inserts.append({
+                "influencer_id": key[0], "platform": key[1], "metric": key[2],
+                **_block_values(times[start:start + size], values[start:start + size]),
+            })
+        stored += len(times)
+    if updates:
+        columns = ("start_at", "end_at", "count", "first_value", "min_value", "max_value", "last_value", "data")
+        connection.execute(
+            update(table).where(table.c.id == bindparam("_id"))
+            .values({name: bindparam(f"_{name}") for name in columns}),
+            updates,
+        )
+    if inserts:
+        connection.execute(insert(table), inserts)
+    metrics.inc("follower_series.points", stored)
+    return stored
+
+
+def forget(connection, influencer_ids: List[int]) -> None:
+    table = FollowerSeriesBlock.__table__
+    connection.execute(delete(table).where(table.c.influencer_id.in_(influencer_ids)))
+
+
+def resolution_for(start: int, end: int, max_points: int) -> int:
+    """The smallest bucket width, in seconds, that fits ``[start, end]`` into ``max_points`` buckets."""
+    # Buckets are epoch-aligned, so a range of n widths can touch n + 1 of them
+    return max(1, -(-(end - start + 1) // max(max_points - 1, 1)))
+
+
+def downsample(db: Session, influencer_id: int, platform: str, metric: str, start: int, end: int,
+               resolution: int) -> List[dict]:
+    """Min, max and last value per ``resolution``-second bucket of ``[start, end]``.
+
+    Buckets are aligned to multiples of ``resolution`` since the epoch, and
+    empty buckets are left out.
+    """
+    table = FollowerSeriesBlock.__table__
+    blocks = db.execute(
+        select(table)
+        .where(table.c.influencer_id == influencer_id, table.c.platform == platform, table.c.metric == metric,
+               table.c.start_at <= end, table.c.end_at >= start)
+        .order_by(table.c.start_at)
+    ).all()
+
+    times, mins, maxes, lasts = [], [], [], []
+    decoded = 0
+    for block in blocks:
+        bucket = block.start_at // resolution
+        if block.start_at >= start and block.end_at <= end and block.end_at // resolution == bucket:
+            # The whole block falls in one bucket: its summary is enough
+            times.append(np.array([block.end_at]))
+            mins.append(np.array([block.min_value]))
+            maxes.append(np.array([block.max_value]))
+            lasts.append(np.array([block.last_value]))
+            continue
+        block_times, block_values = decode(block.start_at, block.first_value, block.count, block.data)
+        inside = (block_times >= start) & (block_times <= end)
+        times.append(block_times[inside])
+        mins.append(block_values[inside])
+        maxes.append(block_values[inside])
+        lasts.append(block_values[inside])
+        decoded += 1
+    metrics.inc("follower_series.blocks_decoded", decoded)
+    if not times or not sum(len(t) for t in times):
+        return []
+
+    times = np.concatenate(times)
+    mins, maxes, lasts = np.concatenate(mins), np.concatenate(maxes), np.concatenate(lasts)
+    buckets = times // resolution
+    # Points are in time order, so each bucket is a contiguous run
+    starts = np.flatnonzero(np.concatenate([[True], buckets[1:] != buckets[:-1]]))
+    ends = np.concatenate([starts[1:], [len(buckets)]]) - 1
+    return [
+        {"at": from_epoch(bucket * resolution), "min": int(low), "max": int(high), "last": int(last)}
+        for bucket, low, high, last in zip(
+            buckets[starts], np.minimum.reduceat(mins, starts), np.maximum.reduceat(maxes, starts), lasts[ends]
+        )
+    ]
+
+
+def series_bounds(db: Session, influencer_id: int, platform: str, metric: str) -> Optional[Tuple[int, int]]:
+    table = FollowerSeriesBlock.__table__
+    row = db.execute(
+        select(func.min(table.c.start_at), func.max(table.c.end_at))
+        .where(table.c.influencer_id == influencer_id, table.c.platform == platform, table.c.metric == metric)
+    ).one()
+    return None if row[0] is None else (row[0], row[1])
@@ -0,0 +1,280 @@
+"""Streaming import of influencer rosters from CSV or XLSX.
+
+Rows are read one at a time, validated against ``InfluencerBase`` and
+upserted per chunk, matching existing influencers of the same manager by
+any of their platform handles, then mirrored into ``influencer_platforms``.
+Rows within a chunk that share any handle are merged first, and the
+report counts influencers created or updated, not rows.
+Memory use depends on the chunk size, not
+on the file size.
+
+    python -m services.influencer_import roster.csv --manager-id 1
+"""
+import argparse
+import codecs
+import csv
+import io
+import sys
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from models.models import Influencer
+from schemas.schemas import InfluencerBase
+from services.influencer_platforms import sync_platforms
+from services.recommendations import touch_influencers
+from services.stats import touch_managers
+
+PLATFORMS = ("instagram", "tiktok", "youtube", "telegram", "vk")
+FIELDS = list(InfluencerBase.model_fields)
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def iter_csv_rows(stream: BinaryIO) -> Iterator[Tuple[int, dict]]:
+    text = codecs.getreader("utf-8-sig")(stream)
+    reader = csv.DictReader(text)
+    for row in reader:
+        # Header is line 1
+        yield reader.line_num, row
+
+
+def iter_xlsx_rows(stream: BinaryIO) -> Iterator[Tuple[int, dict]]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFormatError("XLSX import requires the openpyxl package")
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        header = [str(cell) if cell is not None else "" for cell in header]
+        for line, values in enumerate(rows, start=2):
+            yield line, {name: value for name, value in zip(header, values)}
+    finally:
+        workbook.close()
+
+
+def iter_rows(stream: BinaryIO, file_format: str) -> Iterator[Tuple[int, dict]]:
+    if file_format == "csv":
+        return iter_csv_rows(stream)
+    if file_format == "xlsx":
+        return iter_xlsx_rows(stream)
+    raise ImportFormatError(f"Unsupported format '{file_format}', expected csv or xlsx")
+
+
+def guess_format(filename: Optional[str]) -> str:
+    if filename and filename.lower().endswith((".xlsx", ".xlsm")):
+        return "xlsx"
+    return "csv"
+
+
+def clean_row(row: dict) -> dict:
+    cleaned = {}
+    for key, value in row.items():
+        if key is None:
+            continue
+        key = key.strip().lower()
+        if key not in FIELDS:
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+            if key.endswith("_followers"):
+                value = value.replace(",", "").replace(" ", "")
+            if key.endswith("_handle"):
+                value = value.lstrip("@")
+        # Empty cells leave the existing value alone on update
+        if value is not None and value != "":
+            cleaned[key] = value
+    return cleaned
+
+
+def handles_of(values: dict) -> List[Tuple[str, str]]:
+    return [(platform, values[f"{platform}_handle"]) for platform in PLATFORMS if values.get(f"{platform}_handle")]
+
+
+class ImportReport:
+    def __init__(self, max_errors: int):
+        self.processed = 0
+        self.created = 0
+        self.updated = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+        self.max_errors = max_errors
+
+    def error(self, row: int, detail: str) -> None:
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row, "detail": detail})
+
+    def as_dict(self) -> dict:
+        return {
+            "processed": self.processed,
+            "created": self.created,
+            "updated": self.updated,
+            "failed": self.failed,
+            "errors": self.errors,
+        }
+
+
+def _insert_rows(db: Session, rows: List[dict]) -> None:
+    connection = db.connection()
+    if connection.dialect.driver == "psycopg2":
+        columns = ["manager_id"] + FIELDS
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(["" if row.get(column) is None else row.get(column) for column in columns])
+        buffer.seek(0)
+        cursor = connection.connection.dbapi_connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY influencers ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer
+            )
+        finally:
+            cursor.close()
+    else:
+        db.execute(insert(Influencer), rows)
+
+
+class Chunk:
+    """Rows waiting for one upsert, merged when they share any platform handle."""
+
+    def __init__(self):
+        self.rows: List[Optional[dict]] = []
+        self.by_handle: Dict[Tuple[str, str], int] = {}
+        self.size = 0
+
+    def add(self, values: dict) -> None:
+        handles = handles_of(values)
+        matches = sorted({self.by_handle[key] for key in handles if key in self.by_handle})
+        if not matches:
+            self.rows.append(values)
+            self.size += 1
+            target = len(self.rows) - 1
+        else:
+            # A row can join rows that were separate until now: fold them all into the first
+            target = matches[0]
+            for other in matches[1:]:
+                merged = self.rows[other]
+                self.rows[other] = None
+                self.size -= 1
+                self.rows[target].update(merged)
+                for key in handles_of(merged):
+                    self.by_handle[key] = target
+            self.rows[target].update(values)
+        for key in handles_of(self.rows[target]):
+            self.by_handle[key] = target
+
+    def values(self) -> List[dict]:
+        return [row for row in self.rows if row is not None]
+
+    def __len__(self) -> int:
+        return self.size
+
+
+def _upsert_chunk(db: Session, manager_id: int, chunk: Chunk, report: ImportReport) -> None:
+    handle_filters = []
+    for platform in PLATFORMS:
+        handles = {handle for (p, handle) in chunk.by_handle if p == platform}
+        if handles:
+            handle_filters.append(getattr(Influencer, f"{platform}_handle").in_(handles))
+
+    existing: Dict[Tuple[str, str], int] = {}
+    columns = [Influencer.id] + [getattr(Influencer, f"{platform}_handle") for platform in PLATFORMS]
+    for row in db.execute(select(*columns).where(Influencer.manager_id == manager_id, or_(*handle_filters))):
+        for platform, handle in zip(PLATFORMS, row[1:]):
+            if handle:
+                existing[(platform, handle)] = row[0]
+
+    inserts, updates = [], {}
+    for values in chunk.values():
+        influencer_id = next((existing[key] for key in handles_of(values) if key in existing), None)
+        if influencer_id is None:
+            inserts.append({"manager_id": manager_id, **values})
+        else:
+            updates.setdefault(influencer_id, {"id": influencer_id}).update(values)
+
+    if inserts:
+        _insert_rows(db, inserts)
+    if updates:
+        # Bulk UPDATE by primary key, only touching the columns present in the file
+        db.execute(update(Influencer), list(updates.values()))
+    # Mirror follower counts into influencer_platforms; COPY returns no ids,
+    # so the chunk's rows are found again by handle
+    touched = db.execute(
+        select(Influencer.id).where(Influencer.manager_id == manager_id, or_(*handle_filters))
+    ).scalars().all()
+    sync_platforms(db.connection(), touched)
+    touch_influencers(db, touched, manager_id)
+    if inserts:
+        touch_managers(db, [manager_id])
+    db.commit()
+    # Counted per influencer: rows merged within the chunk count once
+    report.created += len(inserts)
+    report.updated += len(updates)
+
+
+def import_influencers(db: Session, rows: Iterable[Tuple[int, dict]], manager_id: int,
+                       chunk_size: Optional[int] = None) -> dict:
+    chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+    report = ImportReport(settings.IMPORT_MAX_REPORTED_ERRORS)
+    chunk = Chunk()
+    for line, row in rows:
+        report.processed += 1
+        try:
+            influencer = InfluencerBase.model_validate(clean_row(row))
+        except ValidationError as e:
+            first = e.errors()[0]
+            report.error(line, f"{'.'.join(str(part) for part in first['loc'])}: {first['msg']}")
+            continue
+        values = influencer.model_dump(exclude_unset=True)
+        if not handles_of(values):
+            report.error(line, "At least one platform handle is required")
+            continue
+        chunk.add(values)
+        if len(chunk) >= chunk_size:
+            _upsert_chunk(db, manager_id, chunk, report)
+            chunk = Chunk()
+    if len(chunk):
+        _upsert_chunk(db, manager_id, chunk, report)
+    return report.as_dict()
+
+
+def main(argv: List[str]) -> int:
+    from db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Import an influencer roster from CSV or XLSX")
+    parser.add_argument("path")
+    parser.add_argument("--manager-id", type=int, required=True)
+    parser.add_argument("--format", choices=["csv", "xlsx"])
+    parser.add_argument("--chunk-size", type=int)
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        with open(args.path, "rb") as stream:
+            rows = iter_rows(stream, args.format or guess_format(args.path))
+            report = import_influencers(db, rows, args.manager_id, chunk_size=args.chunk_size)
+    except ImportFormatError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+
+    print(f"processed={report['processed']} created={report['created']} "
+          f"updated={report['updated']} failed={report['failed']}")
+    for error in report["errors"]:
+        print(f"row {error['row']}: {error['detail']}", file=sys.stderr)
+    return 0 if not report["failed"] else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
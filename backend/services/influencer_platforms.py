@@ -0,0 +1,139 @@
+"""Normalized per-platform follower counts.
+
+``Influencer`` keeps its ``<platform>_handle`` and ``<platform>_followers``
+columns, which the API reads and writes. Every write to them is mirrored
+into ``influencer_platforms`` (one row per platform the influencer is on)
+and into ``Influencer.total_reach``, so follower-range filters and reach
+ordering are index lookups instead of OR chains over ten columns. Changed
+follower counts are appended to ``services.follower_series``.
+
+ORM writes are mirrored during the flush. Core bulk writes, like the roster
+importer, call ``sync_platforms`` with the ids they touched.
+"""
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, delete, event, insert, inspect, select, update
+from sqlalchemy.orm import Session
+
+from models.models import Influencer, InfluencerPlatform
+from services.follower_series import epoch, forget, record
+
+PLATFORMS = ("instagram", "tiktok", "youtube", "telegram", "vk")
+COLUMNS = tuple(f"{platform}_{suffix}" for platform in PLATFORMS for suffix in ("handle", "followers"))
+
+
+def total_reach(values) -> int:
+    return sum(values[f"{platform}_followers"] or 0 for platform in PLATFORMS)
+
+
+def followers_filter(query, platforms: Sequence[str] = PLATFORMS, min_followers: Optional[int] = None,
+                     max_followers: Optional[int] = None):
+    """Keep influencers with a follower count in range on any of ``platforms``."""
+    matching = select(InfluencerPlatform.influencer_id).where(InfluencerPlatform.platform.in_(platforms))
+    if min_followers is not None:
+        matching = matching.where(InfluencerPlatform.followers >= min_followers)
+    if max_followers is not None:
+        matching = matching.where(InfluencerPlatform.followers <= max_followers)
+    return query.where(Influencer.id.in_(matching))
+
+
+def sync_platforms(connection, influencer_ids: Iterable[int]) -> None:
+    """Bring ``influencer_platforms`` and ``total_reach`` in line with the influencer columns.
+
+    Follower counts that changed are also appended to their history.
+    """
+    ids = sorted(set(influencer_ids))
+    if not ids:
+        return
+    influencers = Influencer.__table__
+    platforms = InfluencerPlatform.__table__
+
+    wanted: Dict[Tuple[int, str], Tuple[Optional[str], Optional[int]]] = {}
+    reach_updates = []
+    for row in connection.execute(
+        select(influencers.c.id, influencers.c.total_reach, *(influencers.c[name] for name in COLUMNS))
+        .where(influencers.c.id.in_(ids))
+    ):
+        values = row._mapping
+        for platform in PLATFORMS:
+            handle, followers = values[f"{platform}_handle"], values[f"{platform}_followers"]
+            if handle is not None or followers is not None:
+                wanted[(row.id, platform)] = (handle, followers)
+        if row.total_reach != total_reach(values):
+            reach_updates.append({"_id": row.id, "_reach": total_reach(values)})
+
+    stored = {
+        (row.influencer_id, row.platform): (row.id, (row.handle, row.followers))
+        for row in connection.execute(
+            select(platforms.c.id, platforms.c.influencer_id, platforms.c.platform, platforms.c.handle,
+                   platforms.c.followers)
+            .where(platforms.c.influencer_id.in_(ids))
+        )
+    }
+
+    now = datetime.utcnow()
+    inserts, updates, snapshots = [], [], []
+    for (influencer_id, platform), (handle, followers) in wanted.items():
+        previous = stored.get((influencer_id, platform))
+        if previous is None:
+            inserts.append({"influencer_id": influencer_id, "platform": platform, "handle": handle,
+                            "followers": followers, "updated_at": now})
+        elif previous[1] != (handle, followers):
+            updates.append({"_id": previous[0], "_handle": handle, "_followers": followers, "_now": now})
+        if followers is not None and (previous is None or previous[1][1] != followers):
+            snapshots.append((influencer_id, platform, "followers", epoch(now), followers))
+    removed = [row_id for key, (row_id, _) in stored.items() if key not in wanted]
+
+    if inserts:
+        connection.execute(insert(platforms), inserts)
+    if updates:
+        connection.execute(
+            update(platforms).where(platforms.c.id == bindparam("_id"))
+            .values(handle=bindparam("_handle"), followers=bindparam("_followers"), updated_at=bindparam("_now")),
+            updates,
+        )
+    if removed:
+        connection.execute(delete(platforms).where(platforms.c.id.in_(removed)))
+    if snapshots:
+        record(connection, snapshots)
+    if reach_updates:
+        connection.execute(
+            update(influencers).where(influencers.c.id == bindparam("_id")).values(total_reach=bindparam("_reach")),
+            reach_updates,
+        )
+
+
+def _platforms_changed(obj: Influencer) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in COLUMNS)
+
+
+@event.listens_for(Session, "before_flush")
+def _set_total_reach(session, flush_context, instances):
+    # Written with the influencer's own INSERT/UPDATE, and current in memory
+    for obj in (*session.new, *session.dirty):
+        if isinstance(obj, Influencer) and (obj in session.new or _platforms_changed(obj)):
+            obj.total_reach = total_reach({name: getattr(obj, name) for name in COLUMNS})
+
+
+@event.listens_for(Session, "before_flush")
+def _delete_platforms(session, flush_context, instances):
+    # Platform rows and follower history go before the flush deletes the
+    # influencers, so the foreign keys still hold
+    removed = [obj.id for obj in session.deleted if isinstance(obj, Influencer) and obj.id is not None]
+    if removed:
+        connection = session.connection()
+        table = InfluencerPlatform.__table__
+        connection.execute(delete(table).where(table.c.influencer_id.in_(removed)))
+        forget(connection, removed)
+
+
+@event.listens_for(Session, "after_flush")
+def _mirror_platforms(session, flush_context):
+    changed = [
+        obj.id for obj in (*session.new, *session.dirty)
+        if isinstance(obj, Influencer) and (obj in session.new or _platforms_changed(obj))
+    ]
+    if changed:
+        sync_platforms(session.connection(), changed)
@@ -0,0 +1,80 @@
+"""Ranked influencer search over the full-text index in ``db.search``.
+
+Every word of the query is matched as a prefix against the nickname, the
+bio and the platform handles; a row needs to match one of them and rows
+matching more words, or matching in the nickname or a handle, rank first.
+A word naming a platform ("tiktok") additionally requires a handle on
+that platform, so "tiktok fitness" finds fitness creators who are on
+TikTok.
+"""
+import re
+import time
+from typing import List, Tuple
+
+from sqlalchemy import column, func, literal_column, or_, table, text
+from sqlalchemy.orm import Session
+
+from core.metrics import metrics
+from db.search import SEARCH_COLUMNS, SQLITE_WEIGHTS, postgres_vector_sql
+from models.models import Influencer
+
+PLATFORMS = ("instagram", "tiktok", "youtube", "telegram", "vk")
+MAX_TERMS = 8
+
+influencers_fts = table("influencers_fts", column("rowid"))
+
+
+def parse_query(q: str) -> Tuple[List[str], List[str]]:
+    """Split a query into search terms and the platforms it names."""
+    terms, platforms = [], []
+    for word in re.findall(r"\w+", q.lower()):
+        if word in PLATFORMS:
+            platforms.append(word)
+        elif word not in terms:
+            terms.append(word)
+    return terms[:MAX_TERMS], platforms
+
+
+def _sqlite(query, terms: List[str]):
+    # Quoted so FTS5 operators typed by the user are searched as words
+    match = " OR ".join(f'"{term}"*' for term in terms)
+    weights = ", ".join(str(weight) for weight in SQLITE_WEIGHTS)
+    return (
+        query.join(influencers_fts, influencers_fts.c.rowid == Influencer.id)
+        .filter(text("influencers_fts MATCH :match").bindparams(match=match))
+        .order_by(literal_column(f"bm25(influencers_fts, {weights})"), Influencer.id)
+    )
+
+
+def _postgres(query, terms: List[str]):
+    vector = literal_column(f"({postgres_vector_sql()})")
+    tsquery = func.to_tsquery("simple", " | ".join(f"{term}:*" for term in terms))
+    return (
+        query.filter(vector.op("@@")(tsquery))
+        .order_by(func.ts_rank(vector, tsquery).desc(), Influencer.id)
+    )
+
+
+def _fallback(query, terms: List[str]):
+    # No index on other backends; substring match in id order
+    return query.filter(or_(*(
+        getattr(Influencer, name).ilike(f"%{term}%") for term in terms for name in SEARCH_COLUMNS
+    ))).order_by(Influencer.id)
+
+
+def search_influencers(db: Session, manager_id: int, q: str, limit: int = 20) -> List[Influencer]:
+    started = time.perf_counter()
+    terms, platforms = parse_query(q)
+    query = db.query(Influencer).filter(Influencer.manager_id == manager_id)
+    for platform in platforms:
+        query = query.filter(getattr(Influencer, f"{platform}_handle").is_not(None))
+    if terms:
+        dialect = db.get_bind().dialect.name
+        query = {"sqlite": _sqlite, "postgresql": _postgres}.get(dialect, _fallback)(query, terms)
+    elif platforms:
+        query = query.order_by(Influencer.id)
+    else:
+        return []
+    results = query.limit(limit).all()
+    metrics.observe("influencers.search.seconds", time.perf_counter() - started)
+    return results
@@ -0,0 +1,211 @@
+"""Per-project progress counters.
+
+``project_stage_progress`` holds, for every project and stage, how many
+influencers are assigned (``total``), have submitted work, had it approved
+and completed the stage. The counters are adjusted inside the same flush
+that changes a ``ProjectInfluencer``, so project lists read progress with a
+join instead of fetching rosters. Core bulk inserts bypass the flush and
+call ``count_assignments`` themselves.
+
+``reconcile`` recomputes counters from ``project_influencers`` and repairs
+any drift, e.g. after manual SQL. Run it periodically:
+
+    python -m services.project_progress
+"""
+import sys
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import case, delete, event, func, insert, inspect, select, update
+from sqlalchemy.orm import Session, joinedload
+
+from core.metrics import metrics
+from models.models import Project, ProjectInfluencer, ProjectStageProgress
+
+STAGES = ("scenario", "material", "publication")
+COUNTERS = ("total", "submitted", "approved", "completed")
+# Statuses that mean work was handed in, and that it was accepted
+SUBMITTED = ("in_review", "approved", "rejected", "published", "verified")
+APPROVED = ("approved", "published", "verified")
+
+Key = Tuple[int, str]
+
+# Loader options that read a project's counters in the same statement as the
+# project; each joins at most one row through the (project_id, stage) key
+WITH_PROGRESS = (
+    joinedload(Project.scenario_progress),
+    joinedload(Project.material_progress),
+    joinedload(Project.publication_progress),
+)
+
+
+def stage_counts(status: Optional[str], completed_at) -> Tuple[int, int, int, int]:
+    """What one assignment contributes to each counter of a stage."""
+    return (1, int(status in SUBMITTED), int(status in APPROVED), int(completed_at is not None))
+
+
+def _add(deltas: Dict[Key, List[int]], values, sign: int) -> None:
+    project_id = values["project_id"]
+    if project_id is None:
+        return
+    for stage in STAGES:
+        counts = stage_counts(values.get(f"{stage}_status"), values.get(f"{stage}_completed_at"))
+        totals = deltas.setdefault((project_id, stage), [0] * len(COUNTERS))
+        for i, count in enumerate(counts):
+            totals[i] += sign * count
+
+
+def _columns(obj: ProjectInfluencer) -> Dict[str, object]:
+    names = ["project_id"] + [f"{stage}_{suffix}" for stage in STAGES for suffix in ("status", "completed_at")]
+    return {name: getattr(obj, name) for name in names}
+
+
+def apply_deltas(connection, deltas: Dict[Key, Sequence[int]]) -> None:
+    table = ProjectStageProgress.__table__
+    rebuilt = set()
+    for (project_id, stage), values in deltas.items():
+        if not any(values) or project_id in rebuilt:
+            continue
+        result = connection.execute(
+            update(table)
+            .where(table.c.project_id == project_id, table.c.stage == stage)
+            .values({name: table.c[name] + value for name, value in zip(COUNTERS, values)})
+        )
+        if result.rowcount == 0:
+            # Missing row (project created before the counters existed): the
+            # rebuild already sees this transaction's changes for every stage
+            reconcile_connection(connection, [project_id])
+            rebuilt.add(project_id)
+
+
+def count_assignments(session: Session, rows: Iterable[dict]) -> None:
+    """Count assignments inserted with Core, in the session's transaction."""
+    deltas: Dict[Key, List[int]] = {}
+    for row in rows:
+        _add(deltas, row, +1)
+    apply_deltas(session.connection(), deltas)
+
+
+def _expected(connection, project_ids: Optional[Sequence[int]]) -> Dict[Key, Tuple[int, ...]]:
+    expected = {}
+    for stage in STAGES:
+        status = getattr(ProjectInfluencer, f"{stage}_status")
+        query = (
+            select(
+                Project.id,
+                func.count(ProjectInfluencer.id),
+                func.coalesce(func.sum(case((status.in_(SUBMITTED), 1), else_=0)), 0),
+                func.coalesce(func.sum(case((status.in_(APPROVED), 1), else_=0)), 0),
+                func.coalesce(func.sum(case((getattr(ProjectInfluencer, f"{stage}_completed_at").is_not(None), 1), else_=0)), 0),
+            )
+            .outerjoin(ProjectInfluencer, ProjectInfluencer.project_id == Project.id)
+            .group_by(Project.id)
+        )
+        if project_ids is not None:
+            query = query.where(Project.id.in_(project_ids))
+        for project_id, *counts in connection.execute(query):
+            expected[(project_id, stage)] = tuple(counts)
+    return expected
+
+
+def reconcile_connection(connection, project_ids: Optional[Sequence[int]] = None) -> int:
+    table = ProjectStageProgress.__table__
+    expected = _expected(connection, project_ids)
+    query = select(table.c.project_id, table.c.stage, *(table.c[name] for name in COUNTERS))
+    if project_ids is not None:
+        query = query.where(table.c.project_id.in_(project_ids))
+    stored = {(row[0], row[1]): tuple(row[2:]) for row in connection.execute(query)}
+
+    repaired = 0
+    for key, counts in expected.items():
+        if stored.get(key) == counts:
+            continue
+        values = dict(zip(COUNTERS, counts))
+        if key in stored:
+            connection.execute(
+                update(table).where(table.c.project_id == key[0], table.c.stage == key[1]).values(values)
+            )
+        else:
+            connection.execute(insert(table).values(project_id=key[0], stage=key[1], **values))
+        repaired += 1
+    # Counters of projects that no longer exist
+    orphans = [key for key in stored if key not in expected]
+    for project_id, stage in orphans:
+        connection.execute(delete(table).where(table.c.project_id == project_id, table.c.stage == stage))
+    return repaired + len(orphans)
+
+
+def reconcile(db: Session, project_ids: Optional[Sequence[int]] = None) -> int:
+    """Recompute counters from ``project_influencers`` and fix the ones that drifted."""
+    repaired = reconcile_connection(db.connection(), project_ids)
+    db.commit()
+    metrics.inc("project_progress.repaired", repaired)
+    return repaired
+
+
+@event.listens_for(Session, "before_flush")
+def _delete_counters(session, flush_context, instances):
+    # Counters go before the flush deletes the projects, so the foreign key still holds
+    removed = [obj.id for obj in session.deleted if isinstance(obj, Project) and obj.id is not None]
+    if removed:
+        table = ProjectStageProgress.__table__
+        session.connection().execute(delete(table).where(table.c.project_id.in_(removed)))
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_counters(session, flush_context):
+    table = ProjectStageProgress.__table__
+    connection = session.connection()
+    created = [obj.id for obj in session.new if isinstance(obj, Project)]
+    if created:
+        connection.execute(insert(table), [
+            {"project_id": project_id, "stage": stage, **{name: 0 for name in COUNTERS}}
+            for project_id in created for stage in STAGES
+        ])
+
+    deltas: Dict[Key, List[int]] = {}
+    rebuild = set()
+    for obj in session.new:
+        if isinstance(obj, ProjectInfluencer):
+            _add(deltas, _columns(obj), +1)
+    for obj in session.deleted:
+        if isinstance(obj, ProjectInfluencer):
+            _add(deltas, _columns(obj), -1)
+    for obj in session.dirty:
+        if not isinstance(obj, ProjectInfluencer):
+            continue
+        state = inspect(obj)
+        current = _columns(obj)
+        previous = dict(current)
+        for name in current:
+            history = state.attrs[name].history
+            if history.deleted:
+                previous[name] = history.deleted[0]
+            elif history.added:
+                # Overwritten without the old value ever being loaded; recount instead
+                previous = None
+                break
+        if previous is None:
+            rebuild.add(current["project_id"])
+        elif previous != current:
+            _add(deltas, previous, -1)
+            _add(deltas, current, +1)
+    apply_deltas(connection, {key: value for key, value in deltas.items() if key[0] not in rebuild})
+    rebuild.discard(None)
+    if rebuild:
+        reconcile_connection(connection, sorted(rebuild))
+
+
+def main(argv: List[str]) -> int:
+    from db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        repaired = reconcile(db)
+    finally:
+        db.close()
+    print(f"repaired={repaired}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
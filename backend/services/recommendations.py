@@ -0,0 +1,199 @@
+"""Top-K influencer recommendations for a project.
+
+Each manager's roster is held in memory as a feature matrix: follower counts
+per platform and the number of assignments on projects that are not yet
+completed. Scoring the whole roster against a project is a few vectorized
+operations, and the best K are picked with ``np.argpartition`` (linear-time
+selection) so only those K are sorted.
+
+Matrices are cached per manager for ``RECOMMENDATION_CACHE_TTL_SECONDS``.
+Commits that change an influencer, an assignment or a project's status mark
+the affected rows stale, and the next request re-reads only those rows.
+Core bulk writes call ``touch_influencers`` themselves.
+"""
+import threading
+from typing import Dict, List, Optional, Sequence, Set
+
+import numpy as np
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from core.cache import TTLCache
+from core.config import settings
+from core.metrics import metrics
+from models.models import Influencer, Project, ProjectInfluencer, ProjectStatus
+from services.campaign_analytics import platform_mask
+from services.influencer_platforms import PLATFORMS
+
+PENDING_KEY = "pending_recommendation_rows"
+
+matrix_cache = TTLCache(settings.RECOMMENDATION_CACHE_SIZE, settings.RECOMMENDATION_CACHE_TTL_SECONDS)
+
+# Bumped on every commit that marks rows stale, so a matrix read across a
+# commit is not cached
+_generation = 0
+_generation_lock = threading.Lock()
+
+
+class FeatureMatrix:
+    def __init__(self, rows: Sequence[tuple]):
+        self.ids = np.array([row[0] for row in rows], dtype=np.int64)
+        self.followers = np.array([row[1:-1] for row in rows], dtype=float).reshape(-1, len(PLATFORMS))
+        self.load = np.array([row[-1] for row in rows], dtype=float)
+        self.index = {int(influencer_id): i for i, influencer_id in enumerate(self.ids)}
+        self.stale: Set[int] = set()
+        self.lock = threading.Lock()
+
+    def patch(self, requested: Set[int], rows: Sequence[tuple]) -> None:
+        """Apply re-read ``rows`` for the ``requested`` ids; ids not returned are dropped."""
+        found = {row[0] for row in rows}
+        gone = [self.index[i] for i in requested - found if i in self.index]
+        if gone:
+            keep = np.ones(len(self.ids), dtype=bool)
+            keep[gone] = False
+            self.ids, self.followers, self.load = self.ids[keep], self.followers[keep], self.load[keep]
+            self.index = {int(influencer_id): i for i, influencer_id in enumerate(self.ids)}
+        added = []
+        for row in rows:
+            i = self.index.get(row[0])
+            if i is None:
+                added.append(row)
+            else:
+                self.followers[i] = row[1:-1]
+                self.load[i] = row[-1]
+        if added:
+            extra = FeatureMatrix(added)
+            start = len(self.ids)
+            self.ids = np.concatenate([self.ids, extra.ids])
+            self.followers = np.concatenate([self.followers, extra.followers])
+            self.load = np.concatenate([self.load, extra.load])
+            self.index.update({influencer_id: start + i for influencer_id, i in extra.index.items()})
+
+
+def _feature_rows(db: Session, manager_id: int, influencer_ids: Optional[Set[int]] = None) -> List[tuple]:
+    owned = [Influencer.manager_id == manager_id]
+    if influencer_ids is not None:
+        owned.append(Influencer.id.in_(influencer_ids))
+    active = (
+        select(ProjectInfluencer.influencer_id, func.count().label("active"))
+        .join(Project, Project.id == ProjectInfluencer.project_id)
+        .join(Influencer, Influencer.id == ProjectInfluencer.influencer_id)
+        .where(Project.status != ProjectStatus.COMPLETED, *owned)
+        .group_by(ProjectInfluencer.influencer_id)
+        .subquery()
+    )
+    followers = [func.coalesce(getattr(Influencer, f"{platform}_followers"), 0) for platform in PLATFORMS]
+    query = (
+        select(Influencer.id, *followers, func.coalesce(active.c.active, 0))
+        .outerjoin(active, active.c.influencer_id == Influencer.id)
+        .where(*owned)
+    )
+    return [tuple(row) for row in db.execute(query)]
+
+
+def get_matrix(db: Session, manager_id: int) -> FeatureMatrix:
+    matrix = matrix_cache.get(manager_id)
+    if matrix is None:
+        metrics.inc("recommendations.matrix.misses")
+        generation = _generation
+        matrix = FeatureMatrix(_feature_rows(db, manager_id))
+        with _generation_lock:
+            if generation == _generation:
+                matrix_cache.set(manager_id, matrix)
+        return matrix
+    with matrix.lock:
+        if matrix.stale:
+            stale, matrix.stale = matrix.stale, set()
+            matrix.patch(stale, _feature_rows(db, manager_id, stale))
+            metrics.inc("recommendations.matrix.patched_rows", len(stale))
+    return matrix
+
+
+def recommend(db: Session, project: Project, limit: int = 10, target_followers: Optional[int] = None,
+              load_penalty: Optional[float] = None) -> List[dict]:
+    """Score the manager's influencers for ``project`` and return the best ``limit``.
+
+    The score is the log of the influencer's followers on the project's
+    platforms or, with ``target_followers``, how close that is to the target
+    on a log scale, minus ``load_penalty`` per active assignment. Influencers
+    on none of the platforms, or already on the project, are left out.
+    """
+    load_penalty = settings.RECOMMENDATION_LOAD_PENALTY if load_penalty is None else load_penalty
+    matrix = get_matrix(db, project.manager_id)
+    assigned = db.scalars(
+        select(ProjectInfluencer.influencer_id).where(ProjectInfluencer.project_id == project.id)
+    ).all()
+
+    with matrix.lock:
+        ids, load = matrix.ids, matrix.load.copy()
+        reach = matrix.followers[:, platform_mask(project.platforms)].sum(axis=1)
+        excluded = [matrix.index[i] for i in assigned if i in matrix.index]
+    fit = np.log1p(reach)
+    if target_followers is not None:
+        fit = -np.abs(fit - np.log1p(target_followers))
+    score = fit - load_penalty * load
+    score[reach <= 0] = -np.inf
+    score[excluded] = -np.inf
+
+    candidates = np.flatnonzero(np.isfinite(score))
+    if len(candidates) > limit:
+        candidates = candidates[np.argpartition(-score[candidates], limit - 1)[:limit]]
+    # Best first, ties by id
+    top = candidates[np.lexsort((ids[candidates], -score[candidates]))]
+    return [
+        {"influencer_id": int(ids[i]), "score": round(float(score[i]), 4), "reach": int(reach[i]),
+         "active_assignments": int(load[i])}
+        for i in top
+    ]
+
+
+def touch_influencers(session: Session, influencer_ids, manager_id: Optional[int] = None) -> None:
+    """Re-read these influencers' features once ``session`` commits.
+
+    Without ``manager_id`` only matrices that already hold the influencer are
+    refreshed, which covers everything except newly created influencers.
+    """
+    pending: Dict[Optional[int], Set[int]] = session.info.setdefault(PENDING_KEY, {})
+    pending.setdefault(manager_id, set()).update(i for i in influencer_ids if i is not None)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_rows(session, flush_context):
+    projects = []
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Influencer):
+            touch_influencers(session, [obj.id], obj.manager_id)
+        elif isinstance(obj, ProjectInfluencer):
+            touch_influencers(session, [obj.influencer_id, *inspect(obj).attrs.influencer_id.history.deleted])
+        elif isinstance(obj, Project) and obj not in session.new and (
+            obj in session.deleted or inspect(obj).attrs.status.history.has_changes()
+        ):
+            # Completing or reopening a project changes its influencers' load
+            projects.append(obj.id)
+    if projects:
+        touch_influencers(session, session.connection().execute(
+            select(ProjectInfluencer.influencer_id).where(ProjectInfluencer.project_id.in_(projects))
+        ).scalars())
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_stale(session):
+    global _generation
+    pending = session.info.pop(PENDING_KEY, None)
+    if not pending:
+        return
+    touched = set().union(*pending.values())
+    with _generation_lock:
+        _generation += 1
+    for manager_id in matrix_cache.keys():
+        matrix = matrix_cache.get(manager_id)
+        if matrix is None:
+            continue
+        with matrix.lock:
+            matrix.stale.update(i for i in touched if i in matrix.index)
+            matrix.stale.update(pending.get(manager_id, ()))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rows(session):
+    session.info.pop(PENDING_KEY, None)
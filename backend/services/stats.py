@@ -0,0 +1,141 @@
+"""Dashboard statistics per manager.
+
+The counts are GROUP BY aggregates over the manager's projects and their
+influencer assignments, so the dashboard never downloads the lists it
+summarises. Results are cached per manager for ``STATS_CACHE_TTL_SECONDS``.
+Commits that change a project, an assignment or an influencer through the
+ORM evict the owning manager's entry; Core bulk writes call
+``touch_managers`` themselves.
+"""
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import and_, case, event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from core.cache import TTLCache
+from core.config import settings
+from core.metrics import metrics
+from models.models import Influencer, Project, ProjectInfluencer, ProjectStatus
+from services.project_progress import APPROVED, STAGES
+
+REVIEW_STATUS = "in_review"
+PENDING_KEY = "pending_stats_managers"
+
+stats_cache = TTLCache(settings.STATS_CACHE_SIZE, settings.STATS_CACHE_TTL_SECONDS)
+
+# Bumped on every eviction, so a result computed across a commit is not cached
+_generation = 0
+_generation_lock = threading.Lock()
+
+
+def _key(value) -> str:
+    return value.value if hasattr(value, "value") else value
+
+
+def compute_stats(db: Session, manager_id: int, now: Optional[datetime] = None) -> dict:
+    now = now or datetime.utcnow()
+    by_status: Dict[str, int] = {status.value: 0 for status in ProjectStatus}
+    by_stage: Dict[str, int] = {stage: 0 for stage in STAGES}
+    for status, stage, count in db.execute(
+        select(Project.status, Project.workflow_stage, func.count())
+        .where(Project.manager_id == manager_id)
+        .group_by(Project.status, Project.workflow_stage)
+    ):
+        if status is not None:
+            by_status[_key(status)] = by_status.get(_key(status), 0) + count
+        if stage is not None:
+            by_stage[_key(stage)] = by_stage.get(_key(stage), 0) + count
+
+    # One pass over the assignments: status counts per stage, plus the ones
+    # past their stage deadline on projects that are still running
+    statuses = [func.coalesce(getattr(ProjectInfluencer, f"{stage}_status"), "pending") for stage in STAGES]
+    overdue = [
+        func.sum(case((and_(
+            getattr(Project, f"{stage}_deadline") < now,
+            Project.status != ProjectStatus.COMPLETED,
+            status.not_in(APPROVED),
+        ), 1), else_=0))
+        for stage, status in zip(STAGES, statuses)
+    ]
+    assignments: Dict[str, Dict[str, int]] = {stage: {} for stage in STAGES}
+    overdue_totals = {stage: 0 for stage in STAGES}
+    for row in db.execute(
+        select(*statuses, *overdue, func.count())
+        .join(Project, Project.id == ProjectInfluencer.project_id)
+        .where(Project.manager_id == manager_id)
+        .group_by(*statuses)
+    ):
+        count = row[-1]
+        for i, stage in enumerate(STAGES):
+            assignments[stage][row[i]] = assignments[stage].get(row[i], 0) + count
+            overdue_totals[stage] += row[len(STAGES) + i] or 0
+
+    influencers = db.scalar(select(func.count()).select_from(Influencer).where(Influencer.manager_id == manager_id))
+    return {
+        "projects_total": sum(by_status.values()),
+        "projects_by_status": by_status,
+        "projects_by_stage": by_stage,
+        "influencer_statuses": assignments,
+        "pending_reviews": {stage: assignments[stage].get(REVIEW_STATUS, 0) for stage in STAGES},
+        "overdue": overdue_totals,
+        "influencers_count": influencers or 0,
+    }
+
+
+def get_stats(db: Session, manager_id: int) -> dict:
+    stats = stats_cache.get(manager_id)
+    if stats is not None:
+        metrics.inc("stats.cache.hits")
+        return stats
+    metrics.inc("stats.cache.misses")
+    generation = _generation
+    stats = compute_stats(db, manager_id)
+    with _generation_lock:
+        if generation == _generation:
+            stats_cache.set(manager_id, stats)
+    return stats
+
+
+def invalidate(manager_ids: Iterable[int]) -> None:
+    global _generation
+    with _generation_lock:
+        _generation += 1
+        for manager_id in manager_ids:
+            stats_cache.pop(manager_id)
+
+
+def touch_managers(session: Session, manager_ids: Iterable[Optional[int]]) -> None:
+    """Evict these managers' statistics once ``session`` commits."""
+    session.info.setdefault(PENDING_KEY, set()).update(m for m in manager_ids if m is not None)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_managers(session, flush_context):
+    managers, project_ids = set(), set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, (Project, Influencer)):
+            managers.add(obj.manager_id)
+            # A project or influencer moved between managers changes both dashboards
+            managers.update(inspect(obj).attrs.manager_id.history.deleted)
+        elif isinstance(obj, ProjectInfluencer):
+            project_ids.add(obj.project_id)
+    if project_ids:
+        managers.update(session.connection().execute(
+            select(Project.manager_id).where(Project.id.in_(project_ids))
+        ).scalars())
+    if managers:
+        touch_managers(session, managers)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_managers(session):
+    managers = session.info.pop(PENDING_KEY, None)
+    if managers:
+        invalidate(managers)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_managers(session):
+    session.info.pop(PENDING_KEY, None)
@@ -0,0 +1,398 @@
+"""Server-sent events for a project's activities and comments.
+
+Status changes are recorded as activities, so they arrive as ``activity``
+events too. Events committed in this worker are pushed to subscribers as
+soon as the transaction commits. Events committed by other workers are
+picked up by one poller per project with open streams, which reads the
+database every ``STREAM_HEARTBEAT_SECONDS`` and pushes what this worker
+has not published itself, so the polling cost does not grow with the
+number of connections. Event ids are ``<activity id>-<comment id>``, the
+newest of each delivered so far, so a reconnecting ``EventSource`` resumes
+from ``Last-Event-ID`` without gaps.
+
+A poll that fails is logged and retried after a growing delay, up to
+``MAX_BACKOFF`` poll intervals.
+
+Each connection has a bounded queue. A client that falls behind has its
+queue dropped and is resynced from the database instead of growing memory.
+"""
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.metrics import metrics
+from models.models import Activity, Comment
+from services.feed import FEED_COLUMNS, FeedEntry, commit_listeners
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "pending_comment_events"
+MAX_BACKOFF = 8
+COMMENT_COLUMNS = (Comment.id, Comment.project_id, Comment.user_id, Comment.content, Comment.created_at)
+
+
+@dataclass(frozen=True)
+class ProjectEvent:
+    kind: str
+    id: int
+    project_id: int
+    data: dict
+
+    @classmethod
+    def from_activity(cls, entry: FeedEntry) -> "ProjectEvent":
+        return cls("activity", entry.id, entry.project_id, {
+            "id": entry.id,
+            "project_id": entry.project_id,
+            "user_id": entry.user_id,
+            "activity_type": entry.activity_type,
+            "description": entry.description,
+            "created_at": entry.created_at.isoformat() if entry.created_at else None,
+        })
+
+    @classmethod
+    def from_comment(cls, comment_id: int, project_id: int, user_id: int, content: str,
+                     created_at: Optional[datetime]) -> "ProjectEvent":
+        return cls("comment", comment_id, project_id, {
+            "id": comment_id,
+            "project_id": project_id,
+            "user_id": user_id,
+            "content": content,
+            "created_at": created_at.isoformat() if created_at else None,
+        })
+
+
+@dataclass(frozen=True)
+class StreamCursor:
+    activity_id: int = 0
+    comment_id: int = 0
+
+    @classmethod
+    def parse(cls, value: Optional[str]) -> Optional["StreamCursor"]:
+        if not value:
+            return None
+        try:
+            activity_id, comment_id = (int(part) for part in value.split("-"))
+        except ValueError:
+            return None
+        return cls(activity_id, comment_id)
+
+    def advance(self, event: ProjectEvent) -> "StreamCursor":
+        if event.kind == "activity":
+            return StreamCursor(max(self.activity_id, event.id), self.comment_id)
+        return StreamCursor(self.activity_id, max(self.comment_id, event.id))
+
+    def overlapped(self, overlap: int) -> "StreamCursor":
+        return StreamCursor(max(0, self.activity_id - overlap), max(0, self.comment_id - overlap))
+
+    def covers(self, event: ProjectEvent) -> bool:
+        return event.id <= (self.activity_id if event.kind == "activity" else self.comment_id)
+
+    def __str__(self) -> str:
+        return f"{self.activity_id}-{self.comment_id}"
+
+
+# Put on a subscriber's queue in place of the events it could not keep up with
+LAGGED = object()
+
+
+class Subscriber:
+    def __init__(self, project_id: int, queue_size: int):
+        self.project_id = project_id
+        self.queue: "asyncio.Queue" = asyncio.Queue(maxsize=queue_size)
+
+    def offer(self, item) -> None:
+        # Runs on the subscriber's event loop
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(LAGGED)
+            metrics.inc("stream.lagged")
+
+
+class RecentEvents:
+    """Bounded set of recently seen ``(kind, id)`` pairs."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._keys: "OrderedDict[tuple, None]" = OrderedDict()
+
+    def add(self, project_event: ProjectEvent) -> bool:
+        """Remember the event; ``False`` if it was already seen."""
+        key = (project_event.kind, project_event.id)
+        if key in self._keys:
+            return False
+        self._keys[key] = None
+        if len(self._keys) > self.size:
+            self._keys.popitem(last=False)
+        return True
+
+
+class ProjectPoller:
+    """Reads one project's new events from the database for all of its streams in this worker."""
+
+    def __init__(self, broker: "ProjectEventBroker", project_id: int, session_factory: Callable[[], Session],
+                 loop: asyncio.AbstractEventLoop):
+        self.broker = broker
+        self.project_id = project_id
+        self.session_factory = session_factory
+        self.seen = RecentEvents(4 * settings.STREAM_REPLAY_LIMIT)
+        # The loop its streams run on; only touch ``seen`` and subscribers from it
+        self.loop = loop
+        self.task: Optional[asyncio.Task] = None
+
+    def _query(self, fn, *args):
+        db = self.session_factory()
+        try:
+            return fn(db, self.project_id, *args)
+        finally:
+            db.close()
+
+    async def _poll(self, cursor: StreamCursor) -> StreamCursor:
+        # Ids are not committed in order across workers, so re-read a few below the cursor
+        events = await run_in_threadpool(
+            self._query, load_events, cursor.overlapped(settings.STREAM_CATCH_UP_OVERLAP),
+            settings.STREAM_REPLAY_LIMIT
+        )
+        metrics.inc("stream.polls")
+        fresh = [project_event for project_event in events if self.seen.add(project_event)]
+        for project_event in fresh:
+            cursor = cursor.advance(project_event)
+        for subscriber in list(self.broker.subscribers(self.project_id)):
+            for project_event in fresh:
+                subscriber.offer(project_event)
+        return cursor
+
+    async def run(self) -> None:
+        cursor: Optional[StreamCursor] = None
+        failures = 0
+        while True:
+            try:
+                if cursor is None:
+                    cursor = await run_in_threadpool(self._query, latest_cursor)
+                else:
+                    cursor = await self._poll(cursor)
+                failures = 0
+            except Exception:
+                # Streams keep their heartbeats meanwhile; the next poll catches up
+                failures += 1
+                metrics.inc("stream.poll_errors")
+                logger.exception(f"Polling events of project {self.project_id} failed")
+            await asyncio.sleep(self.broker.poll_interval * min(2 ** failures, MAX_BACKOFF))
+
+
+class ProjectEventBroker:
+    def __init__(self, max_connections: int, queue_size: int, poll_interval: float):
+        self.max_connections = max_connections
+        self.queue_size = queue_size
+        self.poll_interval = poll_interval
+        self._subscribers: Dict[int, Set[Subscriber]] = {}
+        self._pollers: Dict[int, ProjectPoller] = {}
+        self._count = 0
+
+    @property
+    def connections(self) -> int:
+        return self._count
+
+    @property
+    def full(self) -> bool:
+        return self._count >= self.max_connections
+
+    def subscribers(self, project_id: int) -> Set[Subscriber]:
+        return self._subscribers.get(project_id, set())
+
+    def subscribe(self, project_id: int, session_factory: Callable[[], Session]) -> Optional[Subscriber]:
+        """Register a stream, or return ``None`` when the worker is at its connection limit.
+
+        Call from inside the stream's body, whose ``finally`` unsubscribes;
+        a slot taken before the body runs leaks if the client never reads it.
+        """
+        if self.full:
+            metrics.inc("stream.rejected")
+            return None
+        subscriber = Subscriber(project_id, self.queue_size)
+        self._subscribers.setdefault(project_id, set()).add(subscriber)
+        if project_id not in self._pollers:
+            poller = ProjectPoller(self, project_id, session_factory, asyncio.get_running_loop())
+            poller.task = asyncio.ensure_future(poller.run())
+            self._pollers[project_id] = poller
+        self._count += 1
+        metrics.set_gauge("stream.connections", self._count)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        subscribers = self._subscribers.get(subscriber.project_id)
+        if subscribers is None or subscriber not in subscribers:
+            return
+        subscribers.discard(subscriber)
+        if not subscribers:
+            del self._subscribers[subscriber.project_id]
+            poller = self._pollers.pop(subscriber.project_id, None)
+            if poller is not None:
+                poller.task.cancel()
+        self._count -= 1
+        metrics.set_gauge("stream.connections", self._count)
+
+    def publish(self, events: List[ProjectEvent]) -> None:
+        """Hand committed events to the project's subscribers; safe to call from any thread.
+
+        Commits run on threadpool threads, so delivery is scheduled on the
+        loop the project's streams run on rather than done here.
+        """
+        by_project: Dict[int, List[ProjectEvent]] = {}
+        for project_event in events:
+            by_project.setdefault(project_event.project_id, []).append(project_event)
+        for project_id, batch in by_project.items():
+            poller = self._pollers.get(project_id)
+            if poller is None:
+                continue
+            try:
+                poller.loop.call_soon_threadsafe(self._deliver, poller, batch)
+            except RuntimeError:
+                # Loop already closed; the streams' finally blocks unsubscribe them
+                pass
+        metrics.inc("stream.published", len(events))
+
+    def _deliver(self, poller: ProjectPoller, events: List[ProjectEvent]) -> None:
+        if self._pollers.get(poller.project_id) is not poller:
+            # Every stream of the project closed meanwhile
+            return
+        # Already delivered, so the poller need not push them again
+        fresh = [project_event for project_event in events if poller.seen.add(project_event)]
+        for subscriber in list(self.subscribers(poller.project_id)):
+            for project_event in fresh:
+                subscriber.offer(project_event)
+
+
+project_events = ProjectEventBroker(
+    settings.STREAM_MAX_CONNECTIONS, settings.STREAM_QUEUE_SIZE, settings.STREAM_HEARTBEAT_SECONDS
+)
+
+
+def latest_cursor(db: Session, project_id: int) -> StreamCursor:
+    activity_id = db.scalar(select(func.max(Activity.id)).where(Activity.project_id == project_id))
+    comment_id = db.scalar(select(func.max(Comment.id)).where(Comment.project_id == project_id))
+    return StreamCursor(activity_id or 0, comment_id or 0)
+
+
+def load_events(db: Session, project_id: int, after: StreamCursor, limit: int) -> List[ProjectEvent]:
+    """Events committed after ``after``, oldest first."""
+    activities = db.execute(
+        select(*FEED_COLUMNS)
+        .where(Activity.project_id == project_id, Activity.id > after.activity_id)
+        .order_by(Activity.id)
+        .limit(limit)
+    ).all()
+    comments = db.execute(
+        select(*COMMENT_COLUMNS)
+        .where(Comment.project_id == project_id, Comment.id > after.comment_id)
+        .order_by(Comment.id)
+        .limit(limit)
+    ).all()
+    events = [ProjectEvent.from_activity(FeedEntry(*row)) for row in activities]
+    events += [ProjectEvent.from_comment(*row) for row in comments]
+    events.sort(key=lambda e: (e.data["created_at"] or "", e.kind, e.id))
+    return events
+
+
+def format_event(project_event: ProjectEvent, cursor: StreamCursor) -> str:
+    return f"id: {cursor}\nevent: {project_event.kind}\ndata: {json.dumps(project_event.data)}\n\n"
+
+
+async def event_stream(session_factory: Callable[[], Session], project_id: int,
+                       cursor: Optional[StreamCursor], is_disconnected: Callable,
+                       heartbeat: Optional[float] = None) -> AsyncIterator[str]:
+    heartbeat = heartbeat or settings.STREAM_HEARTBEAT_SECONDS
+    # Subscribed here rather than by the endpoint, so the finally below
+    # always releases the slot
+    subscriber = project_events.subscribe(project_id, session_factory)
+    if subscriber is None:
+        # Over the limit after the endpoint's check; the client retries
+        yield f"retry: {int(settings.STREAM_RETRY_MILLISECONDS)}\n\n"
+        return
+    # Recently delivered events, so overlapping catch-ups never repeat one
+    delivered = RecentEvents(4 * settings.STREAM_REPLAY_LIMIT)
+
+    def query(fn, *args):
+        db = session_factory()
+        try:
+            return fn(db, project_id, *args)
+        finally:
+            db.close()
+
+    def emit(project_event: ProjectEvent) -> Optional[str]:
+        nonlocal cursor
+        # Events up to the starting cursor were sent before (or predate the stream)
+        if start.covers(project_event) or not delivered.add(project_event):
+            return None
+        cursor = cursor.advance(project_event)
+        return format_event(project_event, cursor)
+
+    async def catch_up(after: StreamCursor) -> List[str]:
+        events = await run_in_threadpool(query, load_events, after, settings.STREAM_REPLAY_LIMIT)
+        return [chunk for chunk in map(emit, events) if chunk is not None]
+
+    try:
+        resuming = cursor is not None
+        if not resuming:
+            cursor = await run_in_threadpool(query, latest_cursor)
+        start = cursor
+        yield f"retry: {int(settings.STREAM_RETRY_MILLISECONDS)}\n\n"
+        if resuming:
+            for chunk in await catch_up(cursor):
+                yield chunk
+        while True:
+            try:
+                item = await asyncio.wait_for(subscriber.queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                if await is_disconnected():
+                    return
+                yield ": heartbeat\n\n"
+                continue
+            if item is LAGGED:
+                for chunk in await catch_up(cursor.overlapped(settings.STREAM_CATCH_UP_OVERLAP)):
+                    yield chunk
+                continue
+            chunk = emit(item)
+            if chunk is not None:
+                yield chunk
+    finally:
+        project_events.unsubscribe(subscriber)
+
+
+def _publish_activities(entries: List[FeedEntry]) -> None:
+    project_events.publish([ProjectEvent.from_activity(entry) for entry in entries if entry.project_id is not None])
+
+
+commit_listeners.append(_publish_activities)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_comments(session, flush_context):
+    comments = [obj for obj in session.new if isinstance(obj, Comment)]
+    if comments:
+        session.info.setdefault(PENDING_KEY, []).extend(
+            ProjectEvent.from_comment(c.id, c.project_id, c.user_id, c.content, c.created_at) for c in comments
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_comments(session):
+    pending = session.info.pop(PENDING_KEY, None)
+    if pending:
+        project_events.publish(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_comments(session):
+    session.info.pop(PENDING_KEY, None)
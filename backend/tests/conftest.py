@@ -1,4 +1,6 @@
-from sqlalchemy import text
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
 from core.config import settings
 import pytest
 from fastapi.testclient import TestClient
@@ -7,6 +9,9 @@ from main import app
 from db.base import Base
 from db.session import engine, SessionLocal, get_db
 from core.security import get_password_hash
+from services.feed import activity_feed, _project_managers
+from services.stats import stats_cache
+from services.recommendations import matrix_cache
 from models.models import User, Project, Scenario, Material, Publication, Comment, Activity, ProjectInfluencer, Influencer
 
 # Fixture to set up and tear down the database for each test function
@@ -27,6 +32,56 @@ def db_session():
         db.close()
         # Drop tables
         Base.metadata.drop_all(bind=engine)
+        # In-memory feed buffers and cached statistics describe the dropped rows
+        activity_feed.clear()
+        _project_managers.clear()
+        stats_cache.clear()
+        matrix_cache.clear()
+
+# Fixture for a session on the test database with foreign keys enforced,
+# as on Postgres; SQLite leaves them off unless asked per connection
+@pytest.fixture(scope="function")
+def fk_session():
+    fk_engine = create_engine(settings.DATABASE_URL, poolclass=NullPool)
+
+    @event.listens_for(fk_engine, "connect")
+    def enable_foreign_keys(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    session = Session(fk_engine)
+    try:
+        yield session
+    finally:
+        session.close()
+        fk_engine.dispose()
+
+# Fixture recording every SQL statement sent to the test database
+@pytest.fixture(scope="function")
+def captured_queries():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+# Fixture counting the statements a single GET issues once caches are warm.
+# The identity map is emptied first, so lazy loads cost a query each as they
+# would in production
+@pytest.fixture(scope="function")
+def count_statements(client, db_session, captured_queries):
+    def count(path, headers):
+        client.get(path, headers=headers)
+        db_session.expunge_all()
+        captured_queries.clear()
+        response = client.get(path, headers=headers)
+        assert response.status_code == 200, response.text
+        return len(captured_queries)
+    return count
 
 # Fixture to provide a test client with overridden DB dependency
 @pytest.fixture(scope="function")
@@ -49,7 +104,6 @@ def test_user(db_session):
     if not db_user:
         db_user = User(
             username="testuser",
-            email="test@example.com",
             password=get_password_hash("password"),
             role="manager"
         )
@@ -64,7 +118,6 @@ def test_user_influencer(db_session, test_user):
     if not db_user:
         db_user = User(
             username="testinfluencer",
-            email="test@example.com",
             password=get_password_hash("password"),
             role="influencer"
         )
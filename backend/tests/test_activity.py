@@ -0,0 +1,183 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import status
+from sqlalchemy import event
+
+from core.config import settings
+from core.metrics import metrics
+from db.session import SessionLocal
+from models.models import Activity, ActivityArchive, ActivityDailyRollup
+import services.activity as activity_module
+from services.activity import ActivityWriter, activity_row, record_activity
+from services.activity_retention import archive_activities, roll_up_archive, run_retention
+
+
+@pytest.fixture(scope="function")
+def background_writer(monkeypatch):
+    writer = ActivityWriter(SessionLocal, batch_size=50, flush_interval=0.05)
+    monkeypatch.setattr(settings, "ACTIVITY_WRITE_MODE", "background")
+    monkeypatch.setattr(activity_module, "activity_writer", writer)
+    writer.start()
+    try:
+        yield writer
+    finally:
+        writer.stop()
+
+
+@pytest.mark.activity
+def test_activity_shares_the_mutation_transaction(client, test_token, test_user, db_session):
+    """Test that a write and its activity are committed together."""
+    commits = []
+    def on_commit(session):
+        commits.append(session)
+    event.listen(db_session, "after_commit", on_commit)
+    try:
+        response = client.post(
+            "/api/v1/projects/",
+            json={"title": "One Commit", "description": "d", "client": "c", "manager_id": test_user.id},
+            headers={"Authorization": f"Bearer {test_token}"}
+        )
+    finally:
+        event.remove(db_session, "after_commit", on_commit)
+    assert response.status_code == status.HTTP_200_OK
+    assert len(commits) == 1
+    activity = db_session.query(Activity).filter(Activity.project_id == response.json()["id"]).one()
+    assert activity.activity_type == "project_created"
+
+
+@pytest.mark.activity
+def test_activity_rolled_back_with_mutation(db_session, test_project, test_user):
+    """Test that an activity is discarded when its transaction rolls back."""
+    record_activity(db_session, test_project.id, test_user.id, "note", "never committed")
+    db_session.rollback()
+    assert db_session.query(Activity).count() == 0
+
+
+@pytest.mark.activity
+def test_background_writer_flushes_after_commit(client, test_token, test_project, background_writer, db_session):
+    """Test that background mode queues activities and writes them in batches."""
+    flushed = metrics.counter("activity.flushed")
+    response = client.patch(
+        f"/api/v1/projects/{test_project.id}/workflow-stage",
+        json={"workflow_stage": "material"},
+        headers={"Authorization": f"Bearer {test_token}"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    background_writer.stop()
+    activity = db_session.query(Activity).filter(Activity.project_id == test_project.id).one()
+    assert activity.activity_type == "workflow_to_material"
+    assert metrics.counter("activity.flushed") == flushed + 1
+
+
+@pytest.mark.activity
+def test_background_writer_discards_rolled_back_rows(db_session, test_project, test_user, background_writer):
+    """Test that rows recorded in a rolled back transaction are never queued."""
+    record_activity(db_session, test_project.id, test_user.id, "note", "rolled back")
+    db_session.rollback()
+    background_writer.stop()
+    assert db_session.query(Activity).count() == 0
+
+
+@pytest.mark.activity
+def test_writer_flushes_in_batches(db_session, test_project, test_user, captured_queries):
+    """Test that flush drains the queue in batch_size inserts."""
+    writer = ActivityWriter(SessionLocal, batch_size=2)
+    rows = [activity_row(test_project.id, test_user.id, "note", f"row {i}") for i in range(5)]
+    assert writer.enqueue(rows) == []
+    assert writer.flush() == 5
+    inserts = [statement for statement, _ in captured_queries if statement.startswith("INSERT INTO activities")]
+    assert len(inserts) == 3
+    assert db_session.query(Activity).count() == 5
+
+
+@pytest.mark.activity
+def test_writer_reports_overflow(test_project, test_user):
+    """Test that rows beyond max_queue are handed back to the caller."""
+    writer = ActivityWriter(SessionLocal, max_queue=2)
+    rows = [activity_row(test_project.id, test_user.id, "note", f"row {i}") for i in range(3)]
+    assert writer.enqueue(rows) == rows[2:]
+
+
+@pytest.fixture(scope="function")
+def aged_activities(db_session, test_project, test_user):
+    now = datetime(2024, 6, 30, 12)
+    ages = {"recent": 5, "old": 40, "ancient": 400}
+    rows = []
+    for label, days in ages.items():
+        for i in range(3):
+            rows.append(Activity(project_id=test_project.id, user_id=test_user.id, activity_type=label,
+                                 description=f"{label} {i}", created_at=now - timedelta(days=days, hours=i)))
+    db_session.add_all(rows)
+    db_session.commit()
+    return now
+
+
+@pytest.mark.activity
+def test_retention_archives_and_rolls_up(client, test_token, db_session, test_project, aged_activities):
+    """Test that retention keeps the hot table small and compacts the oldest rows."""
+    result = run_retention(db_session, now=aged_activities)
+    assert result == {"archived": 6, "compacted": 3}
+
+    assert {a.activity_type for a in db_session.query(Activity)} == {"recent"}
+    assert {a.activity_type for a in db_session.query(ActivityArchive)} == {"old"}
+    rollup = db_session.query(ActivityDailyRollup).one()
+    assert (rollup.activity_type, rollup.count) == ("ancient", 3)
+
+    # The feed only reads the hot table
+    feed = client.get(
+        f"/api/v1/projects/{test_project.id}/activities?limit=100",
+        headers={"Authorization": f"Bearer {test_token}"}
+    ).json()
+    assert len(feed) == 3
+
+    rollups = client.get(
+        f"/api/v1/projects/{test_project.id}/activity-rollups",
+        headers={"Authorization": f"Bearer {test_token}"}
+    ).json()
+    assert rollups == [{"project_id": test_project.id, "day": rollup.day.isoformat(),
+                        "activity_type": "ancient", "count": 3}]
+
+    # Exports can still reach archived rows
+    export = client.get(
+        "/api/v1/export/activities?include_archived=true",
+        headers={"Authorization": f"Bearer {test_token}"}
+    )
+    assert len(export.text.splitlines()) == 6
+
+
+@pytest.mark.activity
+def test_retention_merges_into_existing_rollups(db_session, test_project, test_user, aged_activities):
+    """Test that a later run adds to the rollup of the same day."""
+    run_retention(db_session, now=aged_activities)
+    day = db_session.query(ActivityDailyRollup).one().day
+    db_session.add(ActivityArchive(id=1000, project_id=test_project.id, user_id=test_user.id,
+                                   activity_type="ancient", created_at=datetime.combine(day, datetime.min.time())))
+    db_session.commit()
+
+    assert run_retention(db_session, now=aged_activities) == {"archived": 0, "compacted": 1}
+    db_session.expire_all()
+    assert db_session.query(ActivityDailyRollup).one().count == 4
+
+
+@pytest.mark.activity
+def test_archive_moves_rows_in_batches(db_session, aged_activities):
+    """Test that archiving keeps ids and works through several batches."""
+    ids = {a.id for a in db_session.query(Activity).filter(Activity.activity_type != "recent")}
+    assert archive_activities(db_session, aged_activities - timedelta(days=30), batch_size=4) == 6
+    assert {a.id for a in db_session.query(ActivityArchive)} == ids
+
+
+@pytest.mark.activity
+def test_roll_up_merges_batches(db_session, test_project, test_user, aged_activities, captured_queries):
+    """Test that rolling up works through several batches with one upsert each."""
+    archive_activities(db_session, aged_activities - timedelta(days=30))
+    captured_queries.clear()
+    assert roll_up_archive(db_session, aged_activities - timedelta(days=30), batch_size=2) == 6
+    upserts = [statement for statement, _ in captured_queries if statement.startswith("INSERT INTO activity_daily_rollups")]
+    assert len(upserts) == 3
+    assert db_session.query(ActivityArchive).count() == 0
+    # A day split across batches still ends up in one rollup
+    rollups = [(r.activity_type, r.count) for r in db_session.query(ActivityDailyRollup)]
+    assert sorted(rollups) == [("ancient", 3), ("old", 3)]
@@ -0,0 +1,112 @@
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+
+pytest.importorskip("aiosqlite")
+
+from core.config import settings
+from db.session import get_db
+from models.models import Influencer
+from api.api_v1.endpoints import async_reads
+
+
+@pytest.fixture(scope="function")
+def async_client(db_session):
+    # Standalone app mounting the async router the way DB_MODE=both does
+    app = FastAPI()
+    app.include_router(async_reads.router, prefix=f"{settings.API_V1_STR}/async")
+
+    def _get_test_db():
+        yield db_session
+
+    app.dependency_overrides[get_db] = _get_test_db
+    with TestClient(app) as c:
+        yield c
+
+
+def test_async_read_projects(async_client, test_token, test_project):
+    """Test listing projects through the AsyncSession handler."""
+    response = async_client.get(
+        "/api/v1/async/projects/",
+        headers={"Authorization": f"Bearer {test_token}"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [p["id"] for p in response.json()] == [test_project.id]
+
+
+def test_async_read_project(async_client, test_token, test_project):
+    """Test reading a project through the AsyncSession handler."""
+    response = async_client.get(
+        f"/api/v1/async/projects/{test_project.id}",
+        headers={"Authorization": f"Bearer {test_token}"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["title"] == test_project.title
+
+    response = async_client.get(
+        "/api/v1/async/projects/999",
+        headers={"Authorization": f"Bearer {test_token}"}
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_async_read_activities(client, async_client, test_token, test_project, test_user):
+    """Test that async and sync activity feeds agree."""
+    client.put(
+        f"/api/v1/projects/{test_project.id}",
+        json={"title": "Renamed", "client": "Test Client", "manager_id": test_user.id},
+        headers={"Authorization": f"Bearer {test_token}"}
+    )
+    sync_data = client.get(
+        f"/api/v1/projects/{test_project.id}/activities",
+        headers={"Authorization": f"Bearer {test_token}"}
+    ).json()
+    async_data = async_client.get(
+        f"/api/v1/async/projects/{test_project.id}/activities",
+        headers={"Authorization": f"Bearer {test_token}"}
+    ).json()
+    assert len(async_data) == 1
+    assert async_data == sync_data
+
+
+def test_async_dashboard_feed_has_users(client, async_client, test_token, test_project, test_user):
+    """Test that the async dashboard feed nests users when served from memory."""
+    headers = {"Authorization": f"Bearer {test_token}"}
+    client.put(
+        f"/api/v1/projects/{test_project.id}",
+        json={"title": "Renamed", "client": "Test Client", "manager_id": test_user.id},
+        headers=headers
+    )
+    for _ in range(2):
+        feed = async_client.get("/api/v1/async/projects/0/activities", headers=headers).json()
+        assert feed and all(entry["user"]["username"] == test_user.username for entry in feed)
+
+
+def test_async_read_influencers(async_client, test_token, test_user_influencer):
+    """Test listing influencers through the AsyncSession handler."""
+    response = async_client.get(
+        "/api/v1/async/influencers/",
+        headers={"Authorization": f"Bearer {test_token}"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert any(inf["id"] == test_user_influencer.id for inf in response.json())
+
+
+def test_async_read_influencers_filters_and_sorts(async_client, test_token, db_session, test_user):
+    """Test that the AsyncSession handler takes the same filters and sorts as the sync one."""
+    db_session.add_all([
+        Influencer(nickname="small", tiktok_handle="small", tiktok_followers=10_000, manager_id=test_user.id),
+        Influencer(nickname="mid", youtube_handle="mid", youtube_followers=200_000, manager_id=test_user.id),
+        Influencer(nickname="big", tiktok_handle="big", tiktok_followers=2_000_000, manager_id=test_user.id),
+    ])
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {test_token}"}
+    nicknames = lambda params: [
+        row["nickname"] for row in async_client.get("/api/v1/async/influencers/", params=params, headers=headers).json()
+    ]
+    assert nicknames({"platforms": "tiktok", "min_followers": 50_000}) == ["big"]
+    assert nicknames({"max_followers": 500_000, "sort": "-total_reach"}) == ["mid", "small"]
+    response = async_client.get("/api/v1/async/influencers/?sort=-total_reach&limit=1", headers=headers)
+    assert [row["nickname"] for row in response.json()] == ["big"]
+    response = async_client.get("/api/v1/async/influencers/?sort=nickname", headers=headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
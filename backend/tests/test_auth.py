@@ -67,4 +67,88 @@ def test_login_wrong_password(client, test_user):
         data={"username": "testuser", "password": "wrongpassword"}
     )
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
-    assert response.json()["detail"] == "Incorrect username or password" 
\ No newline at end of file
+    assert response.json()["detail"] == "Incorrect username or password" 
+
+@pytest.mark.auth
+def test_login_loads_user_once(client, test_user, captured_queries):
+    """Test that login reads the user and its role ids in a single query."""
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": "testuser", "password": "password"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    user_queries = [sql for sql, _ in captured_queries if "FROM users" in sql]
+    assert len(user_queries) == 1
+
+@pytest.fixture
+def claims_tokens(client, test_user, monkeypatch):
+    from core.config import settings
+    monkeypatch.setattr(settings, "TOKEN_FORMAT", "claims")
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": "testuser", "password": "password"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()
+
+@pytest.mark.auth
+def test_login_claims_token(client, claims_tokens, test_user):
+    """Test that claims tokens authorize requests without loading the user."""
+    from jose import jwt
+    from core.config import settings
+    from core.security import principal_cache
+
+    payload = jwt.decode(claims_tokens["access_token"], settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    assert payload["uid"] == test_user.id
+    assert payload["role"] == "manager"
+    assert claims_tokens["refresh_token"]
+
+    principal_cache.clear()
+    response = client.get(
+        "/api/v1/projects/",
+        headers={"Authorization": f"Bearer {claims_tokens['access_token']}"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert principal_cache.get("testuser") is None
+
+@pytest.mark.auth
+def test_refresh_token_rotation(client, claims_tokens):
+    """Test that a refresh token yields a new pair and cannot be reused."""
+    response = client.post("/api/v1/auth/refresh", json={"refresh_token": claims_tokens["refresh_token"]})
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["access_token"] != claims_tokens["access_token"]
+    assert data["user"]["username"] == "testuser"
+
+    response = client.post("/api/v1/auth/refresh", json={"refresh_token": claims_tokens["refresh_token"]})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+@pytest.mark.auth
+def test_refresh_token_rejected_as_access_token(client, claims_tokens):
+    """Test that refresh tokens cannot be used to call the API."""
+    response = client.get(
+        "/api/v1/projects/",
+        headers={"Authorization": f"Bearer {claims_tokens['refresh_token']}"}
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+@pytest.mark.auth
+def test_logout_revokes_tokens(client, claims_tokens):
+    """Test that logout denylists the access and refresh tokens."""
+    headers = {"Authorization": f"Bearer {claims_tokens['access_token']}"}
+    response = client.post("/api/v1/auth/logout", json={"refresh_token": claims_tokens["refresh_token"]}, headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+
+    assert client.get("/api/v1/projects/", headers=headers).status_code == status.HTTP_401_UNAUTHORIZED
+    response = client.post("/api/v1/auth/refresh", json={"refresh_token": claims_tokens["refresh_token"]})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+@pytest.mark.auth
+def test_me_with_claims_token(client, claims_tokens):
+    """Test that /me fills in profile fields missing from the claims."""
+    response = client.get(
+        "/api/v1/auth/me",
+        headers={"Authorization": f"Bearer {claims_tokens['access_token']}"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["created_at"]
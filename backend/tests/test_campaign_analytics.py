@@ -0,0 +1,86 @@
+import pytest
+from fastapi import status
+
+from models.models import Influencer, Project, ProjectInfluencer
+from services.campaign_analytics import project_analytics
+
+
+@pytest.fixture(scope="function")
+def campaign(db_session, test_user):
+    project = Project(title="Launch", client="Client", manager_id=test_user.id, budget=30_000,
+                      platforms=["instagram", "tiktok"])
+    other = Project(title="Unstaffed", client="Client", manager_id=test_user.id)
+    roster = [
+        Influencer(nickname="a", instagram_handle="a", instagram_followers=100_000,
+                   youtube_handle="a", youtube_followers=1_000_000, manager_id=test_user.id),
+        Influencer(nickname="b", tiktok_handle="b", tiktok_followers=200_000, manager_id=test_user.id),
+        Influencer(nickname="spare", tiktok_handle="spare", tiktok_followers=300_000, manager_id=test_user.id),
+        Influencer(nickname="foreign", tiktok_handle="foreign", tiktok_followers=1, manager_id=test_user.id + 100),
+    ]
+    db_session.add_all([project, other, *roster])
+    db_session.flush()
+    db_session.add_all([
+        ProjectInfluencer(project_id=project.id, influencer_id=roster[0].id),
+        ProjectInfluencer(project_id=project.id, influencer_id=roster[1].id),
+        # A second assignment of the same influencer does not add reach
+        ProjectInfluencer(project_id=project.id, influencer_id=roster[1].id),
+    ])
+    db_session.commit()
+    return project, other, roster
+
+
+@pytest.mark.analytics
+def test_project_analytics(client, test_token, campaign):
+    """Test reach, CPM and coverage over the project's target platforms."""
+    project, _, _ = campaign
+    response = client.get(f"/api/v1/projects/{project.id}/analytics",
+                          headers={"Authorization": f"Bearer {test_token}"})
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["influencers"] == 2
+    assert data["platforms"] == ["instagram", "tiktok"]
+    assert data["estimated_reach"] == 300_000
+    assert data["cpm"] == 100.0
+    assert data["coverage"]["youtube"] == {"influencers": 1, "followers": 1_000_000, "share": 0.5}
+    assert data["coverage"]["vk"] == {"influencers": 0, "followers": 0, "share": 0.0}
+
+
+@pytest.mark.analytics
+def test_analytics_for_many_projects(db_session, campaign):
+    """Test that batch analytics keep projects apart and count every platform without targets."""
+    project, other, _ = campaign
+    first, second = project_analytics(db_session, [project, other])
+    assert first["estimated_reach"] == 300_000
+    assert second["influencers"] == 0
+    assert second["estimated_reach"] == 0
+    assert second["cpm"] is None
+    assert second["platforms"] == ["instagram", "tiktok", "youtube", "telegram", "vk"]
+
+
+@pytest.mark.analytics
+def test_what_if(client, test_token, db_session, campaign):
+    """Test that what-if scenarios change nothing and reject other managers' influencers."""
+    project, _, roster = campaign
+    url = f"/api/v1/projects/{project.id}/analytics/what-if"
+    headers = {"Authorization": f"Bearer {test_token}"}
+
+    response = client.post(url, headers=headers, json={
+        "add_influencer_ids": [roster[2].id], "remove_influencer_ids": [roster[0].id],
+    })
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["influencers"] == 2
+    assert data["estimated_reach"] == 500_000
+    assert data["cpm"] == 60.0
+
+    response = client.post(url, headers=headers, json={"budget": None, "platforms": ["youtube"]})
+    data = response.json()
+    assert data["estimated_reach"] == 1_000_000
+    assert data["cpm"] is None
+
+    response = client.post(url, headers=headers, json={"add_influencer_ids": [roster[3].id]})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    db_session.expire_all()
+    assert db_session.get(Project, project.id).budget == 30_000
+    assert db_session.query(ProjectInfluencer).filter(ProjectInfluencer.project_id == project.id).count() == 3
@@ -16,4 +16,121 @@ def test_database_connection(db_session):
     
     # Make a simple query to verify connection
     result = db_session.execute(text("SELECT 1")).scalar()
-    assert result == 1 
\ No newline at end of file
+    assert result == 1 
+
+@pytest.mark.database
+def test_pool_settings_and_metrics(db_session):
+    """Test that pool settings are applied and checkouts are reported."""
+    from core.config import settings
+    from core.metrics import metrics
+    from db.session import engine, InstrumentedQueuePool, pool_status
+
+    assert isinstance(engine.pool, InstrumentedQueuePool)
+    assert engine.pool.size() == settings.DB_POOL_SIZE
+    assert engine.pool._recycle == settings.DB_POOL_RECYCLE
+
+    checkouts = metrics.counter("db.primary.pool.checkouts")
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        assert metrics.gauge("db.primary.pool.in_use") >= 1
+    assert metrics.counter("db.primary.pool.checkouts") == checkouts + 1
+    assert metrics.snapshot()["summaries"]["db.primary.pool.checkout_wait_seconds"]["count"] > 0
+    assert "Pool size" in pool_status()
+
+@pytest.mark.database
+def test_pool_timeout_is_counted():
+    """Test that pool exhaustion is surfaced as a timeout metric."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+    from core.metrics import metrics
+    from db.session import InstrumentedQueuePool, instrument_pool
+
+    exhausted = instrument_pool(create_engine(
+        "sqlite:///test.db", poolclass=InstrumentedQueuePool,
+        pool_size=1, max_overflow=0, pool_timeout=0.1
+    ), name="exhausted")
+    timeouts = metrics.counter("db.exhausted.pool.timeouts")
+    with exhausted.connect():
+        with pytest.raises(PoolTimeoutError):
+            exhausted.connect()
+    assert metrics.counter("db.exhausted.pool.timeouts") == timeouts + 1
+    exhausted.dispose()
+
+@pytest.fixture
+def replica_setup(tmp_path, monkeypatch):
+    """A primary and a replica SQLite file with diverging contents."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    import db.session as session_module
+    from db.base import Base
+    from models.models import Project
+
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for target, title in ((primary, "on primary"), (replica, "on replica")):
+        Base.metadata.create_all(bind=target)
+        with target.begin() as connection:
+            connection.execute(Project.__table__.insert().values(id=1, title=title, client="c"))
+
+    factory = sessionmaker(
+        class_=session_module.RoutingSession, primary=primary, replicas=[replica],
+        autoflush=False, bind=primary
+    )
+    monkeypatch.setattr(session_module, "SessionLocal", factory)
+    monkeypatch.setattr(session_module, "replica_engines", [replica])
+    session_module.recent_writers.clear()
+    yield factory
+    primary.dispose()
+    replica.dispose()
+
+def _request(method, subject="testuser"):
+    from starlette.requests import Request
+    from core.security import create_access_token
+
+    token = create_access_token({"sub": subject})
+    return Request({
+        "type": "http",
+        "method": method,
+        "headers": [(b"authorization", f"Bearer {token}".encode())],
+    })
+
+@pytest.mark.database
+def test_routing_session_reads_from_replica(replica_setup):
+    """Test that read-only sessions use the replica until they write."""
+    from models.models import Project
+
+    db = replica_setup(read_only=True)
+    assert db.get(Project, 1).title == "on replica"
+
+    db.add(Project(title="new", client="c"))
+    db.flush()
+    db.expire_all()
+    assert db.get(Project, 1).title == "on primary"
+    db.rollback()
+    db.close()
+
+    db = replica_setup(read_only=False)
+    assert db.get(Project, 1).title == "on primary"
+    db.close()
+
+@pytest.mark.database
+def test_get_db_read_your_writes(replica_setup):
+    """Test that a user's GETs stick to the primary right after they wrote."""
+    from db.session import get_db
+    from models.models import Project
+
+    def first_title(request):
+        dependency = get_db(request)
+        db = next(dependency)
+        title = db.get(Project, 1).title
+        if request.method == "POST":
+            db.get(Project, 1).client = "updated"
+            db.commit()
+        dependency.close()
+        return title
+
+    assert first_title(_request("GET")) == "on replica"
+    assert first_title(_request("POST")) == "on primary"
+    assert first_title(_request("GET")) == "on primary"
+    # Other users still read from the replica
+    assert first_title(_request("GET", subject="someone-else")) == "on replica"
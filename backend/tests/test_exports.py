@@ -0,0 +1,164 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+import pytest
+from fastapi import status
+
+from db.session import SessionLocal
+from models.models import Activity, Influencer, Project, ProjectInfluencer, Publication, User
+from services.export import stream_export
+
+
+@pytest.fixture(scope="function")
+def test_activities(db_session, test_project, test_user):
+    other = Project(title="Other Project", manager_id=test_user.id + 1)
+    db_session.add(other)
+    db_session.flush()
+    activities = [
+        Activity(project_id=test_project.id, user_id=test_user.id, activity_type="comment",
+                 description=f"activity {day}", created_at=datetime(2024, 1, day))
+        for day in range(1, 11)
+    ]
+    activities.append(Activity(project_id=other.id, user_id=test_user.id, activity_type="comment",
+                               description="elsewhere", created_at=datetime(2024, 1, 5)))
+    db_session.add_all(activities)
+    db_session.commit()
+    return activities
+
+
+@pytest.fixture(scope="function")
+def foreign_data(db_session):
+    manager = User(username="othermanager", name="Other Manager", role="manager")
+    db_session.add(manager)
+    db_session.flush()
+    project = Project(title="Secret Project", manager_id=manager.id)
+    influencer = Influencer(manager_id=manager.id, nickname="secretinf", instagram_handle="secretinf")
+    db_session.add_all([project, influencer])
+    db_session.flush()
+    db_session.add_all([
+        ProjectInfluencer(project_id=project.id, influencer_id=influencer.id),
+        Activity(project_id=project.id, user_id=manager.id, activity_type="comment",
+                 description="secret act", created_at=datetime(2024, 1, 5)),
+        Publication(project_id=project.id, influencer_id=influencer.id, platform="instagram",
+                    status="pending", published_at=datetime(2024, 1, 5)),
+    ])
+    db_session.commit()
+    return project
+
+
+@pytest.mark.export
+def test_export_activities_ndjson(client, test_token, test_project, test_activities):
+    """Test NDJSON export filtered by project and date range."""
+    response = client.get(
+        "/api/v1/export/activities",
+        params={"project_id": test_project.id, "since": "2024-01-03", "until": "2024-01-06"},
+        headers={"Authorization": f"Bearer {test_token}"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["description"] for row in rows] == ["activity 3", "activity 4", "activity 5"]
+    assert rows[0]["created_at"] == "2024-01-03T00:00:00"
+
+
+@pytest.mark.export
+def test_export_activities_by_manager(client, test_token, test_user, test_activities):
+    """Test that the manager filter goes through the activity's project."""
+    response = client.get(
+        "/api/v1/export/activities",
+        params={"manager_id": test_user.id},
+        headers={"Authorization": f"Bearer {test_token}"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.text.splitlines()) == 10
+
+
+@pytest.mark.export
+def test_export_publications_csv(client, test_token, test_publication):
+    """Test CSV export with a header row."""
+    response = client.get(
+        "/api/v1/export/publications?format=csv",
+        headers={"Authorization": f"Bearer {test_token}"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="publications.csv"' in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 1
+    assert rows[0]["id"] == str(test_publication.id)
+    assert rows[0]["platform"] == "instagram"
+
+
+@pytest.mark.export
+def test_export_influencers_by_project(client, test_token, db_session, test_project, test_user):
+    """Test exporting the influencers of a project."""
+    attached = Influencer(manager_id=test_user.id, nickname="attached")
+    detached = Influencer(manager_id=test_user.id, nickname="detached")
+    db_session.add_all([attached, detached])
+    db_session.flush()
+    db_session.add(ProjectInfluencer(project_id=test_project.id, influencer_id=attached.id))
+    db_session.commit()
+
+    response = client.get(
+        f"/api/v1/export/influencers?project_id={test_project.id}",
+        headers={"Authorization": f"Bearer {test_token}"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [json.loads(line)["nickname"] for line in response.text.splitlines()] == ["attached"]
+
+
+@pytest.mark.export
+@pytest.mark.parametrize("resource", ["activities", "publications", "influencers"])
+def test_export_excludes_other_managers(client, test_token, test_publication, foreign_data, resource):
+    """Test that an unfiltered export only contains the caller's rows."""
+    response = client.get(
+        f"/api/v1/export/{resource}",
+        headers={"Authorization": f"Bearer {test_token}"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    project_ids = {row.get("project_id") for row in rows}
+    assert foreign_data.id not in project_ids
+    assert "secret act" not in response.text
+    assert "secretinf" not in response.text
+
+
+@pytest.mark.export
+@pytest.mark.parametrize("resource", ["activities", "publications", "influencers"])
+def test_export_rejects_foreign_filters(client, test_token, foreign_data, resource):
+    """Test that another manager's id or project cannot be exported."""
+    headers = {"Authorization": f"Bearer {test_token}"}
+    response = client.get(
+        f"/api/v1/export/{resource}", params={"manager_id": foreign_data.manager_id}, headers=headers
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    response = client.get(
+        f"/api/v1/export/{resource}", params={"project_id": foreign_data.id}, headers=headers
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.export
+def test_export_streams_in_batches(test_activities):
+    """Test that each batch of rows becomes one chunk."""
+    chunks = list(stream_export(SessionLocal, "activities", "ndjson", batch_size=4))
+    assert [chunk.count("\n") for chunk in chunks] == [4, 4, 3]
+
+
+@pytest.mark.export
+def test_export_bad_format(client, test_token):
+    """Test that unknown formats are rejected before streaming starts."""
+    response = client.get(
+        "/api/v1/export/activities?format=xml",
+        headers={"Authorization": f"Bearer {test_token}"}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.export
+def test_export_requires_auth(client):
+    """Test that exports need a token."""
+    response = client.get("/api/v1/export/activities")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import status
+
+from models.models import Activity, Project
+from services.feed import activity_feed
+
+
+@pytest.fixture(scope="function")
+def two_tenants(db_session, test_project, test_user):
+    other = Project(title="Someone else's", manager_id=test_user.id + 100)
+    db_session.add(other)
+    db_session.flush()
+    start = datetime(2024, 1, 1)
+    for i in range(6):
+        db_session.add(Activity(project_id=test_project.id, user_id=test_user.id, activity_type="mine",
+                                description=f"mine {i}", created_at=start + timedelta(minutes=i)))
+        db_session.add(Activity(project_id=other.id, user_id=test_user.id, activity_type="theirs",
+                                description=f"theirs {i}", created_at=start + timedelta(minutes=i)))
+    db_session.commit()
+    return other
+
+
+def _activity_selects(captured_queries):
+    return [s for s, _ in captured_queries if s.lstrip().startswith("SELECT") and "FROM activities" in s]
+
+
+@pytest.mark.activity
+def test_feed_is_scoped_to_the_manager(client, test_token, two_tenants):
+    """Test that the dashboard feed only shows the manager's own projects."""
+    response = client.get(
+        "/api/v1/projects/0/activities?limit=100",
+        headers={"Authorization": f"Bearer {test_token}"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [a["description"] for a in response.json()] == [f"mine {i}" for i in reversed(range(6))]
+
+
+@pytest.mark.activity
+def test_feed_served_from_memory(client, test_token, test_project, test_user, two_tenants, captured_queries):
+    """Test that a warm feed and new writes are served without reading activities."""
+    headers = {"Authorization": f"Bearer {test_token}"}
+    client.get("/api/v1/projects/0/activities", headers=headers)
+    assert len(_activity_selects(captured_queries)) == 1
+
+    client.patch(
+        f"/api/v1/projects/{test_project.id}/workflow-stage",
+        json={"workflow_stage": "material"},
+        headers=headers
+    )
+    captured_queries.clear()
+    feed = client.get("/api/v1/projects/0/activities", headers=headers).json()
+    assert feed[0]["activity_type"] == "workflow_to_material"
+    assert _activity_selects(captured_queries) == []
+    # Same shape as pages read from the database
+    assert all(entry["user"]["username"] == "testuser" for entry in feed)
+
+
+@pytest.mark.activity
+def test_feed_pages_past_the_buffer(client, test_token, two_tenants, monkeypatch):
+    """Test that cursor pages beyond the buffered window fall back to the database."""
+    monkeypatch.setattr(activity_feed, "capacity", 3)
+    headers = {"Authorization": f"Bearer {test_token}"}
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/v1/projects/0/activities", params=params, headers=headers)
+        seen += [a["description"] for a in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen == [f"mine {i}" for i in reversed(range(6))]
+
+
+@pytest.mark.activity
+def test_feed_ignores_rolled_back_activities(client, test_token, db_session, test_project, test_user, two_tenants):
+    """Test that activities from a rolled back transaction never reach the feed."""
+    headers = {"Authorization": f"Bearer {test_token}"}
+    client.get("/api/v1/projects/0/activities", headers=headers)
+
+    db_session.add(Activity(project_id=test_project.id, user_id=test_user.id, activity_type="ghost",
+                            description="ghost", created_at=datetime.utcnow()))
+    db_session.flush()
+    db_session.rollback()
+
+    feed = client.get("/api/v1/projects/0/activities", headers=headers).json()
+    assert "ghost" not in [a["activity_type"] for a in feed]
+
+
+@pytest.mark.activity
+def test_feed_follows_project_to_new_manager(client, test_token, db_session, test_project, test_user, two_tenants):
+    """Test that activities of a reassigned project stop reaching the old manager's feed."""
+    headers = {"Authorization": f"Bearer {test_token}"}
+    client.get("/api/v1/projects/0/activities", headers=headers)
+    db_session.add(Activity(project_id=test_project.id, user_id=test_user.id, activity_type="before",
+                            description="before", created_at=datetime.utcnow()))
+    db_session.commit()
+
+    test_project.manager_id = test_user.id + 100
+    db_session.commit()
+    db_session.add(Activity(project_id=test_project.id, user_id=test_user.id, activity_type="after",
+                            description="after", created_at=datetime.utcnow()))
+    db_session.commit()
+
+    feed = client.get("/api/v1/projects/0/activities", headers=headers).json()
+    assert "after" not in [a["activity_type"] for a in feed]
@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from fastapi import status
+
+from core.config import settings
+from core.metrics import metrics
+from models.models import FollowerSeriesBlock, Influencer
+from services.follower_series import decode, encode, epoch
+
+START = datetime(2024, 1, 1)
+
+
+def _growth(client, token, influencer_id, **params):
+    response = client.get(f"/api/v1/influencers/{influencer_id}/growth", params=params,
+                          headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == status.HTTP_200_OK, response.json()
+    return response.json()
+
+
+def _snapshots(client, token, influencer_id, snapshots):
+    response = client.post(f"/api/v1/influencers/{influencer_id}/snapshots", json=snapshots,
+                           headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == status.HTTP_200_OK, response.json()
+    return response.json()["stored"]
+
+
+@pytest.mark.series
+def test_block_encoding_round_trip():
+    """Test that blocks decode to what was encoded and use narrow deltas."""
+    times = np.arange(0, 3600 * 100, 3600, dtype=np.int64) + epoch(START)
+    values = 50_000 + np.cumsum(np.arange(100) % 7 - 2)
+    data = encode(times, values)
+    decoded_times, decoded_values = decode(int(times[0]), int(values[0]), len(times), data)
+    assert (decoded_times == times).all() and (decoded_values == values).all()
+    # int16 time deltas and int8 value deltas
+    assert len(data) == 3 + 99 * 2 + 99
+
+
+@pytest.mark.series
+def test_follower_changes_are_recorded(client, test_token, test_user):
+    """Test that writes to the *_followers fields append to the follower history."""
+    headers = {"Authorization": f"Bearer {test_token}"}
+    response = client.post("/api/v1/influencers/", headers=headers, json={
+        "nickname": "growing", "manager_id": test_user.id, "tiktok_followers": 1000,
+    })
+    influencer_id = response.json()["id"]
+    client.put(f"/api/v1/influencers/{influencer_id}", headers=headers, json={"bio": "unchanged followers"})
+    client.put(f"/api/v1/influencers/{influencer_id}", headers=headers, json={"tiktok_followers": 1500})
+
+    data = _growth(client, test_token, influencer_id, platform="tiktok", resolution=10**9)
+    assert [(p["min"], p["max"], p["last"]) for p in data["points"]] == [(1000, 1500, 1500)]
+    assert _growth(client, test_token, influencer_id, platform="youtube")["points"] == []
+
+
+@pytest.mark.series
+def test_deleting_influencer_drops_series(fk_session):
+    """Test that series blocks go before the influencer, so enforced foreign keys hold."""
+    influencer = Influencer(nickname="fading", vk_handle="fading", vk_followers=10)
+    fk_session.add(influencer)
+    fk_session.commit()
+    influencer_id = influencer.id
+    blocks = lambda: fk_session.query(FollowerSeriesBlock).filter_by(influencer_id=influencer_id).count()
+    assert blocks() == 1
+
+    fk_session.delete(influencer)
+    fk_session.commit()
+    assert blocks() == 0
+
+
+@pytest.mark.series
+def test_downsampled_ranges(client, test_token, test_user_influencer, db_session, monkeypatch):
+    """Test min/max/last per bucket across block boundaries, against a brute-force computation."""
+    monkeypatch.setattr(settings, "SERIES_BLOCK_POINTS", 16)
+    rng = np.random.default_rng(7)
+    times = [START + timedelta(minutes=int(m)) for m in np.cumsum(rng.integers(1, 120, 100))]
+    values = (10_000 + np.cumsum(rng.integers(-50, 80, 100))).tolist()
+    snapshots = [{"platform": "vk", "value": v, "at": t.isoformat()} for t, v in zip(times, values)]
+    assert _snapshots(client, test_token, test_user_influencer.id, snapshots[:40]) == 40
+    # Older than the newest stored point: dropped; the newest one itself is repeated
+    assert _snapshots(client, test_token, test_user_influencer.id, snapshots[10:60]) == 21
+    assert _snapshots(client, test_token, test_user_influencer.id, snapshots[60:]) == 40
+    assert db_session.query(FollowerSeriesBlock).count() == 7
+
+    start, end = times[15], times[85]
+    data = _growth(client, test_token, test_user_influencer.id, platform="vk",
+                   start=start.isoformat(), end=end.isoformat(), resolution=6 * 3600)
+    expected = {}
+    for at, value in zip(times, values):
+        if start <= at <= end:
+            bucket = epoch(at) // (6 * 3600)
+            low, high, _ = expected.get(bucket, (value, value, value))
+            expected[bucket] = (min(low, value), max(high, value), value)
+    assert [(epoch(datetime.fromisoformat(p["at"])) // (6 * 3600), p["min"], p["max"], p["last"])
+            for p in data["points"]] == [(bucket, *v) for bucket, v in expected.items()]
+
+    # Whole blocks inside one bucket are answered from their summaries
+    decoded = metrics.counter("follower_series.blocks_decoded")
+    data = _growth(client, test_token, test_user_influencer.id, platform="vk", resolution=10**9)
+    assert [(p["min"], p["max"], p["last"]) for p in data["points"]] == [(min(values), max(values), values[-1])]
+    assert metrics.counter("follower_series.blocks_decoded") == decoded
+
+    data = _growth(client, test_token, test_user_influencer.id, platform="vk", points=10)
+    assert len(data["points"]) <= 10
+    assert data["points"][-1]["last"] == values[-1]
+
+
+@pytest.mark.series
+def test_series_validation(client, test_token, test_user_influencer):
+    """Test that unknown platforms, metrics and influencers are rejected."""
+    headers = {"Authorization": f"Bearer {test_token}"}
+    response = client.get(f"/api/v1/influencers/{test_user_influencer.id}/growth?platform=myspace", headers=headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = client.post(f"/api/v1/influencers/{test_user_influencer.id}/snapshots", headers=headers,
+                           json=[{"platform": "vk", "metric": "likes", "value": 1}])
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = client.get("/api/v1/influencers/999/growth?platform=vk", headers=headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,125 @@
+import pytest
+from fastapi import status
+from sqlalchemy import select
+
+from models.models import Influencer, InfluencerPlatform
+from services.influencer_import import import_influencers
+
+
+def _platforms(db_session, influencer_id):
+    rows = db_session.execute(
+        select(InfluencerPlatform.platform, InfluencerPlatform.handle, InfluencerPlatform.followers)
+        .where(InfluencerPlatform.influencer_id == influencer_id)
+        .order_by(InfluencerPlatform.platform)
+    )
+    return [tuple(row) for row in rows]
+
+
+def _list(client, token, **params):
+    response = client.get("/api/v1/influencers/", params=params, headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == status.HTTP_200_OK, response.json()
+    return response
+
+
+@pytest.fixture(scope="function")
+def roster(db_session, test_user):
+    influencers = {
+        "small": Influencer(nickname="small", tiktok_handle="small", tiktok_followers=10_000, manager_id=test_user.id),
+        "mid": Influencer(nickname="mid", youtube_handle="mid", youtube_followers=200_000,
+                          instagram_handle="mid", instagram_followers=900_000, manager_id=test_user.id),
+        "big": Influencer(nickname="big", tiktok_handle="big", tiktok_followers=2_000_000, manager_id=test_user.id),
+        "insta": Influencer(nickname="insta", instagram_handle="insta", instagram_followers=100_000,
+                            manager_id=test_user.id),
+        "foreign": Influencer(nickname="foreign", tiktok_handle="foreign", tiktok_followers=100_000,
+                              manager_id=test_user.id + 100),
+    }
+    db_session.add_all(influencers.values())
+    db_session.commit()
+    return influencers
+
+
+@pytest.mark.platforms
+def test_platform_rows_follow_influencer_writes(client, test_token, db_session, test_user):
+    """Test that API writes to the platform columns are mirrored into influencer_platforms and total_reach."""
+    headers = {"Authorization": f"Bearer {test_token}"}
+    response = client.post("/api/v1/influencers/", headers=headers, json={
+        "nickname": "mirror", "manager_id": test_user.id,
+        "instagram_handle": "mirror", "instagram_followers": 1000, "vk_followers": 50,
+    })
+    assert response.status_code == status.HTTP_200_OK
+    created = response.json()
+    assert created["total_reach"] == 1050
+    assert _platforms(db_session, created["id"]) == [("instagram", "mirror", 1000), ("vk", None, 50)]
+
+    response = client.put(f"/api/v1/influencers/{created['id']}", headers=headers,
+                          json={"instagram_followers": 1500, "vk_followers": None, "tiktok_handle": "mirror.tt"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["total_reach"] == 1500
+    assert _platforms(db_session, created["id"]) == [("instagram", "mirror", 1500), ("tiktok", "mirror.tt", None)]
+
+    db_session.delete(db_session.get(Influencer, created["id"]))
+    db_session.commit()
+    assert _platforms(db_session, created["id"]) == []
+
+
+@pytest.mark.platforms
+def test_delete_influencer_with_foreign_keys(fk_session):
+    """Test that platform rows go before the influencer, so enforced foreign keys hold."""
+    influencer = Influencer(nickname="gone", instagram_handle="gone", tiktok_handle="gone.tt")
+    fk_session.add(influencer)
+    fk_session.commit()
+    influencer_id = influencer.id
+    assert len(_platforms(fk_session, influencer_id)) == 2
+
+    fk_session.delete(influencer)
+    fk_session.commit()
+    assert _platforms(fk_session, influencer_id) == []
+    assert fk_session.get(Influencer, influencer_id) is None
+
+
+@pytest.mark.platforms
+def test_filter_by_followers_on_platforms(client, test_token, roster):
+    """Test that follower ranges match on any of the requested platforms."""
+    nicknames = lambda response: [row["nickname"] for row in response.json()]
+    response = _list(client, test_token, platforms="tiktok,youtube", min_followers=50_000, max_followers=500_000)
+    assert nicknames(response) == ["mid"]
+    response = _list(client, test_token, min_followers=50_000, max_followers=500_000)
+    assert nicknames(response) == ["mid", "insta"]
+    response = _list(client, test_token, platforms="tiktok")
+    assert nicknames(response) == ["small", "big"]
+
+
+@pytest.mark.platforms
+def test_sort_by_total_reach(client, test_token, roster):
+    """Test that the list pages through influencers by total reach."""
+    response = _list(client, test_token, sort="-total_reach", limit=2)
+    assert [row["nickname"] for row in response.json()] == ["big", "mid"]
+    response = _list(client, test_token, sort="-total_reach", limit=2, cursor=response.headers["X-Next-Cursor"])
+    assert [row["nickname"] for row in response.json()] == ["insta", "small"]
+    response = _list(client, test_token, sort="total_reach", min_followers=1)
+    assert [row["total_reach"] for row in response.json()] == [10_000, 100_000, 1_100_000, 2_000_000]
+
+
+@pytest.mark.platforms
+def test_invalid_filters(client, test_token):
+    """Test that unknown platforms and sorts are rejected."""
+    headers = {"Authorization": f"Bearer {test_token}"}
+    response = client.get("/api/v1/influencers/?platforms=myspace", headers=headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = client.get("/api/v1/influencers/?sort=nickname", headers=headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.platforms
+def test_import_mirrors_platforms(db_session, test_user):
+    """Test that Core bulk inserts and updates from the importer are mirrored too."""
+    rows = [
+        (2, {"nickname": "a", "tiktok_handle": "a", "tiktok_followers": "1,000"}),
+        (3, {"nickname": "b", "youtube_handle": "b", "youtube_followers": "20"}),
+    ]
+    import_influencers(db_session, iter(rows), manager_id=test_user.id)
+    import_influencers(db_session, iter([(2, {"tiktok_handle": "a", "tiktok_followers": "3000",
+                                              "vk_handle": "a.vk", "vk_followers": "5"})]), manager_id=test_user.id)
+    first = db_session.scalars(select(Influencer).where(Influencer.tiktok_handle == "a")).one()
+    assert first.total_reach == 3005
+    assert _platforms(db_session, first.id) == [("tiktok", "a", 3000), ("vk", "a.vk", 5)]
@@ -0,0 +1,60 @@
+import pytest
+from fastapi import status
+
+from models.models import Influencer
+
+
+@pytest.fixture(scope="function")
+def roster(db_session, test_user):
+    influencers = [
+        Influencer(nickname="fitmarina", bio="Morning workouts", tiktok_handle="fitmarina", manager_id=test_user.id),
+        Influencer(nickname="cookbook", bio="Fitness recipes and meal prep", instagram_handle="cook.book",
+                   manager_id=test_user.id),
+        Influencer(nickname="travelsasha", bio="Trips on a budget", youtube_handle="sashatravels",
+                   manager_id=test_user.id),
+        Influencer(nickname="fitness_other", bio="Fitness", tiktok_handle="other", manager_id=test_user.id + 100),
+    ]
+    db_session.add_all(influencers)
+    db_session.commit()
+    return influencers
+
+
+def search(client, test_token, q, **params):
+    response = client.get("/api/v1/influencers/search", params={"q": q, **params},
+                          headers={"Authorization": f"Bearer {test_token}"})
+    assert response.status_code == status.HTTP_200_OK
+    return [row["nickname"] for row in response.json()]
+
+
+@pytest.mark.search
+def test_search_matches_prefixes_in_every_column(client, test_token, roster):
+    """Test that words match as prefixes of nicknames, bios and handles."""
+    assert search(client, test_token, "trav") == ["travelsasha"]
+    assert search(client, test_token, "sashatr") == ["travelsasha"]
+    assert search(client, test_token, "meal") == ["cookbook"]
+
+
+@pytest.mark.search
+def test_search_ranks_and_scopes_results(client, test_token, roster):
+    """Test that nickname matches outrank bio matches and other managers' influencers are hidden."""
+    assert search(client, test_token, "fit") == ["fitmarina", "cookbook"]
+    assert search(client, test_token, "fit", limit=1) == ["fitmarina"]
+
+
+@pytest.mark.search
+def test_search_filters_by_platform(client, test_token, roster):
+    """Test that a platform name in the query requires a handle on that platform."""
+    assert search(client, test_token, "tiktok recipes") == []
+    assert search(client, test_token, "tiktok fit") == ["fitmarina"]
+    assert search(client, test_token, "youtube") == ["travelsasha"]
+
+
+@pytest.mark.search
+def test_search_index_follows_updates(client, test_token, db_session, roster):
+    """Test that updates and deletes reach the index."""
+    roster[2].bio = "Fitness on the road"
+    db_session.delete(roster[0])
+    db_session.commit()
+    assert set(search(client, test_token, "fitness")) == {"cookbook", "travelsasha"}
+    assert search(client, test_token, "trips") == []
+    assert search(client, test_token, "fitmarina") == []
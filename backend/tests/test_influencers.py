@@ -64,3 +64,101 @@ def test_update_nonexistent_influencer(client, test_token):
     assert response.status_code == status.HTTP_404_NOT_FOUND
     assert response.json()["detail"] == "Influencer not found"
 
+
+ROSTER_CSV = """nickname,bio,instagram_handle,instagram_followers,tiktok_handle,tiktok_followers
+Alice,Fitness,@alice,"12,000",alice_tt,5000
+Bob,Food,bob,not-a-number,,
+Carol,Travel,,,carol_tt,700
+Nobody,No handles,,,,
+Alice Again,Updated bio,alice,13000,,
+"""
+
+@pytest.mark.influencers
+def test_import_influencers_csv(client, test_token, test_user, db_session):
+    """Test streaming CSV import with validation errors and upserts by handle."""
+    from models.models import Influencer
+
+    response = client.post(
+        "/api/v1/influencers/import",
+        files={"file": ("roster.csv", ROSTER_CSV.encode(), "text/csv")},
+        headers={"Authorization": f"Bearer {test_token}"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    report = response.json()
+    assert report["processed"] == 5
+    # "Alice Again" merges into Alice within the chunk: one influencer, created once
+    assert report["created"] == 2
+    assert report["updated"] == 0
+    assert report["failed"] == 2
+    assert [e["row"] for e in report["errors"]] == [3, 5]
+    assert "instagram_followers" in report["errors"][0]["detail"]
+
+    alice = db_session.query(Influencer).filter(Influencer.instagram_handle == "alice").one()
+    assert alice.manager_id == test_user.id
+    assert alice.instagram_followers == 13000
+    assert alice.tiktok_handle == "alice_tt"
+
+    # Re-importing updates in place instead of duplicating
+    response = client.post(
+        "/api/v1/influencers/import",
+        files={"file": ("roster.csv", ROSTER_CSV.encode(), "text/csv")},
+        headers={"Authorization": f"Bearer {test_token}"}
+    )
+    assert response.json()["created"] == 0
+    assert db_session.query(Influencer).filter(Influencer.manager_id == test_user.id).count() == 2
+
+@pytest.mark.influencers
+def test_import_influencers_in_chunks(db_session, test_user):
+    """Test that chunked imports upsert across chunk boundaries."""
+    from models.models import Influencer
+    from services.influencer_import import import_influencers
+
+    rows = [(i + 2, {"nickname": f"n{i}", "vk_handle": f"h{i % 7}", "vk_followers": str(i)}) for i in range(30)]
+    report = import_influencers(db_session, iter(rows), manager_id=test_user.id, chunk_size=4)
+    assert report["processed"] == 30
+    assert report["created"] == 7
+    assert db_session.query(Influencer).filter(Influencer.manager_id == test_user.id).count() == 7
+    assert db_session.query(Influencer).filter(Influencer.vk_handle == "h0").one().vk_followers == 28
+
+@pytest.mark.influencers
+def test_import_merges_rows_sharing_any_handle(db_session, test_user):
+    """Test that rows sharing only a second handle merge into one influencer."""
+    from models.models import Influencer
+    from services.influencer_import import import_influencers
+
+    rows = [
+        (2, {"nickname": "Dana", "instagram_handle": "dana", "tiktok_handle": "dana_tt"}),
+        (3, {"nickname": "Dana TT", "youtube_handle": "dana_yt", "tiktok_handle": "dana_tt", "tiktok_followers": "900"}),
+        # Joins the two rows above only through the youtube handle
+        (4, {"nickname": "Dana YT", "vk_handle": "dana_vk", "youtube_handle": "dana_yt"}),
+    ]
+    report = import_influencers(db_session, iter(rows), manager_id=test_user.id)
+    assert report["created"] == 1
+    assert report["updated"] == 0
+
+    dana = db_session.query(Influencer).filter(Influencer.manager_id == test_user.id).one()
+    assert (dana.instagram_handle, dana.tiktok_handle, dana.youtube_handle, dana.vk_handle) == (
+        "dana", "dana_tt", "dana_yt", "dana_vk"
+    )
+    assert dana.tiktok_followers == 900
+
+    # Both rows now match the stored influencer: one update, not two
+    rows = [
+        (2, {"nickname": "Dana", "vk_handle": "dana_vk", "vk_followers": "10"}),
+        (3, {"nickname": "Dana", "tiktok_handle": "dana_tt", "tiktok_followers": "950"}),
+    ]
+    report = import_influencers(db_session, iter(rows), manager_id=test_user.id)
+    assert report["created"] == 0
+    assert report["updated"] == 1
+    db_session.refresh(dana)
+    assert (dana.vk_followers, dana.tiktok_followers) == (10, 950)
+
+@pytest.mark.influencers
+def test_import_influencers_bad_format(client, test_token):
+    """Test that unsupported formats are rejected."""
+    response = client.post(
+        "/api/v1/influencers/import?format=json",
+        files={"file": ("roster.json", b"{}", "application/json")},
+        headers={"Authorization": f"Bearer {test_token}"}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
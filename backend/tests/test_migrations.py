@@ -0,0 +1,133 @@
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from fastapi import status
+
+from db.base import Base
+from db.migrations import upgrade, current_version, head_version
+
+
+@pytest.fixture
+def fresh_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    yield engine
+    engine.dispose()
+
+
+def assert_schema_matches_models(engine):
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        assert inspector.has_table(table.name), table.name
+        columns = {c["name"] for c in inspector.get_columns(table.name)}
+        assert columns == {c.name for c in table.columns}, table.name
+        indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        assert {index.name for index in table.indexes} <= indexes, table.name
+
+
+@pytest.mark.database
+def test_upgrade_fresh_database(fresh_engine):
+    """Test that migrations build the schema the models describe."""
+    assert current_version(fresh_engine) == 0
+    applied = upgrade(fresh_engine)
+    assert len(applied) == head_version()
+    assert current_version(fresh_engine) == head_version()
+    assert_schema_matches_models(fresh_engine)
+
+    # Re-running is a no-op
+    assert upgrade(fresh_engine) == []
+
+
+@pytest.mark.database
+def test_upgrade_database_created_by_create_all(fresh_engine):
+    """Test that a pre-migration database (tables from create_all, no indexes) upgrades."""
+    from db.migrations.v0001_initial import metadata as baseline
+    baseline.create_all(fresh_engine)
+
+    upgrade(fresh_engine)
+    assert current_version(fresh_engine) == head_version()
+    assert_schema_matches_models(fresh_engine)
+
+
+def _search_objects(engine):
+    with engine.connect() as connection:
+        return connection.execute(text(
+            "SELECT type, name, sql FROM sqlite_master WHERE name LIKE 'influencers_fts%' AND sql IS NOT NULL "
+            "ORDER BY name"
+        )).all()
+
+
+@pytest.mark.database
+def test_upgrade_installs_search_like_the_models(fresh_engine, tmp_path):
+    """Test that the search migration creates the same FTS table and triggers as create_all."""
+    upgrade(fresh_engine)
+    created = create_engine(f"sqlite:///{tmp_path / 'create_all.db'}")
+    try:
+        Base.metadata.create_all(created)
+        assert _search_objects(fresh_engine) == _search_objects(created)
+    finally:
+        created.dispose()
+    assert [row.name for row in _search_objects(fresh_engine) if row.type == "trigger"] == [
+        "influencers_fts_delete", "influencers_fts_insert", "influencers_fts_update"
+    ]
+
+
+@pytest.mark.database
+def test_upgrade_backfills_influencer_platforms(fresh_engine):
+    """Test that existing influencers get platform rows and total reach."""
+    from db.migrations.v0001_initial import metadata as baseline
+    baseline.create_all(fresh_engine)
+    with fresh_engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO influencers (id, nickname, tiktok_handle, tiktok_followers, vk_followers) "
+            "VALUES (1, 'old', 'old.tt', 1200, 30)"
+        ))
+
+    upgrade(fresh_engine)
+    with fresh_engine.connect() as connection:
+        rows = connection.execute(text(
+            "SELECT platform, handle, followers FROM influencer_platforms WHERE influencer_id = 1 ORDER BY platform"
+        )).fetchall()
+        reach = connection.execute(text("SELECT total_reach FROM influencers WHERE id = 1")).scalar()
+    assert [tuple(row) for row in rows] == [("tiktok", "old.tt", 1200), ("vk", None, 30)]
+    assert reach == 1230
+
+
+def _query_plans(db_session, statements, table):
+    plans = []
+    for statement, parameters in statements:
+        if not statement.lstrip().upper().startswith("SELECT") or f"FROM {table}" not in statement:
+            continue
+        rows = db_session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+        plans.append([row[-1] for row in rows])
+    assert plans, f"no SELECT on {table} was captured"
+    return plans
+
+
+@pytest.mark.database
+@pytest.mark.parametrize("path, table", [
+    ("/api/v1/projects/", "projects"),
+    ("/api/v1/influencers/", "influencers"),
+    ("/api/v1/influencers/?sort=-total_reach", "influencers"),
+    ("/api/v1/influencers/?platforms=tiktok,youtube&min_followers=1000&max_followers=5000", "influencer_platforms"),
+    ("/api/v1/projects/{project_id}/activities", "activities"),
+    ("/api/v1/projects/0/activities", "activities"),
+    ("/api/v1/projects/{project_id}/activities?cursor={activity_cursor}", "activities"),
+    ("/api/v1/projects/{project_id}/scenarios", "scenarios"),
+    ("/api/v1/projects/{project_id}/publications", "publications"),
+    ("/api/v1/projects/{project_id}/influencers", "project_influencers"),
+])
+def test_list_endpoints_use_indexes(client, test_token, test_project, db_session, captured_queries, path, table):
+    """Test that the main list queries are index searches, not table scans or sorts."""
+    from datetime import datetime
+    from core.pagination import encode_cursor
+
+    response = client.get(
+        path.format(project_id=test_project.id, activity_cursor=encode_cursor([datetime.utcnow(), 10])),
+        headers={"Authorization": f"Bearer {test_token}"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    for plan in _query_plans(db_session, captured_queries, table):
+        for step in plan:
+            if f" {table} " in f" {step} ":
+                assert "INDEX" in step, plan
+            assert "TEMP B-TREE" not in step, plan
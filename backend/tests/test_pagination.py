@@ -0,0 +1,81 @@
+import pytest
+from datetime import datetime, timedelta
+from fastapi import status
+
+from models.models import Activity, Project
+
+
+@pytest.fixture
+def many_activities(db_session, test_project, test_user):
+    # Pairs of activities share a timestamp to exercise the id tie-breaker
+    base = datetime(2024, 1, 1)
+    activities = [
+        Activity(
+            project_id=test_project.id,
+            user_id=test_user.id,
+            activity_type="note",
+            description=f"activity {i}",
+            created_at=base + timedelta(minutes=i // 2),
+        )
+        for i in range(11)
+    ]
+    db_session.add_all(activities)
+    db_session.commit()
+    return activities
+
+
+def _walk(client, url, token, limit):
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(url, params=params, headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == status.HTTP_200_OK
+        seen.extend(item["id"] for item in response.json())
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return seen, pages
+
+
+def test_activity_feed_cursor_pagination(client, test_token, test_project, many_activities):
+    """Test walking the activity feed with cursors returns every row once, newest first."""
+    seen, pages = _walk(client, f"/api/v1/projects/{test_project.id}/activities", test_token, limit=4)
+    expected = [a.id for a in sorted(many_activities, key=lambda a: (a.created_at, a.id), reverse=True)]
+    assert seen == expected
+    assert pages == 3
+
+
+def test_project_list_cursor_pagination(client, test_token, test_user, db_session):
+    """Test cursor pagination on an id-ordered list."""
+    db_session.add_all([Project(title=f"P{i}", client="c", manager_id=test_user.id) for i in range(5)])
+    db_session.commit()
+
+    seen, pages = _walk(client, "/api/v1/projects/", test_token, limit=2)
+    assert seen == sorted(seen)
+    assert len(seen) == len(set(seen)) == 5
+    assert pages == 3
+
+
+def test_skip_limit_still_supported(client, test_token, test_project, many_activities):
+    """Test that offset paging keeps working alongside cursors."""
+    response = client.get(
+        f"/api/v1/projects/{test_project.id}/activities",
+        params={"skip": 2, "limit": 3},
+        headers={"Authorization": f"Bearer {test_token}"}
+    )
+    expected = [a.id for a in sorted(many_activities, key=lambda a: (a.created_at, a.id), reverse=True)]
+    assert [a["id"] for a in response.json()] == expected[2:5]
+    assert response.headers.get("X-Next-Cursor")
+
+
+def test_invalid_cursor(client, test_token, test_project):
+    """Test that a malformed cursor is rejected."""
+    response = client.get(
+        f"/api/v1/projects/{test_project.id}/activities",
+        params={"cursor": "not-a-cursor"},
+        headers={"Authorization": f"Bearer {test_token}"}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["detail"] == "Invalid cursor"
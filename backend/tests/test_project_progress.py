@@ -0,0 +1,102 @@
+from datetime import datetime
+
+import pytest
+from fastapi import status
+from sqlalchemy import update
+
+from models.models import Project, ProjectInfluencer, ProjectStageProgress
+from services.project_progress import reconcile
+
+
+def _progress(client, token, project_id):
+    response = client.get("/api/v1/projects/", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == status.HTTP_200_OK
+    return next(p for p in response.json() if p["id"] == project_id)["progress"]
+
+
+@pytest.mark.progress
+def test_progress_follows_status_changes(client, test_token, db_session, test_project, test_user_influencer):
+    """Test that counters move with every assignment insert, status change and delete."""
+    first = ProjectInfluencer(project_id=test_project.id, influencer_id=test_user_influencer.id,
+                              scenario_status="in_review")
+    second = ProjectInfluencer(project_id=test_project.id, influencer_id=test_user_influencer.id)
+    db_session.add_all([first, second])
+    db_session.commit()
+    progress = _progress(client, test_token, test_project.id)
+    assert progress["scenario"] == {"total": 2, "submitted": 1, "approved": 0, "completed": 0}
+
+    # Loaded, then changed: applied as a delta
+    db_session.refresh(first)
+    first.scenario_status = "approved"
+    first.scenario_completed_at = datetime.utcnow()
+    # Expired, then overwritten: the project is recounted
+    second.material_status = "in_review"
+    db_session.commit()
+    progress = _progress(client, test_token, test_project.id)
+    assert progress["scenario"] == {"total": 2, "submitted": 1, "approved": 1, "completed": 1}
+    assert progress["material"] == {"total": 2, "submitted": 1, "approved": 0, "completed": 0}
+
+    db_session.delete(second)
+    db_session.commit()
+    progress = _progress(client, test_token, test_project.id)
+    assert progress["material"] == {"total": 1, "submitted": 0, "approved": 0, "completed": 0}
+
+
+@pytest.mark.progress
+def test_progress_counts_bulk_assignments(client, test_token, test_project, test_user_influencer):
+    """Test that assignments inserted by the bulk endpoint are counted."""
+    headers = {"Authorization": f"Bearer {test_token}"}
+    client.post(
+        f"/api/v1/projects/{test_project.id}/influencers/bulk",
+        json=[
+            {"project_id": test_project.id, "influencer_id": test_user_influencer.id, "publication_status": "published"},
+            {"project_id": test_project.id, "influencer_id": test_user_influencer.id},
+        ],
+        headers=headers
+    )
+    progress = client.get(f"/api/v1/projects/{test_project.id}", headers=headers).json()["progress"]
+    assert progress["publication"] == {"total": 2, "submitted": 1, "approved": 1, "completed": 0}
+
+
+@pytest.mark.progress
+def test_project_list_reads_progress_in_one_statement(client, test_token, test_project, captured_queries):
+    """Test that projects and their counters come back from a single SELECT."""
+    headers = {"Authorization": f"Bearer {test_token}"}
+    client.get("/api/v1/projects/", headers=headers)
+    captured_queries.clear()
+    client.get("/api/v1/projects/", headers=headers)
+    selects = [s for s, _ in captured_queries if "FROM projects" in s]
+    assert len(selects) == 1
+    assert "project_stage_progress" in selects[0]
+    assert not [s for s, _ in captured_queries if "FROM project_influencers" in s]
+
+
+@pytest.mark.progress
+def test_reconcile_repairs_drift(client, test_token, db_session, test_project, test_user_influencer):
+    """Test that reconciliation rewrites counters changed behind the ORM's back."""
+    db_session.add(ProjectInfluencer(project_id=test_project.id, influencer_id=test_user_influencer.id,
+                                     scenario_status="approved"))
+    db_session.commit()
+    db_session.execute(update(ProjectStageProgress).values(total=99))
+    db_session.commit()
+
+    assert reconcile(db_session) == 3
+    assert reconcile(db_session) == 0
+    progress = _progress(client, test_token, test_project.id)
+    assert progress["scenario"] == {"total": 1, "submitted": 1, "approved": 1, "completed": 0}
+
+
+@pytest.mark.progress
+def test_delete_project_with_foreign_keys(fk_session):
+    """Test that counter rows go before the project, so enforced foreign keys hold."""
+    project = Project(title="Gone")
+    fk_session.add(project)
+    fk_session.commit()
+    project_id = project.id
+    counters = lambda: fk_session.query(ProjectStageProgress).filter_by(project_id=project_id).count()
+    assert counters() == 3
+
+    fk_session.delete(project)
+    fk_session.commit()
+    assert counters() == 0
+    assert fk_session.get(Project, project_id) is None
@@ -1,5 +1,6 @@
 import pytest
 from fastapi import status
+from models.models import Activity, Comment, ProjectInfluencer
 
 def test_create_project(client, test_token, test_user):
     """Test project creation."""
@@ -132,4 +133,70 @@ def test_delete_nonexistent_project(client, test_token):
         headers={"Authorization": f"Bearer {test_token}"}
     )
     assert response.status_code == status.HTTP_404_NOT_FOUND
-    assert response.json()["detail"] == "Project not found" 
\ No newline at end of file
+    assert response.json()["detail"] == "Project not found" 
+def test_create_project_influencers_bulk(client, test_token, test_project, test_user_influencer):
+    """Test adding several influencers to a project in one request."""
+    payload = [
+        {"project_id": test_project.id, "influencer_id": test_user_influencer.id, "scenario_status": "pending"},
+        {"project_id": test_project.id, "influencer_id": 999},
+        {"project_id": test_project.id + 1, "influencer_id": test_user_influencer.id},
+    ]
+    response = client.post(
+        f"/api/v1/projects/{test_project.id}/influencers/bulk",
+        json=payload,
+        headers={"Authorization": f"Bearer {test_token}"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["created"] == 1
+    assert [r["status"] for r in data["results"]] == ["created", "error", "error"]
+    assert data["results"][2]["detail"] == "project_id does not match the URL"
+
+    activities = client.get(
+        f"/api/v1/projects/{test_project.id}/activities",
+        headers={"Authorization": f"Bearer {test_token}"}
+    ).json()
+    assert [a["activity_type"] for a in activities] == ["influencer_added"]
+
+
+def test_read_project_overview(client, test_token, db_session, test_project, test_user, test_scenario,
+                               test_publication, test_user_influencer, captured_queries):
+    """Test loading the project page in one request with a fixed number of statements."""
+    db_session.add(ProjectInfluencer(project_id=test_project.id, influencer_id=test_user_influencer.id))
+    db_session.add(Comment(project_id=test_project.id, user_id=test_user.id, content="Looks good"))
+    for i in range(3):
+        db_session.add(Activity(project_id=test_project.id, user_id=test_user.id,
+                                activity_type="note", description=f"note {i}"))
+    db_session.commit()
+    url = f"/api/v1/projects/{test_project.id}/overview?activity_limit=2"
+    captured_queries.clear()
+
+    response = client.get(url, headers={"Authorization": f"Bearer {test_token}"})
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["project"]["id"] == test_project.id
+    assert [s["id"] for s in data["scenarios"]] == [test_scenario.id]
+    assert [p["id"] for p in data["publications"]] == [test_publication.id]
+    assert data["materials"] == []
+    assert data["influencers"][0]["influencer"]["id"] == test_user_influencer.id
+    assert len(data["activities"]) == 2
+    assert data["comments"][0]["user"]["id"] == test_user.id
+    # Authentication, the project, one statement per section and the activities' users
+    assert len(captured_queries) <= 9
+
+
+def test_read_project_overview_sections(client, test_token, test_project, captured_queries):
+    """Test that only the requested sections are loaded."""
+    headers = {"Authorization": f"Bearer {test_token}"}
+    captured_queries.clear()
+    response = client.get(f"/api/v1/projects/{test_project.id}/overview?sections=scenarios", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["scenarios"] == []
+    assert data["comments"] is None and data["activities"] is None
+    assert len(captured_queries) <= 3
+
+    response = client.get(f"/api/v1/projects/{test_project.id}/overview?sections=budget", headers=headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = client.get("/api/v1/projects/999/overview", headers=headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
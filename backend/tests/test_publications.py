@@ -130,4 +130,30 @@ def test_delete_nonexistent_publication(client, test_token):
         headers={"Authorization": f"Bearer {test_token}"}
     )
     assert response.status_code == status.HTTP_404_NOT_FOUND
-    assert response.json()["detail"] == "Publication not found" 
\ No newline at end of file
+    assert response.json()["detail"] == "Publication not found" 
+@pytest.mark.publications
+def test_create_publications_bulk(client, test_token, test_project, test_user_influencer):
+    """Test bulk publication creation."""
+    payload = [
+        {
+            "project_id": test_project.id,
+            "influencer_id": test_user_influencer.id,
+            "platform": "instagram",
+            "published_at": "2024-01-01T00:00:00",
+        }
+        for _ in range(3)
+    ]
+    response = client.post("/api/v1/publications/bulk", json=payload, headers={"Authorization": f"Bearer {test_token}"})
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["created"] == 3
+    assert len({r["id"] for r in data["results"]}) == 3
+
+@pytest.mark.publications
+def test_create_publications_bulk_too_large(client, test_token, monkeypatch):
+    """Test that oversized batches are refused."""
+    from core.config import settings
+    monkeypatch.setattr(settings, "BULK_MAX_ITEMS", 2)
+    payload = [{"project_id": 1, "influencer_id": 1, "platform": "vk", "published_at": "2024-01-01T00:00:00"}] * 3
+    response = client.post("/api/v1/publications/bulk", json=payload, headers={"Authorization": f"Bearer {test_token}"})
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
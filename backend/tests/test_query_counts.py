@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from models.models import Activity, Comment, Influencer, Material, ProjectInfluencer, Publication, Scenario, User
+
+
+@pytest.fixture(scope="function")
+def seed_rows(db_session, test_project):
+    created = 0
+    project_id, manager_id = test_project.id, test_project.manager_id
+
+    def seed(count):
+        # Every row gets its own user and influencer, so an N+1 cannot hide behind the identity map
+        nonlocal created
+        start = datetime(2024, 1, 1)
+        for i in range(created, created + count):
+            user = User(username=f"crowd{i}", name=f"Crowd {i}", role="manager")
+            influencer = Influencer(nickname=f"crowd{i}", manager_id=manager_id)
+            db_session.add_all([user, influencer])
+            db_session.flush()
+            db_session.add_all([
+                Comment(project_id=project_id, user_id=user.id, content=f"comment {i}",
+                        created_at=start + timedelta(minutes=i)),
+                Activity(project_id=project_id, user_id=user.id, activity_type="note",
+                         description=f"note {i}", created_at=start + timedelta(minutes=i)),
+                Scenario(project_id=project_id, influencer_id=influencer.id, content=f"scenario {i}",
+                         status="pending"),
+                Material(project_id=project_id, influencer_id=influencer.id, material_url=f"m{i}",
+                         status="pending"),
+                Publication(project_id=project_id, influencer_id=influencer.id, platform="instagram",
+                            status="pending", published_at=start),
+                ProjectInfluencer(project_id=project_id, influencer_id=influencer.id),
+            ])
+        db_session.commit()
+        created += count
+
+    return seed
+
+
+@pytest.mark.database
+@pytest.mark.parametrize("path", [
+    "/api/v1/comments/",
+    "/api/v1/scenarios/",
+    "/api/v1/materials/",
+    "/api/v1/publications/",
+    "/api/v1/projects/{project_id}/comments",
+    "/api/v1/projects/{project_id}/activities?limit=50",
+    "/api/v1/projects/0/activities?limit=50",
+    # skip bypasses the in-memory feed
+    "/api/v1/projects/0/activities?limit=50&skip=1",
+    "/api/v1/projects/{project_id}/scenarios",
+    "/api/v1/projects/{project_id}/publications",
+    "/api/v1/projects/{project_id}/influencers",
+    "/api/v1/projects/{project_id}/overview?activity_limit=50",
+])
+def test_list_endpoints_run_constant_queries(count_statements, seed_rows, test_project, test_token, path):
+    """Test that list endpoints issue the same number of statements for 2 rows as for 12."""
+    headers = {"Authorization": f"Bearer {test_token}"}
+    path = path.format(project_id=test_project.id)
+    seed_rows(2)
+    few = count_statements(path, headers)
+    seed_rows(10)
+    many = count_statements(path, headers)
+    assert many == few
+
+
+@pytest.mark.database
+def test_feed_pages_have_users_from_memory_and_database(client, seed_rows, test_token):
+    """Test that buffered and database feed pages both nest the activity's user."""
+    headers = {"Authorization": f"Bearer {test_token}"}
+    seed_rows(3)
+    # The second read is served from the warm buffer
+    for _ in range(2):
+        feed = client.get("/api/v1/projects/0/activities?limit=50", headers=headers).json()
+        assert {entry["user"]["username"] for entry in feed} == {"crowd0", "crowd1", "crowd2"}
+    fallback = client.get("/api/v1/projects/0/activities?limit=50&skip=1", headers=headers).json()
+    assert all(entry["user"] is not None for entry in fallback)
@@ -0,0 +1,86 @@
+import pytest
+from fastapi import status
+
+from core.metrics import metrics
+from models.models import Influencer, Project, ProjectInfluencer
+from services.influencer_import import import_influencers
+
+
+@pytest.fixture(scope="function")
+def staffing(db_session, test_user):
+    project = Project(title="Launch", client="Client", manager_id=test_user.id, platforms=["tiktok", "youtube"])
+    busy_project = Project(title="Running", client="Client", manager_id=test_user.id, status="active")
+    done_project = Project(title="Done", client="Client", manager_id=test_user.id, status="completed")
+    roster = {
+        "big": Influencer(nickname="big", tiktok_followers=1_000_000, manager_id=test_user.id),
+        "mid": Influencer(nickname="mid", youtube_followers=100_000, manager_id=test_user.id),
+        "small": Influencer(nickname="small", tiktok_followers=10_000, manager_id=test_user.id),
+        "insta": Influencer(nickname="insta", instagram_followers=5_000_000, manager_id=test_user.id),
+        "assigned": Influencer(nickname="assigned", tiktok_followers=2_000_000, manager_id=test_user.id),
+        "foreign": Influencer(nickname="foreign", tiktok_followers=9_000_000, manager_id=test_user.id + 100),
+    }
+    db_session.add_all([project, busy_project, done_project, *roster.values()])
+    db_session.flush()
+    db_session.add_all([
+        ProjectInfluencer(project_id=project.id, influencer_id=roster["assigned"].id),
+        # Finished work does not count as load
+        ProjectInfluencer(project_id=done_project.id, influencer_id=roster["mid"].id),
+    ])
+    db_session.commit()
+    return project, busy_project, roster
+
+
+def _recommend(client, token, project_id, **params):
+    response = client.get(f"/api/v1/projects/{project_id}/recommendations", params=params,
+                          headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()
+
+
+@pytest.mark.recommendations
+def test_recommendations_rank_by_reach_on_project_platforms(client, test_token, staffing):
+    """Test that recommendations skip assigned, off-platform and foreign influencers and rank by reach."""
+    project, _, _ = staffing
+    data = _recommend(client, test_token, project.id)
+    assert [row["influencer"]["nickname"] for row in data] == ["big", "mid", "small"]
+    assert data[1]["reach"] == 100_000
+    assert data[1]["active_assignments"] == 0
+    assert [row["influencer"]["nickname"] for row in _recommend(client, test_token, project.id, limit=2)] == ["big", "mid"]
+    target = _recommend(client, test_token, project.id, target_followers=12_000)
+    assert [row["influencer"]["nickname"] for row in target] == ["small", "mid", "big"]
+
+
+@pytest.mark.recommendations
+def test_recommendations_follow_writes(client, test_token, db_session, test_user, staffing):
+    """Test that the cached feature matrix picks up commits and bulk imports."""
+    project, busy_project, roster = staffing
+    nicknames = lambda: [row["influencer"]["nickname"] for row in _recommend(client, test_token, project.id)]
+    misses = metrics.counter("recommendations.matrix.misses")
+    assert nicknames() == ["big", "mid", "small"]
+
+    # Concurrent assignments push an influencer down
+    db_session.add_all([
+        ProjectInfluencer(project_id=busy_project.id, influencer_id=roster["big"].id) for _ in range(6)
+    ])
+    roster["small"].tiktok_followers = 500_000
+    db_session.delete(roster["mid"])
+    db_session.add(Influencer(nickname="new", youtube_followers=50_000, manager_id=test_user.id))
+    db_session.commit()
+    assert nicknames() == ["small", "new", "big"]
+
+    busy_project.status = "completed"
+    db_session.commit()
+    assert nicknames() == ["big", "small", "new"]
+
+    import_influencers(db_session, iter([(2, {"nickname": "imported", "tiktok_handle": "imp",
+                                              "tiktok_followers": "3000000"})]), manager_id=test_user.id)
+    assert nicknames()[0] == "imported"
+    # Loaded once, then patched row by row
+    assert metrics.counter("recommendations.matrix.misses") == misses + 1
+
+
+@pytest.mark.recommendations
+def test_recommendations_for_missing_project(client, test_token):
+    """Test that recommendations for an unknown project return 404."""
+    response = client.get("/api/v1/projects/999/recommendations", headers={"Authorization": f"Bearer {test_token}"})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
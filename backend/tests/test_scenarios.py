@@ -144,4 +144,30 @@ def test_read_project_scenarios_nonexistent_project(client, test_token):
         headers={"Authorization": f"Bearer {test_token}"}
     )
     assert response.status_code == status.HTTP_404_NOT_FOUND
-    assert response.json()["detail"] == "Project not found" 
\ No newline at end of file
+    assert response.json()["detail"] == "Project not found" 
+@pytest.mark.scenarios
+def test_create_scenarios_bulk(client, test_token, test_project, test_user_influencer, captured_queries):
+    """Test bulk scenario creation with per-item results."""
+    payload = [
+        {"project_id": test_project.id, "influencer_id": test_user_influencer.id, "content": f"Scenario {i}"}
+        for i in range(20)
+    ]
+    payload.insert(3, {"project_id": 999, "influencer_id": test_user_influencer.id, "content": "Bad project"})
+    payload.insert(5, {"project_id": test_project.id, "influencer_id": 999, "content": "Bad influencer"})
+
+    response = client.post("/api/v1/scenarios/bulk", json=payload, headers={"Authorization": f"Bearer {test_token}"})
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["created"] == 20
+    assert data["failed"] == 2
+    assert [r["index"] for r in data["results"]] == list(range(22))
+    assert data["results"][3] == {"index": 3, "status": "error", "id": None, "detail": "Project not found"}
+    assert data["results"][5]["detail"] == "Influencer not found"
+
+    # Two reference checks and one INSERT no matter how many items
+    inserts = [s for s, _ in captured_queries if s.startswith("INSERT INTO scenarios")]
+    assert len(inserts) == 1
+
+    created_id = data["results"][0]["id"]
+    response = client.get(f"/api/v1/scenarios/{created_id}", headers={"Authorization": f"Bearer {test_token}"})
+    assert response.json()["content"] == "Scenario 0"
@@ -45,4 +45,125 @@ def test_token_authentication(client, test_token):
         "/api/v1/projects/",
         headers={"Authorization": "Bearer invalid_token"}
     )
-    assert response.status_code == status.HTTP_401_UNAUTHORIZED 
\ No newline at end of file
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED 
+
+@pytest.mark.security
+def test_principal_cache_hit_skips_database(client, test_token, test_user, db_session):
+    """Test that a cached principal is served without reloading the user."""
+    from core.security import principal_cache, Principal
+
+    client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {test_token}"})
+    cached = principal_cache.get(test_user.username)
+    assert isinstance(cached, Principal)
+    assert cached.id == test_user.id
+
+    # Swap the cached record; the endpoint must return it instead of the row
+    principal_cache.set(test_user.username, Principal(
+        id=cached.id, username=cached.username, role=cached.role,
+        name="From Cache", created_at=cached.created_at
+    ))
+    response = client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {test_token}"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["name"] == "From Cache"
+
+@pytest.mark.security
+def test_principal_cache_invalidated_on_update(client, test_token, test_user, db_session):
+    """Test that updating a user evicts its cached principal."""
+    from core.security import principal_cache
+
+    client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {test_token}"})
+    assert principal_cache.get(test_user.username) is not None
+
+    test_user.name = "Renamed"
+    db_session.commit()
+    assert principal_cache.get(test_user.username) is None
+
+    response = client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {test_token}"})
+    assert response.json()["name"] == "Renamed"
+
+@pytest.mark.security
+def test_principal_cache_invalidated_on_delete(client, test_token, test_user, db_session):
+    """Test that a deleted user can no longer authenticate with a cached principal."""
+    from core.security import principal_cache
+
+    client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {test_token}"})
+    db_session.delete(test_user)
+    db_session.commit()
+    assert principal_cache.get("testuser") is None
+
+    response = client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {test_token}"})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+@pytest.mark.security
+def test_password_hasher_rejects_when_queue_full():
+    """Test that the hashing pool sheds load with 503 and Retry-After once full."""
+    import asyncio
+    import threading
+    from fastapi import HTTPException
+    from core.security import PasswordHasher
+
+    hasher = PasswordHasher(workers=1, max_queue=0, retry_after=3)
+    release = threading.Event()
+
+    async def scenario():
+        busy = asyncio.ensure_future(hasher.run(release.wait))
+        await asyncio.sleep(0.05)
+        try:
+            with pytest.raises(HTTPException) as exc_info:
+                await hasher.run(get_password_hash, "password")
+        finally:
+            release.set()
+            await busy
+        return exc_info.value
+
+    error = asyncio.run(scenario())
+    assert error.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert error.headers["Retry-After"] == "3"
+
+@pytest.mark.security
+def test_login_records_hash_metrics(client, test_user):
+    """Test that login goes through the hashing pool and reports its timings."""
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": "testuser", "password": "password"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    token = response.json()["access_token"]
+
+    summaries = client.get(
+        "/api/v1/metrics/", headers={"Authorization": f"Bearer {token}"}
+    ).json()["summaries"]
+    assert summaries["password_hash.latency_seconds"]["count"] >= 1
+    assert "password_hash.queue_wait_seconds" in summaries
+
+@pytest.mark.security
+def test_metrics_require_manager(client, test_user_influencer):
+    """Test that internal counters are not served to anonymous or influencer accounts."""
+    response = client.get("/api/v1/metrics/")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": "testinfluencer", "password": "password"}
+    )
+    token = response.json()["access_token"]
+    response = client.get("/api/v1/metrics/", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+@pytest.mark.security
+def test_token_denylist():
+    """Test bloom-backed revocation lookups."""
+    import time
+    from core.denylist import TokenDenylist
+
+    denylist = TokenDenylist(capacity=100)
+    assert not denylist.is_revoked("a")
+    denylist.revoke("a", time.time() + 60)
+    denylist.revoke("expired", time.time() - 1)
+    assert denylist.is_revoked("a")
+    assert not denylist.is_revoked("expired")
+    assert not any(denylist.is_revoked(f"other-{i}") for i in range(1000))
+
+    denylist.purge()
+    assert len(denylist) == 1
+    assert denylist.is_revoked("a")
@@ -0,0 +1,44 @@
+import pytest
+from sqlalchemy import create_engine
+
+import main
+from core.config import settings
+from db.migrations import head_version
+
+
+@pytest.fixture
+def empty_engine(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'startup.db'}")
+    monkeypatch.setattr(main, "engine", engine)
+    yield engine
+    engine.dispose()
+
+
+def test_verify_fails_on_outdated_schema(empty_engine, monkeypatch):
+    """Test that startup refuses to serve from a database that was not migrated."""
+    monkeypatch.setattr(settings, "SCHEMA_CHECK", "verify")
+    with pytest.raises(RuntimeError, match="python -m db.migrations upgrade"):
+        main.check_schema()
+
+
+def test_upgrade_mode_migrates(empty_engine, monkeypatch):
+    """Test that SCHEMA_CHECK=upgrade brings the schema to head on startup."""
+    monkeypatch.setattr(settings, "SCHEMA_CHECK", "upgrade")
+    assert main.check_schema() == head_version()
+
+    monkeypatch.setattr(settings, "SCHEMA_CHECK", "verify")
+    assert main.check_schema() == head_version()
+
+
+def test_startup_report(client):
+    """Test that the lifespan hook records per-phase startup timings."""
+    response = client.get("/health")
+    assert response.status_code == 200
+    report = response.json()["startup"]
+    assert {"imports", "schema_check", "routers", "total"} <= set(report)
+    # The total covers this lifespan only, not the time since the module was imported
+    assert report["total"] <= report["schema_check"] + report["routers"] + 0.05
+
+    # Routers are only mounted once even though every test client re-runs the lifespan
+    routes = [(route.path, tuple(sorted(getattr(route, "methods", None) or ()))) for route in main.app.routes]
+    assert len(routes) == len(set(routes))
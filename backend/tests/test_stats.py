@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import status
+
+from models.models import Project, ProjectInfluencer
+
+
+@pytest.fixture(scope="function")
+def dashboard(db_session, test_project, test_user, test_user_influencer):
+    past = datetime.utcnow() - timedelta(days=1)
+    finished = Project(title="Finished", client="Client", manager_id=test_user.id, status="completed",
+                       workflow_stage="publication", scenario_deadline=past)
+    other = Project(title="Someone else's", client="Client", manager_id=test_user.id + 100, status="active")
+    db_session.add_all([finished, other])
+    db_session.flush()
+    test_project.scenario_deadline = past
+    db_session.add_all([
+        ProjectInfluencer(project_id=test_project.id, influencer_id=test_user_influencer.id,
+                          scenario_status="in_review"),
+        ProjectInfluencer(project_id=test_project.id, influencer_id=test_user_influencer.id,
+                          scenario_status="approved", material_status="in_review"),
+        # Past its deadline too, but the project is completed
+        ProjectInfluencer(project_id=finished.id, influencer_id=test_user_influencer.id,
+                          scenario_status="pending"),
+        ProjectInfluencer(project_id=other.id, influencer_id=test_user_influencer.id,
+                          scenario_status="in_review"),
+    ])
+    db_session.commit()
+    return finished
+
+
+@pytest.mark.stats
+def test_read_stats(client, test_token, dashboard):
+    """Test that dashboard statistics count only the manager's own projects."""
+    response = client.get("/api/v1/stats/", headers={"Authorization": f"Bearer {test_token}"})
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["projects_total"] == 2
+    assert data["projects_by_status"] == {"draft": 0, "active": 1, "completed": 1}
+    assert data["projects_by_stage"] == {"scenario": 1, "material": 0, "publication": 1}
+    assert data["influencer_statuses"]["scenario"] == {"in_review": 1, "approved": 1, "pending": 1}
+    assert data["pending_reviews"] == {"scenario": 1, "material": 1, "publication": 0}
+    assert data["overdue"] == {"scenario": 1, "material": 0, "publication": 0}
+    assert data["influencers_count"] == 1
+
+
+@pytest.mark.stats
+def test_stats_cached_until_a_write(client, test_token, test_project, dashboard, captured_queries):
+    """Test that repeated reads are served from cache and a project update evicts it."""
+    headers = {"Authorization": f"Bearer {test_token}"}
+    client.get("/api/v1/stats/", headers=headers)
+    captured_queries.clear()
+    client.get("/api/v1/stats/", headers=headers)
+    assert not [s for s, _ in captured_queries if "GROUP BY" in s]
+
+    client.patch(
+        f"/api/v1/projects/{test_project.id}/workflow-stage",
+        json={"workflow_stage": "material"},
+        headers=headers
+    )
+    data = client.get("/api/v1/stats/", headers=headers).json()
+    assert data["projects_by_stage"] == {"scenario": 0, "material": 1, "publication": 1}
+
+
+@pytest.mark.stats
+def test_stats_evicted_by_bulk_assignments(client, test_token, test_project, test_user_influencer, dashboard):
+    """Test that Core bulk inserts of assignments also refresh the statistics."""
+    headers = {"Authorization": f"Bearer {test_token}"}
+    before = client.get("/api/v1/stats/", headers=headers).json()
+    client.post(
+        f"/api/v1/projects/{test_project.id}/influencers/bulk",
+        json=[{"project_id": test_project.id, "influencer_id": test_user_influencer.id, "scenario_status": "in_review"}],
+        headers=headers
+    )
+    after = client.get("/api/v1/stats/", headers=headers).json()
+    assert after["pending_reviews"]["scenario"] == before["pending_reviews"]["scenario"] + 1
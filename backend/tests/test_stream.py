@@ -0,0 +1,204 @@
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+from fastapi import status
+
+from db.session import SessionLocal
+from models.models import Activity, Comment
+from services import stream as stream_module
+from services.stream import StreamCursor, event_stream, project_events
+
+
+def _parse(chunk):
+    fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+    return fields["id"], fields["event"], json.loads(fields["data"])
+
+
+async def _not_disconnected():
+    return False
+
+
+def _add_activity(db_session, project, user, description):
+    activity = Activity(project_id=project.id, user_id=user.id, activity_type="note",
+                        description=description, created_at=datetime.utcnow())
+    db_session.add(activity)
+    db_session.commit()
+    return activity
+
+
+@pytest.mark.stream
+def test_stream_pushes_committed_events(db_session, test_project, test_user):
+    """Test that activities and comments are pushed after commit, with resumable ids."""
+    async def run():
+        stream = event_stream(SessionLocal, test_project.id, None, _not_disconnected, heartbeat=5)
+        assert (await stream.__anext__()).startswith("retry:")
+
+        activity = _add_activity(db_session, test_project, test_user, "pushed")
+        first = _parse(await asyncio.wait_for(stream.__anext__(), 5))
+
+        db_session.add(Comment(project_id=test_project.id, user_id=test_user.id, content="hello"))
+        db_session.commit()
+        second = _parse(await asyncio.wait_for(stream.__anext__(), 5))
+        await stream.aclose()
+        return activity.id, first, second
+
+    activity_id, first, second = asyncio.run(run())
+    assert first[:2] == (f"{activity_id}-0", "activity")
+    assert first[2]["description"] == "pushed"
+    assert second[1] == "comment"
+    assert second[2]["content"] == "hello"
+    assert second[0] == f"{activity_id}-{second[2]['id']}"
+    assert project_events.connections == 0
+
+
+@pytest.mark.stream
+def test_stream_resumes_from_last_event_id(db_session, test_project, test_user):
+    """Test that a reconnect replays only what was committed after Last-Event-ID."""
+    seen = _add_activity(db_session, test_project, test_user, "seen")
+    _add_activity(db_session, test_project, test_user, "missed")
+
+    async def run():
+        stream = event_stream(SessionLocal, test_project.id, StreamCursor.parse(f"{seen.id}-0"), _not_disconnected)
+        chunks = [await stream.__anext__() for _ in range(2)]
+        await stream.aclose()
+        return chunks
+
+    retry, replayed = asyncio.run(run())
+    assert _parse(replayed)[2]["description"] == "missed"
+
+
+@pytest.mark.stream
+def test_slow_stream_resyncs_from_database(db_session, test_project, test_user, monkeypatch):
+    """Test that a subscriber whose queue overflows is caught up without duplicates."""
+    monkeypatch.setattr(project_events, "queue_size", 2)
+
+    async def run():
+        stream = event_stream(SessionLocal, test_project.id, None, _not_disconnected, heartbeat=5)
+        await stream.__anext__()
+        for i in range(5):
+            _add_activity(db_session, test_project, test_user, f"burst {i}")
+        # Let the loop deliver the queued offers
+        await asyncio.sleep(0)
+        chunks = [await asyncio.wait_for(stream.__anext__(), 5) for _ in range(5)]
+        await stream.aclose()
+        return chunks
+
+    chunks = asyncio.run(run())
+    assert [_parse(chunk)[2]["description"] for chunk in chunks] == [f"burst {i}" for i in range(5)]
+
+
+@pytest.mark.stream
+def test_stream_heartbeat(test_project):
+    """Test that idle streams send heartbeat comments."""
+    async def run():
+        stream = event_stream(SessionLocal, test_project.id, StreamCursor(), _not_disconnected, heartbeat=0.01)
+        chunks = [await stream.__anext__() for _ in range(2)]
+        await stream.aclose()
+        return chunks
+
+    assert asyncio.run(run())[1] == ": heartbeat\n\n"
+
+
+@pytest.mark.stream
+def test_stream_slot_taken_only_while_body_runs(test_project):
+    """Test that a stream whose body never starts does not hold a connection slot."""
+    async def run():
+        unread = event_stream(SessionLocal, test_project.id, StreamCursor(), _not_disconnected)
+        idle = project_events.connections
+        stream = event_stream(SessionLocal, test_project.id, StreamCursor(), _not_disconnected)
+        await stream.__anext__()
+        open_ = project_events.connections
+        await stream.aclose()
+        await unread.aclose()
+        return idle, open_
+
+    assert asyncio.run(run()) == (0, 1)
+    assert project_events.connections == 0
+
+
+@pytest.mark.stream
+def test_streams_share_one_poll_per_project(db_session, test_project, test_user, monkeypatch):
+    """Test that events from other workers reach every stream through a single poller."""
+    polls = []
+    load_events = stream_module.load_events
+
+    def counting_load_events(db, project_id, after, limit):
+        polls.append(project_id)
+        return load_events(db, project_id, after, limit)
+
+    monkeypatch.setattr(stream_module, "load_events", counting_load_events)
+    monkeypatch.setattr(project_events, "poll_interval", 0.05)
+
+    async def run():
+        streams = [event_stream(SessionLocal, test_project.id, None, _not_disconnected, heartbeat=5)
+                   for _ in range(3)]
+        for stream in streams:
+            await stream.__anext__()
+        # A Core insert is not published in this worker, as if another worker committed it
+        db_session.execute(Activity.__table__.insert().values(
+            project_id=test_project.id, user_id=test_user.id, activity_type="note",
+            description="from elsewhere", created_at=datetime.utcnow()
+        ))
+        db_session.commit()
+        chunks = [await asyncio.wait_for(stream.__anext__(), 5) for stream in streams]
+        for stream in streams:
+            await stream.aclose()
+        return chunks
+
+    chunks = asyncio.run(run())
+    assert [_parse(chunk)[2]["description"] for chunk in chunks] == ["from elsewhere"] * 3
+    # One poller for the project, not one query per stream and heartbeat
+    assert 1 <= len(polls) <= 3
+    assert project_events.connections == 0
+
+
+@pytest.mark.stream
+def test_stream_connection_limit(client, test_token, test_project, monkeypatch):
+    """Test that streams beyond the per-worker limit are refused; query tokens are accepted."""
+    monkeypatch.setattr(project_events, "max_connections", 0)
+    response = client.get(f"/api/v1/projects/{test_project.id}/stream?access_token={test_token}")
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert "retry-after" in response.headers
+
+
+@pytest.mark.stream
+def test_stream_requires_auth_and_project(client, test_token):
+    """Test that unknown projects and missing tokens are rejected before streaming."""
+    assert client.get("/api/v1/projects/1/stream").status_code == status.HTTP_401_UNAUTHORIZED
+    response = client.get(f"/api/v1/projects/999/stream?access_token={test_token}")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.stream
+def test_poller_survives_database_errors(db_session, test_project, test_user, monkeypatch):
+    """Test that a failed poll is retried instead of ending the project's poller."""
+    failures = []
+    load_events = stream_module.load_events
+
+    def flaky_load_events(db, project_id, after, limit):
+        if not failures:
+            failures.append(project_id)
+            raise RuntimeError("database went away")
+        return load_events(db, project_id, after, limit)
+
+    monkeypatch.setattr(stream_module, "load_events", flaky_load_events)
+    monkeypatch.setattr(project_events, "poll_interval", 0.05)
+
+    async def run():
+        stream = event_stream(SessionLocal, test_project.id, None, _not_disconnected, heartbeat=5)
+        await stream.__anext__()
+        db_session.execute(Activity.__table__.insert().values(
+            project_id=test_project.id, user_id=test_user.id, activity_type="note",
+            description="after the outage", created_at=datetime.utcnow()
+        ))
+        db_session.commit()
+        chunk = await asyncio.wait_for(stream.__anext__(), 5)
+        await stream.aclose()
+        return chunk
+
+    chunk = asyncio.run(run())
+    assert failures == [test_project.id]
+    assert _parse(chunk)[2]["description"] == "after the outage"
+    assert project_events.connections == 0
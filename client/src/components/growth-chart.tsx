@@ -0,0 +1,73 @@
+import { useState } from "react";
+import { useQuery } from "@tanstack/react-query";
+import { useTranslation } from "react-i18next";
+import { Area, ComposedChart, Line, XAxis, YAxis } from "recharts";
+import { format } from "date-fns";
+import { ChartConfig, ChartContainer, ChartTooltip, ChartTooltipContent } from "@/components/ui/chart";
+import { Skeleton } from "@/components/ui/skeleton";
+import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@/components/ui/select";
+import { influencers as influencersApi } from "@/lib/api";
+import { Influencer, InfluencerPlatform } from "@/lib/types";
+
+const PLATFORMS: InfluencerPlatform[] = ["instagram", "tiktok", "youtube", "telegram", "vk"];
+
+const chartConfig = {
+  range: { label: "Min – max", color: "hsl(var(--chart-2))" },
+  last: { label: "Followers", color: "hsl(var(--chart-1))" },
+} satisfies ChartConfig;
+
+interface GrowthChartProps {
+  influencer: Influencer;
+  points?: number;
+}
+
+export function GrowthChart({ influencer, points = 60 }: GrowthChartProps) {
+  const { t } = useTranslation();
+  const available = PLATFORMS.filter((platform) => influencer[`${platform}_handle` as const]);
+  const [platform, setPlatform] = useState<InfluencerPlatform>(available[0] ?? "instagram");
+
+  const { data: series, isLoading } = useQuery({
+    queryKey: ["/api/influencers", influencer.id, "growth", platform, points],
+    queryFn: () => influencersApi.growth(influencer.id, { platform, points }),
+  });
+
+  const data = (series?.points ?? []).map((point) => ({
+    at: point.at,
+    range: [point.min, point.max],
+    last: point.last,
+  }));
+
+  return (
+    <div className="space-y-3">
+      {available.length > 1 && (
+        <Select value={platform} onValueChange={(value) => setPlatform(value as InfluencerPlatform)}>
+          <SelectTrigger className="w-40">
+            <SelectValue />
+          </SelectTrigger>
+          <SelectContent>
+            {available.map((name) => (
+              <SelectItem key={name} value={name}>{name}</SelectItem>
+            ))}
+          </SelectContent>
+        </Select>
+      )}
+      {isLoading ? (
+        <Skeleton className="h-48 w-full" />
+      ) : data.length === 0 ? (
+        <div className="h-48 flex items-center justify-center text-sm text-neutral-500 dark:text-neutral-400">
+          {t("no_growth_data")}
+        </div>
+      ) : (
+        <ChartContainer config={chartConfig} className="h-48 w-full">
+          <ComposedChart data={data}>
+            <XAxis dataKey="at" tickFormatter={(value) => format(new Date(value), "dd.MM")} minTickGap={24} />
+            <YAxis width={48} domain={["auto", "auto"]} />
+            <ChartTooltip content={<ChartTooltipContent />} />
+            <Area dataKey="range" type="stepAfter" fill="var(--color-range)" stroke="none" fillOpacity={0.3} />
+            <Line dataKey="last" type="monotone" stroke="var(--color-last)" dot={false} strokeWidth={2} />
+          </ComposedChart>
+        </ChartContainer>
+      )}
+    </div>
+  );
+}
@@ -1,5 +1,5 @@
 import { useState } from "react";
-import { useMutation } from "@tanstack/react-query";
+import { keepPreviousData, useMutation, useQuery } from "@tanstack/react-query";
 import { useForm } from "react-hook-form";
 import { zodResolver } from "@hookform/resolvers/zod";
 import { useTranslation } from "react-i18next";
@@ -17,6 +17,7 @@ import { ArrowLeft, Save, CalendarIcon } from "lucide-react";
 import { queryClient } from "@/lib/queryClient";
 import { projects } from "@/lib/api";
 import { useAuth } from "@/hooks/use-auth";
+import { useDebouncedValue } from "@/hooks/use-debounced-value";
 import { Popover, PopoverContent, PopoverTrigger } from "@/components/ui/popover";
 import { Calendar } from "@/components/ui/calendar";
 import { format } from "date-fns";
@@ -51,6 +52,8 @@ const platformOptions = [
   { id: "telegram", label: "Telegram" },
 ];
 
+const WHAT_IF_DEBOUNCE_MS = 300;
+
 export function ProjectForm({ project, isNew = false }: ProjectFormProps) {
   const { t } = useTranslation();
   const { toast } = useToast();
@@ -82,6 +85,22 @@ export function ProjectForm({ project, isNew = false }: ProjectFormProps) {
     defaultValues,
   });
 
+  // Reach and CPM for the budget and platforms being edited; nothing is saved.
+  // Asked for once typing pauses, and an empty budget is sent as null
+  const watchedBudget = form.watch("budget");
+  const watchedPlatforms = form.watch("platforms");
+  const budget = useDebouncedValue(
+    typeof watchedBudget === "number" && !Number.isNaN(watchedBudget) ? watchedBudget : null,
+    WHAT_IF_DEBOUNCE_MS,
+  );
+  const platforms = useDebouncedValue(watchedPlatforms, WHAT_IF_DEBOUNCE_MS) ?? [];
+  const { data: analytics } = useQuery({
+    queryKey: [`/api/projects/${project?.id}/analytics`, budget, platforms],
+    queryFn: () => projects.whatIf(project.id, { budget, platforms }),
+    enabled: !isNew && !!project?.id,
+    placeholderData: keepPreviousData,
+  });
+
   const createProjectMutation = useMutation({
     mutationFn: async (data: any) => {
       return await projects.create(data);
@@ -518,6 +537,13 @@ export function ProjectForm({ project, isNew = false }: ProjectFormProps) {
             </div>
           </div>
 
+          {analytics && (
+            <div className="flex gap-4 text-sm text-muted-foreground">
+              <span>{t("estimated_reach", { reach: analytics.estimated_reach.toLocaleString() })}</span>
+              {analytics.cpm !== null && <span>{t("estimated_cpm", { cpm: analytics.cpm })}</span>}
+            </div>
+          )}
+
           <div>
             <h3 className="text-base font-medium mb-2">{t("technical_links")}</h3>
             <div className="flex items-end gap-2 mb-4">
@@ -7,6 +7,7 @@ import { formatDistanceToNow } from "date-fns";
 import { ru } from "date-fns/locale";
 import { Button } from "@/components/ui/button";
 import { Link } from "wouter";
+import { Stage, StageProgress } from "@/lib/types";
 
 interface ProjectCardProps {
   id: number;
@@ -24,6 +25,7 @@ interface ProjectCardProps {
     message?: string;
   };
   influencers?: { initials: string; name: string }[];
+  progress?: Partial<Record<Stage, StageProgress>>;
   className?: string;
 }
 
@@ -40,6 +42,7 @@ export function ProjectCard({
   deadline,
   actionRequired,
   influencers,
+  progress,
   className,
 }: ProjectCardProps) {
   const { t } = useTranslation();
@@ -120,6 +123,15 @@ export function ProjectCard({
         ]}
       />
 
+      {progress?.[workflowStage] && progress[workflowStage]!.total > 0 && (
+        <div className="text-xs text-neutral-600 dark:text-neutral-400 mb-3">
+          {t("stage_progress", {
+            completed: progress[workflowStage]!.completed,
+            total: progress[workflowStage]!.total,
+          })}
+        </div>
+      )}
+
       {actionRequired?.required && (
         <div className="bg-warning/10 p-2 rounded-lg mb-3 text-sm">
           <div className="font-medium text-warning">{t("needs_action")}:</div>
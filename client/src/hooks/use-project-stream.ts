@@ -0,0 +1,34 @@
+import { useEffect } from "react";
+import { queryClient } from "@/lib/queryClient";
+
+// Subscribes to /api/v1/projects/{id}/stream and refreshes the affected
+// queries when the server pushes a new activity or comment, instead of
+// polling. EventSource reconnects on its own and resumes from the last
+// event id it received.
+export function useProjectStream(projectId: string | number | undefined) {
+  useEffect(() => {
+    const token = localStorage.getItem("token");
+    if (!projectId || !token || typeof EventSource === "undefined") {
+      return;
+    }
+
+    const source = new EventSource(
+      `/api/v1/projects/${projectId}/stream?access_token=${encodeURIComponent(token)}`
+    );
+    const onActivity = () => {
+      queryClient.invalidateQueries({ queryKey: [`/api/projects/${projectId}/activities`] });
+      queryClient.invalidateQueries({ queryKey: [`/api/projects/${projectId}`] });
+    };
+    const onComment = () => {
+      queryClient.invalidateQueries({ queryKey: [`/api/projects/${projectId}/comments`] });
+    };
+    source.addEventListener("activity", onActivity);
+    source.addEventListener("comment", onComment);
+
+    return () => {
+      source.removeEventListener("activity", onActivity);
+      source.removeEventListener("comment", onComment);
+      source.close();
+    };
+  }, [projectId]);
+}
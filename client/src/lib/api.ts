@@ -1,5 +1,5 @@
 import axios from 'axios';
-import { User, Project, Comment, Activity, WorkflowStage, Scenario, Material, Publication, Influencer } from './types';
+import { User, Project, ProjectOverview, ProjectAnalytics, ProjectAnalyticsScenario, InfluencerRecommendation, DashboardStats, ProjectOverviewSection, Comment, Activity, WorkflowStage, Scenario, Material, Publication, Influencer, InfluencerListParams, GrowthParams, GrowthSeries, SeriesSnapshot } from './types';
 
 interface LoginResponse {
   access_token: string;
@@ -89,6 +89,23 @@ export const projects = {
     const response = await api.get<Project>(`/projects/${id}`);
     return response.data;
   },
+  overview: async (id: number, sections?: ProjectOverviewSection[]): Promise<ProjectOverview> => {
+    const params = sections ? { sections: sections.join(',') } : undefined;
+    const response = await api.get<ProjectOverview>(`/projects/${id}/overview`, { params });
+    return response.data;
+  },
+  analytics: async (id: number): Promise<ProjectAnalytics> => {
+    const response = await api.get<ProjectAnalytics>(`/projects/${id}/analytics`);
+    return response.data;
+  },
+  whatIf: async (id: number, scenario: ProjectAnalyticsScenario): Promise<ProjectAnalytics> => {
+    const response = await api.post<ProjectAnalytics>(`/projects/${id}/analytics/what-if`, scenario);
+    return response.data;
+  },
+  recommendations: async (id: number, params: { limit?: number; target_followers?: number } = {}): Promise<InfluencerRecommendation[]> => {
+    const response = await api.get<InfluencerRecommendation[]>(`/projects/${id}/recommendations`, { params });
+    return response.data;
+  },
   create: async (project: ProjectCreate): Promise<Project> => {
     const response = await api.post<Project>('/projects/', project);
     return response.data;
@@ -199,8 +216,23 @@ export const publications = {
 };
 
 export const influencers = {
-  list: async (): Promise<Influencer[]> => {
-    const response = await api.get<Influencer[]>(`/influencers/`);
+  list: async (filters: InfluencerListParams = {}): Promise<Influencer[]> => {
+    const { platforms, ...params } = filters;
+    const response = await api.get<Influencer[]>(`/influencers/`, {
+      params: { ...params, platforms: platforms?.join(",") },
+    });
+    return response.data;
+  },
+  search: async (q: string, limit = 20): Promise<Influencer[]> => {
+    const response = await api.get<Influencer[]>(`/influencers/search`, { params: { q, limit } });
+    return response.data;
+  },
+  growth: async (influencerId: number, params: GrowthParams): Promise<GrowthSeries> => {
+    const response = await api.get<GrowthSeries>(`/influencers/${influencerId}/growth`, { params });
+    return response.data;
+  },
+  recordSnapshots: async (influencerId: number, snapshots: SeriesSnapshot[]): Promise<{ stored: number }> => {
+    const response = await api.post<{ stored: number }>(`/influencers/${influencerId}/snapshots`, snapshots);
     return response.data;
   },
   create: async (influencer: InfluencerCreate): Promise<Influencer> => {
@@ -234,4 +266,11 @@ export const projectInfluencers = {
   }
 };
 
+export const stats = {
+  get: async (): Promise<DashboardStats> => {
+    const response = await api.get<DashboardStats>('/stats/');
+    return response.data;
+  }
+};
+
 export default api; 
\ No newline at end of file
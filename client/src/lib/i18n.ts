@@ -147,6 +147,9 @@ const resources = {
       "all_activities": "Все активности",
       "requires_attention": "Требуют внимания",
       "needs_action": "Требуется действие",
+      "stage_progress": "Завершено: {{completed}} из {{total}}",
+      "estimated_reach": "Охват: {{reach}}",
+      "estimated_cpm": "CPM: {{cpm}}",
       "no_actions_required": "Действий не требуется",
       "no_urgent_projects": "Срочных проектов нет",
       "no_activities": "Нет активностей",
@@ -206,6 +209,9 @@ const resources = {
       
       // Influencers
       "no_influencers": "Инфлюенсеров не найдено",
+      "follower_growth": "Рост подписчиков",
+      "follower_growth_description": "Минимум, максимум и последнее значение за период",
+      "no_growth_data": "История подписчиков пока пуста",
       "search_influencers": "Поиск инфлюенсеров...",
       "add_influencer": "Добавить инфлюенсера",
       "add_influencer_description": "Добавьте нового инфлюенсера в вашу базу",
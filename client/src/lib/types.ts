@@ -43,6 +43,15 @@ export interface Project {
   technical_links?: { title: string; url: string }[];
   platforms?: string[];
   created_at: string;
+  progress?: Partial<Record<Stage, StageProgress>>;
+}
+
+// Assignment counters for one stage of a project
+export interface StageProgress {
+  total: number;
+  submitted: number;
+  approved: number;
+  completed: number;
 }
 
 export interface Comment {
@@ -113,5 +122,112 @@ export interface Influencer {
   telegram_followers?: number;
   vk_handle?: string;
   vk_followers?: number;
+  total_reach?: number;
   created_at: string;
-} 
\ No newline at end of file
+}
+
+export type InfluencerPlatform = "instagram" | "tiktok" | "youtube" | "telegram" | "vk";
+
+export interface InfluencerListParams {
+  platforms?: InfluencerPlatform[];
+  min_followers?: number;
+  max_followers?: number;
+  sort?: "id" | "total_reach" | "-total_reach";
+} 
+export interface ProjectInfluencer {
+  id: number;
+  project_id: number;
+  influencer_id: number;
+  scenario_status?: string;
+  material_status?: string;
+  publication_status?: string;
+  influencer?: Influencer;
+}
+
+export type ProjectOverviewSection = "scenarios" | "materials" | "publications" | "influencers" | "activities" | "comments";
+
+// Sections that were not requested come back as null
+export interface ProjectOverview {
+  project: Project;
+  scenarios: Scenario[] | null;
+  materials: Material[] | null;
+  publications: Publication[] | null;
+  influencers: ProjectInfluencer[] | null;
+  activities: Activity[] | null;
+  comments: Comment[] | null;
+}
+
+export interface PlatformCoverage {
+  influencers: number;
+  followers: number;
+  share: number;
+}
+
+export interface ProjectAnalytics {
+  project_id: number;
+  budget: number | null;
+  platforms: InfluencerPlatform[];
+  influencers: number;
+  estimated_reach: number;
+  cpm: number | null;
+  coverage: Record<InfluencerPlatform, PlatformCoverage>;
+}
+
+export interface InfluencerRecommendation {
+  influencer_id: number;
+  score: number;
+  reach: number;
+  active_assignments: number;
+  influencer: Influencer;
+}
+
+export type SeriesMetric = "followers" | "engagement";
+
+export interface GrowthPoint {
+  at: string;
+  min: number;
+  max: number;
+  last: number;
+}
+
+export interface GrowthSeries {
+  platform: InfluencerPlatform;
+  metric: SeriesMetric;
+  resolution: number;
+  points: GrowthPoint[];
+}
+
+export interface GrowthParams {
+  platform: InfluencerPlatform;
+  metric?: SeriesMetric;
+  start?: string;
+  end?: string;
+  resolution?: number;
+  points?: number;
+}
+
+export interface SeriesSnapshot {
+  platform: InfluencerPlatform;
+  metric?: SeriesMetric;
+  value: number;
+  at?: string;
+}
+
+export interface ProjectAnalyticsScenario {
+  add_influencer_ids?: number[];
+  remove_influencer_ids?: number[];
+  budget?: number | null;
+  platforms?: string[];
+}
+
+export type Stage = "scenario" | "material" | "publication";
+
+export interface DashboardStats {
+  projects_total: number;
+  projects_by_status: Record<string, number>;
+  projects_by_stage: Record<string, number>;
+  influencer_statuses: Record<Stage, Record<string, number>>;
+  pending_reviews: Record<Stage, number>;
+  overdue: Record<Stage, number>;
+  influencers_count: number;
+}
@@ -10,14 +10,25 @@ import { Link } from "wouter";
 import { ArrowUp, Clock, UserPlus, CheckCircle } from "lucide-react";
 import { Skeleton } from "@/components/ui/skeleton";
 import { Project, Activity } from "@/lib/types";
-import { projects as projectsApi, activities as activitiesApi } from "@/lib/api";
+import { projects as projectsApi, activities as activitiesApi, stats as statsApi } from "@/lib/api";
 
 export default function Dashboard() {
   const { t } = useTranslation();
   const { user } = useAuth();
 
+  // Counted server-side; the page no longer needs full lists to render the numbers
   const { data: stats, isLoading: isLoadingStats } = useQuery({
     queryKey: ["/api/stats/manager"],
+    queryFn: async () => {
+      const dashboardStats = await statsApi.get();
+      return {
+        activeProjects: dashboardStats.projects_by_status.active ?? 0,
+        completedProjects: dashboardStats.projects_by_status.completed ?? 0,
+        pendingReviews: dashboardStats.pending_reviews.scenario + dashboardStats.pending_reviews.material,
+        pendingReviewsDetails: dashboardStats.pending_reviews,
+        influencersCount: dashboardStats.influencers_count,
+      };
+    },
     enabled: !!user && user.role === "manager",
   });
 
@@ -184,6 +195,7 @@ export default function Dashboard() {
         materialStatus="in_review"
         publicationStatus="pending"
         deadline={new Date(project.deadline || "")}
+        progress={project.progress}
         actionRequired={{
           required: true,
           message: project.workflow_stage === "scenario" 
@@ -18,6 +18,7 @@ import {
   DialogTitle 
 } from "@/components/ui/dialog";
 import { Skeleton } from "@/components/ui/skeleton";
+import { GrowthChart } from "@/components/growth-chart";
 import {
   Select,
   SelectContent,
@@ -34,6 +35,7 @@ export default function Influencers() {
   const [searchTerm, setSearchTerm] = useState("");
   const [platformFilter, setPlatformFilter] = useState("all");
   const [isAddDialogOpen, setIsAddDialogOpen] = useState(false);
+  const [growthInfluencer, setGrowthInfluencer] = useState<Influencer | null>(null);
   const [formData, setFormData] = useState({
     nickname: "",
     bio: "",
@@ -168,7 +170,11 @@ export default function Influencers() {
       ) : filteredInfluencers && filteredInfluencers.length > 0 ? (
         <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4">
           {filteredInfluencers.map((influencer) => (
-            <Card key={influencer.id} className="bg-white dark:bg-neutral-900/30 p-4 border border-neutral-200/50 dark:border-neutral-800/50">
+            <Card
+              key={influencer.id}
+              className="bg-white dark:bg-neutral-900/30 p-4 border border-neutral-200/50 dark:border-neutral-800/50 cursor-pointer"
+              onClick={() => setGrowthInfluencer(influencer)}
+            >
               <div className="flex items-start">
                 <Avatar className="h-16 w-16 mr-4 bg-neutral-200 dark:bg-neutral-800">
                   <div className="text-lg font-medium w-full h-full flex items-center justify-center">
@@ -215,6 +221,19 @@ export default function Influencers() {
         </div>
       )}
 
+      {/* Follower Growth Dialog */}
+      <Dialog open={growthInfluencer !== null} onOpenChange={(open) => !open && setGrowthInfluencer(null)}>
+        <DialogContent className="sm:max-w-lg">
+          <DialogHeader>
+            <DialogTitle>{t("follower_growth")}: {growthInfluencer?.nickname}</DialogTitle>
+            <DialogDescription>
+              {t("follower_growth_description")}
+            </DialogDescription>
+          </DialogHeader>
+          {growthInfluencer && <GrowthChart key={growthInfluencer.id} influencer={growthInfluencer} />}
+        </DialogContent>
+      </Dialog>
+
       {/* Add Influencer Dialog */}
       <Dialog open={isAddDialogOpen} onOpenChange={setIsAddDialogOpen}>
         <DialogContent className="sm:max-w-md">
@@ -21,8 +21,13 @@ import { format } from "date-fns";
 import { ru } from "date-fns/locale";
 import { queryClient } from "@/lib/queryClient";
 import { useToast } from "@/hooks/use-toast";
-import { Project, Activity, Comment, Influencer, Scenario, WorkflowStage } from "@/lib/types";
-import { projects as ProjectsApi, scenarios as ScenariosApi, activities as ActivitiesApi, comments as CommentsApi, publications as PublicationsApi, influencers as InfluencersApi } from "@/lib/api";
+import { useProjectStream } from "@/hooks/use-project-stream";
+import { Project, ProjectOverview, Activity, Comment, Influencer, Scenario, WorkflowStage } from "@/lib/types";
+import { projects as ProjectsApi, scenarios as ScenariosApi, activities as ActivitiesApi, comments as CommentsApi, publications as PublicationsApi } from "@/lib/api";
+
+function projectInfluencers(overview: ProjectOverview): Influencer[] {
+  return (overview.influencers ?? []).flatMap((link) => (link.influencer ? [link.influencer] : []));
+}
 
 interface ProjectDetailProps {
   id: string;
@@ -37,29 +42,51 @@ export default function ProjectDetail({ id }: ProjectDetailProps) {
   const [deleteDialogOpen, setDeleteDialogOpen] = useState(false);
   const [publicationUrls, setPublicationUrls] = useState<Record<string, string>>({});
   
-  const { data: project = {} as Project, isLoading: isLoadingProject } = useQuery<Project>({
+  useProjectStream(id);
+
+  // One request for the whole page; each section keeps its own cache key so mutations
+  // and the event stream can refresh just that section
+  const { isSuccess: overviewLoaded } = useQuery<ProjectOverview>({
+    queryKey: [`/api/projects/${id}/overview`],
+    queryFn: async (): Promise<ProjectOverview> => {
+      const overview = await ProjectsApi.overview(Number(id));
+      queryClient.setQueryData([`/api/projects/${id}`], overview.project);
+      queryClient.setQueryData([`/api/projects/${id}/influencers`], projectInfluencers(overview));
+      queryClient.setQueryData([`/api/projects/${id}/comments`], overview.comments ?? []);
+      queryClient.setQueryData([`/api/projects/${id}/activities`], overview.activities ?? []);
+      queryClient.setQueryData([`/api/projects/${id}/scenarios`], overview.scenarios ?? []);
+      return overview;
+    }
+  });
+
+  const { data: project = {} as Project, isPending: isLoadingProject } = useQuery<Project>({
     queryKey: [`/api/projects/${id}`],
-    queryFn: async (): Promise<Project> => ProjectsApi.get(Number(id))
+    queryFn: async (): Promise<Project> => ProjectsApi.get(Number(id)),
+    enabled: overviewLoaded
   });
   
-  const { data: influencers = [] as Influencer[], isLoading: isLoadingInfluencers } = useQuery<Influencer[]>({
+  const { data: influencers = [] as Influencer[], isPending: isLoadingInfluencers } = useQuery<Influencer[]>({
     queryKey: [`/api/projects/${id}/influencers`],
-    queryFn: async (): Promise<Influencer[]> => InfluencersApi.list(Number(id))
+    queryFn: async (): Promise<Influencer[]> => projectInfluencers(await ProjectsApi.overview(Number(id), ["influencers"])),
+    enabled: overviewLoaded
   });
   
   const { data: comments = [] as Comment[] } = useQuery<Comment[]>({
     queryKey: [`/api/projects/${id}/comments`],
-    queryFn: async (): Promise<Comment[]> => CommentsApi.list(Number(id))
+    queryFn: async (): Promise<Comment[]> => CommentsApi.list(Number(id)),
+    enabled: overviewLoaded
   });
   
   const { data: activities = [] as Activity[] } = useQuery<Activity[]>({
     queryKey: [`/api/projects/${id}/activities`],
-    queryFn: async (): Promise<Activity[]> => ActivitiesApi.list(Number(id))
+    queryFn: async (): Promise<Activity[]> => ActivitiesApi.list(Number(id)),
+    enabled: overviewLoaded
   });
   
-  const { data: scenarios = [] as Scenario[], isLoading: isLoadingScenarios } = useQuery<Scenario[]>({
+  const { data: scenarios = [] as Scenario[], isPending: isLoadingScenarios } = useQuery<Scenario[]>({
     queryKey: [`/api/projects/${id}/scenarios`],
-    queryFn: async (): Promise<Scenario[]> => ScenariosApi.list(Number(id))
+    queryFn: async (): Promise<Scenario[]> => ScenariosApi.list(Number(id)),
+    enabled: overviewLoaded
   });
   
   const updateWorkflowStageMutation = useMutation({
@@ -132,6 +132,7 @@ export default function Projects() {
               publicationStatus="pending"
               deadline={project.deadline ? new Date(project.deadline) : undefined}
               influencers={[]}
+              progress={project.progress}
             />
           ))}
         </div>